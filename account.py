@@ -0,0 +1,40 @@
+import threading
+from upbit_api import get_balance as fetch_balances
+
+# ✅ 틱마다 한 번만 `/v1/accounts`를 조회해서 trade / wallet / database가 같은 잔고를 공유
+_lock = threading.Lock()
+_snapshot = None  # 통화(KRW, BTC ...) → 업비트 자산 정보(dict)
+
+
+def get_accounts():
+    """계좌 스냅샷 반환 (없으면 `/v1/accounts` 한 번 조회, 실패하면 None)"""
+    global _snapshot
+    with _lock:
+        if _snapshot is None:
+            balances = fetch_balances()
+            if balances is None:
+                return None  # ✅ 실패는 캐시하지 않음 (다음 호출에서 다시 시도)
+            _snapshot = {asset["currency"]: asset for asset in balances}
+        return _snapshot
+
+
+def get_balance(currency):
+    """스냅샷에서 특정 통화 잔고 조회 (조회 실패 시 None, 보유하지 않으면 0)"""
+    accounts = get_accounts()
+    if accounts is None:
+        return None
+    asset = accounts.get(currency)
+    return float(asset["balance"]) if asset else 0
+
+
+def get_balance_list():
+    """스냅샷을 업비트 응답과 같은 자산 목록 형태로 반환 (DB 저장용)"""
+    accounts = get_accounts()
+    return list(accounts.values()) if accounts else []
+
+
+def invalidate_accounts():
+    """새 틱 시작 / 주문 접수 / 체결 후 호출 → 다음 조회 때 새로 받아옴"""
+    global _snapshot
+    with _lock:
+        _snapshot = None
@@ -1,144 +1,420 @@
+import asyncio
 import time
-import pandas as pd
 from trade import trade_by_percentage
-from upbit_api import (
-    get_market_price,
-    get_ohlcv,
-    calculate_rsi,
-    calculate_moving_average,
-    calculate_volatility_breakout,
-    get_balance
+from upbit_api import get_market_prices
+from account import get_accounts, get_balance, invalidate_accounts
+from indicators import IndicatorEngine
+from signals import DEFAULT_PARAMS
+from strategy import load_strategies, required_indicators, first_signal
+from valuation import update_prices
+from order_manager import OrderManager
+from execution import Executor
+from candle_store import warm_start
+from config import (
+    MARKETS, MARKET_ALLOCATIONS, USE_WEBSOCKET, FEED_MIN_INTERVAL, WARM_START, TICK_INTERVAL, ACTIVE_STRATEGIES,
+    TRADING_MODE, PAPER_LATENCY, EXECUTION_ENABLED,
 )
-from config import MARKET
 from calculate_pnl import calculate_pnl
 from wallet import display_wallet, save_balance_to_db
-from database import load_last_buy_price, save_last_buy_price, load_last_sell_time, save_last_sell_time
+from state_store import load_state, get_market_state, set_state, save_snapshot
+from storage import init_storage
+import metrics
 
-COOLDOWN_PERIOD = 300  # 5분 동안 추가 거래 제한
+COOLDOWN_PERIOD = DEFAULT_PARAMS["cooldown"]  # 5분 동안 추가 거래 제한
+STRATEGIES = load_strategies(ACTIVE_STRATEGIES)  # ✅ 모든 마켓이 같은 전략 사용 (지표는 마켓별 엔진 1개에서 공유)
 PRINT_INTERVAL = 100    # 100초마다만 상태 출력
 
-# ✅ 저장된 매수/매도 관련 데이터 불러오기
-last_buy_time = 0
-last_sell_time = load_last_sell_time()  # ✅ 마지막 매도 시간을 DB에서 불러오기
+
+class MarketState:
+    """마켓별 자동매매 상태 (지표 버퍼, 매수가, 쿨다운)"""
+
+    def __init__(self, market):
+        self.market = market
+        self.coin = market.split("-")[1]  # 예: KRW-ETH → ETH
+        # ✅ 최근 캔들 버퍼 (처음에만 200개를 받고 이후에는 최신 캔들만 받아 지표를 갱신)
+        self.engine = IndicatorEngine(
+            market, maxlen=200,
+            rsi_period=DEFAULT_PARAMS["rsi_period"],
+            short_window=DEFAULT_PARAMS["short_window"],
+            long_window=DEFAULT_PARAMS["long_window"],
+            k=DEFAULT_PARAMS["breakout_k"],
+            specs=required_indicators(STRATEGIES),
+        )
+        # ✅ 저장된 전략 상태 불러오기 (시작 시 전체 상태를 한 번의 조회로 캐시에 올림)
+        saved = get_market_state(market)
+        self.last_buy_time = saved.get("last_buy_time") or 0
+        self.last_sell_time = saved.get("last_sell_time") or 0  # ✅ 마지막 매도 시간
+        self.last_buy_price = saved.get("last_buy_price") or 0  # ✅ 저장된 매수가
+
+
+def allocation_weights(markets):
+    """마켓별 자본 배분 비율 (합계 1), 설정이 없으면 균등 배분"""
+    if MARKET_ALLOCATIONS:
+        weights = {market: float(MARKET_ALLOCATIONS.get(market, 0)) for market in markets}
+    else:
+        weights = {market: 1.0 for market in markets}
+    total = sum(weights.values())
+    return {market: (weight / total if total > 0 else 0) for market, weight in weights.items()}
+
+
+# ✅ 마켓별 자동매매 상태 (import 시에는 비어 있음 → bootstrap()에서 한 번만 채움)
+market_states = {}
+weights = {}
 last_print_time = 0  # 마지막으로 프린트한 시각
 
-# ✅ 저장된 매수가 불러오기 (없으면 현재 가격으로 설정)
-last_buy_price = load_last_buy_price()
-print(f"📌 기존 매수가 설정됨: {last_buy_price:,.0f} KRW")
-if last_buy_price == 0 or last_buy_price is None:
-    last_buy_price = get_market_price(MARKET) or 0  # 현재 가격을 가져오고, 실패하면 0
-    save_last_buy_price(last_buy_price)  # DB에 저장
-    print(f"📌 초기 매수가 설정됨: {last_buy_price:,.0f} KRW")
 
-def auto_trade():
-    global last_buy_time, last_sell_time, last_print_time, last_buy_price
+def bootstrap(markets=MARKETS):
+    """시작 준비 (DB 확인 → 저장된 상태 한 번에 조회 → 마켓별 상태 생성 → 매수가가 없는 마켓만 시세 조회)
+    - import만 해서는 DB / 네트워크에 접근하지 않음, 두 번째 호출부터는 아무것도 하지 않음
+    """
+    if market_states:
+        return market_states
+    init_storage()
+    load_state()  # ✅ 저장된 전략 상태 전체를 한 번의 조회로 캐시에 올림
+    market_states.update({market: MarketState(market) for market in markets})
+    weights.update(allocation_weights(markets))
 
-    print("🚀 자동 매매를 시작합니다...")
+    # ✅ 저장된 매수가가 없는 마켓은 현재 가격으로 설정 (티커 한 번으로 일괄 조회)
+    missing_markets = [state.market for state in market_states.values() if not state.last_buy_price]
+    initial_prices = get_market_prices(missing_markets) if missing_markets else {}
+    for state in market_states.values():
+        if state.market in missing_markets:
+            state.last_buy_price = initial_prices.get(state.market) or 0  # 현재 가격을 가져오고, 실패하면 0
+            set_state(state.market, last_buy_price=state.last_buy_price)  # DB에 저장
+            print(f"📌 {state.market} 초기 매수가 설정됨: {state.last_buy_price:,.0f} KRW")
+        else:
+            print(f"📌 {state.market} 기존 매수가 설정됨: {state.last_buy_price:,.0f} KRW")
+    return market_states
 
-    while True:
-        current_time = time.time()
 
-        # ✅ 1. OHLCV 데이터 불러오기
-        ohlcv = get_ohlcv(MARKET, 200)
-        if not isinstance(ohlcv, list) or len(ohlcv) == 0:
-            print("⚠️ OHLCV 데이터를 가져오지 못했습니다. 10초 후 재시도...")
-            time.sleep(10)
-            continue
+### ✅ 느린 작업(지갑 출력, DB 저장, 손익 계산)은 백그라운드 스레드에서 실행 (매매 틱은 기다리지 않음)
+_background_tasks = set()
+
+
+def run_in_background(func, *args):
+    """이벤트 루프에서 호출 → 함수를 스레드에서 실행하는 태스크로 넘기고 바로 반환"""
+    task = asyncio.get_running_loop().create_task(asyncio.to_thread(func, *args))
+    _background_tasks.add(task)  # 태스크가 끝나기 전에 사라지지 않도록 참조 유지
+    task.add_done_callback(_finish_background)
+    return task
+
+
+def _finish_background(task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"⚠️ 백그라운드 작업 실패: {task.exception()}")
+
+
+def report_after_trade():
+    """주문 후 잔고 저장 → 지갑 출력 (백그라운드 작업)"""
+    save_balance_to_db()
+    display_wallet()
 
-        ohlcv_df = pd.DataFrame(ohlcv)
-        if "trade_price" not in ohlcv_df.columns:
-            print("⚠️ 'trade_price' 컬럼이 없습니다. API 응답을 확인하세요.")
-            time.sleep(10)
+
+async def refresh_market_data(market_feed, current_time):
+    """모든 마켓의 지표를 갱신하고 {마켓: 현재가} 반환
+    - 웹소켓 피드가 살아 있으면 푸시된 캔들/시세 사용
+    - 아니면 티커 일괄 조회 / 분이 바뀐 마켓의 캔들 / 계좌 조회를 동시에 요청 (틱 시간 ≈ 가장 느린 요청 1개)
+    """
+    prices = {}
+    if market_feed is not None and market_feed.is_live():
+        for state in market_states.values():
+            if not state.engine.candles:
+                continue  # 아직 REST로 초기 캔들을 받지 않은 마켓은 아래에서 처리
+            with metrics.timer("indicator_seconds", op="feed"):
+                for candle in market_feed.pop_candles(state.market):
+                    state.engine.update(candle)
+            prices[state.market] = market_feed.get_price(state.market)
+
+    rest_markets = [market for market in market_states if not prices.get(market)]
+    stale = [market_states[m].engine for m in rest_markets if market_states[m].engine.needs_refresh(current_time)]
+    jobs = [asyncio.to_thread(get_accounts)]  # ✅ 이번 틱의 계좌 스냅샷도 함께 받아 둠
+    if rest_markets:
+        jobs.append(asyncio.to_thread(get_market_prices, rest_markets))
+    jobs += [asyncio.to_thread(engine.refresh) for engine in stale]
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"⚠️ 시세/캔들/계좌 조회 중 오류: {result}")
+    if rest_markets and isinstance(results[1], dict):
+        prices.update(results[1])
+    with metrics.timer("indicator_seconds", op="ticker"):
+        for market in rest_markets:
+            market_states[market].engine.update_price(prices.get(market), current_time)
+
+    update_prices(prices, current_time)  # ✅ 지갑 평가 등에서 같은 시세를 재사용 (추가 티커 요청 없음)
+    return prices
+
+
+def apply_fill_events(fill_tracker, background=None, executor=None):
+    """체결이 끝난 주문을 반영 (매수가는 주문 시점 현재가 대신 실제 평균 체결가로 교체)
+    - executor가 있으면 분할 주문 전체의 평균 체결가 사용 + 실행이 끝나면 실현 슬리피지 보고
+    """
+    run = background or (lambda func, *args: func(*args))
+    for event in fill_tracker.pop_events():
+        avg_price = executor.record_fill(event) if executor is not None else None
+        state = market_states.get(event["market"])
+        if state is None or event["volume"] <= 0:
             continue
+        if event["side"] == "bid":
+            state.last_buy_price = avg_price or event["avg_price"]
+            set_state(state.market, last_buy_price=state.last_buy_price)
+            print(f"✅ {state.market} 매수 체결 확인! 평균 체결가: {state.last_buy_price:,.0f} KRW")
+        else:
+            # ✅ 매도 체결이 거래 기록에 반영된 뒤 손익 계산
+            run(calculate_pnl, state.market, event["avg_price"])
+
+
+def _context(state, current_price, current_time, coin_balance, krw_balance):
+    """전략 판단에 넘기는 현재 상태"""
+    return {
+        "price": current_price,
+        "now": current_time,
+        "last_buy_time": state.last_buy_time,
+        "last_sell_time": state.last_sell_time,
+        "last_buy_price": state.last_buy_price,
+        "coin_balance": coin_balance,
+        "krw_balance": krw_balance,
+    }
+
+
+def evaluate_market(state, current_price, krw_balance, krw_budget, current_time, fill_tracker=None, background=None,
+                    executor=None):
+    """한 마켓의 매수/매도 조건 확인 및 주문 (background가 있으면 주문 후 지갑 출력/잔고 저장을 넘김)
+    - executor: 주문 실행기 (호가 기반 시장가 / 지정가 IOC / 분할 주문), 없으면 시장가 1번
+    """
+    run = background or (lambda func, *args: func(*args))
+    market = state.market
+    engine = state.engine
+    rsi = engine.rsi
+    short_ma, long_ma = engine.short_ma, engine.long_ma
+    breakout_price = engine.breakout_price
+    coin_balance = get_balance(state.coin) or 0
+    frame = engine.frame()  # ✅ 모든 전략이 같은 지표 값을 읽음 (전략마다 다시 계산하지 않음)
+
+    # ✅ 100초마다 상태 정보 출력
+    if current_time - last_print_time >= PRINT_INTERVAL:
+        print(f"\n📈 현재 {market} 가격: {current_price:,.0f} KRW")
+        print(f"📊 RSI: {rsi:.2f}, 단기MA: {short_ma:,.0f}, 장기MA: {long_ma:,.0f}, 돌파가: {breakout_price:,.0f}")
+        print(f"💰 {state.coin} 잔액: {coin_balance} | 배분 한도: {krw_budget:,.0f} KRW")
+
+    ############################################
+    # ✅ 매수 로직 (규칙은 strategy.py — 백테스트와 동일)
+    ############################################
+    context = _context(state, current_price, current_time, coin_balance, krw_balance)
+    reason = first_signal(STRATEGIES, "bid", frame, context)
+    if reason:
+        print(f"📉 [매수] {market} {reason}")
+
+        # ✅ 매수가 기록 (손익 분석 활용)
+        order_result = trade_by_percentage(
+            side="bid", percent=DEFAULT_PARAMS["buy_percent"], current_price=current_price,
+            market=market, krw_budget=krw_budget, executor=executor,
+        )
+        if order_result is not None:
+            if fill_tracker is not None:
+                fill_tracker.track(order_result)  # ✅ 체결은 백그라운드에서 확인해 거래 기록에 저장
+            state.last_buy_time = current_time
+            state.last_buy_price = current_price  # ✅ 매수가 저장
+            set_state(market, last_buy_price=state.last_buy_price, last_buy_time=state.last_buy_time)  # ✅ DB에 한 번에 저장
+            save_snapshot(f"{market} 매수")
+            print(f"✅ {market} 매수 주문 완료! 저장된 매수가: {state.last_buy_price:,.0f} KRW")
+            run(report_after_trade)
+        else:
+            print(f"⚠️ {market} 매수 주문이 실패하여 후속 처리하지 않습니다.")
 
-        # ✅ 2. 각종 지표 계산
-        close_prices = ohlcv_df["trade_price"]
-        current_price = get_market_price(MARKET)
-        rsi = calculate_rsi(close_prices)
-        short_ma, long_ma = calculate_moving_average(ohlcv_df, 5, 20)
-        breakout_price = calculate_volatility_breakout(ohlcv_df)
-
-        # ✅ 3. 보유 잔고 확인 (에러 방지)
-        krw_balance = get_balance("KRW") or 0
-        btc_balance = get_balance("BTC") or 0
-
-        # ✅ 4. 현재 평가 금액 계산
-        total_asset_value = krw_balance + (btc_balance * current_price)
-
-        # ✅ 100초마다 상태 정보 출력
-        if current_time - last_print_time >= PRINT_INTERVAL:
-            print(f"\n📈 현재 {MARKET} 가격: {current_price:,.0f} KRW")
-            print(f"📊 RSI: {rsi:.2f}, 단기MA: {short_ma:,.0f}, 장기MA: {long_ma:,.0f}, 돌파가: {breakout_price:,.0f}")
-            print(f"💰 KRW 잔액: {krw_balance:,.0f} | BTC 잔액: {btc_balance} | 총 평가: {total_asset_value:,.0f} KRW")
-            last_print_time = current_time
-
-        ############################################
-        # ✅ 매수 로직
-        ############################################
-        if (
-            (rsi < 30 or short_ma > long_ma)
-            and (current_time - last_buy_time > COOLDOWN_PERIOD)
-            and btc_balance == 0
-            and krw_balance > 5000
-        ):
-            if rsi < 30:
-                print("📉 [매수] RSI 과매도 감지")
-            else:
-                print("📉 [매수] 골든크로스 감지")
-
-            # ✅ 매수가 기록 (손익 분석 활용)
-            order_result = trade_by_percentage(side="bid", percent=90)
-            if order_result is not None:
-                last_buy_time = current_time
-                last_buy_price = current_price  # ✅ 매수가 저장
-                save_last_buy_price(last_buy_price)  # ✅ DB에 저장
-                print(f"✅ 매수 주문 완료! 저장된 매수가: {last_buy_price:,.0f} KRW")
-                display_wallet()
-                save_balance_to_db()
-            else:
-                print("⚠️ 매수 주문이 실패하여 후속 처리하지 않습니다.")
-
-        ############################################
-        # ✅ 매도 로직
-        ############################################
-        if (
-            (rsi > 70 or current_price > breakout_price or current_price > last_buy_price * 1.01)
-            and (current_price > last_buy_price * 1.005 or current_price > last_buy_price * 1.01)
-            and (current_time - last_sell_time > COOLDOWN_PERIOD)
-            and btc_balance > 0
-        ):
-            # ✅ 매도 사유 출력
-            if rsi > 70:
-                print("📈 [매도] RSI 과매수 감지")
-            elif current_price > breakout_price:
-                print("📈 [매도] 변동성 돌파 초과 감지")
-            elif current_price > last_buy_price * 1.01:
-                print("📈 [매도] 1% 상승 감지 (매도 실행)")
-            elif current_price > last_buy_price * 1.005:
-                print("📈 [매도] 0.5% 상승 감지 (매도 실행)")
-
-            # ✅ 매도 주문 실행
-            order_result = trade_by_percentage(side="ask", percent=100)
-            if order_result is not None:
-                last_sell_time = current_time
-                save_last_sell_time(last_sell_time)  # ✅ 매도 시간 저장
-                print("✅ 매도 주문이 성공적으로 실행되었습니다.")
-
-                # ✅ 손익 계산 및 업데이트
-                calculate_pnl()
-                display_wallet()
-                save_balance_to_db()
-            else:
-                print("⚠️ 매도 주문이 실패하여 후속 처리하지 않습니다.")
+    ############################################
+    # ✅ 매도 로직
+    ############################################
+    context = _context(state, current_price, current_time, coin_balance, krw_balance)  # 매수 후 바뀐 매수가 반영
+    reason = first_signal(STRATEGIES, "ask", frame, context)
+    if reason:
+        # ✅ 매도 사유 출력
+        print(f"📈 [매도] {market} {reason}")
 
+        # ✅ 매도 주문 실행
+        order_result = trade_by_percentage(
+            side="ask", percent=DEFAULT_PARAMS["sell_percent"], current_price=current_price, market=market,
+            executor=executor,
+        )
+        if order_result is not None:
+            if fill_tracker is not None:
+                fill_tracker.track(order_result)
+            state.last_sell_time = current_time
+            set_state(market, last_sell_time=state.last_sell_time)  # ✅ 매도 시간 저장
+            save_snapshot(f"{market} 매도")
+            print(f"✅ {market} 매도 주문이 성공적으로 실행되었습니다.")
+            run(report_after_trade)
         else:
-            # ✅ 매도가 불발된 경우, 남은 쿨다운이 있으면 안내
-            if (current_time - last_sell_time) <= COOLDOWN_PERIOD:
-                remaining_time = int(COOLDOWN_PERIOD - (current_time - last_sell_time))
-                print(f"⏳ 매도 대기 중... (쿨다운 {remaining_time}초 남음)")
+            print(f"⚠️ {market} 매도 주문이 실패하여 후속 처리하지 않습니다.")
+
+    else:
+        # ✅ 매도가 불발된 경우, 남은 쿨다운이 있으면 안내
+        if (current_time - state.last_sell_time) <= COOLDOWN_PERIOD:
+            remaining_time = int(COOLDOWN_PERIOD - (current_time - state.last_sell_time))
+            print(f"⏳ {market} 매도 대기 중... (쿨다운 {remaining_time}초 남음)")
+
+
+def startup_report():
+    """시작 시 지갑 / 최근 거래 내역 출력 (첫 틱 이후 백그라운드 작업)"""
+    from trades import display_buy_sell_data
+
+    save_balance_to_db()
+    display_wallet()
+    display_buy_sell_data()
+
+
+async def trade_tick(market_feed, fill_tracker, current_time, executor=None):
+    """매매 틱 1회 (시세/캔들/계좌 동시 조회 → 마켓별 매수/매도 판단), 판단한 마켓이 있으면 True"""
+    global last_print_time
+
+    invalidate_accounts()  # ✅ 틱마다 계좌는 한 번만 조회 (이번 틱의 판단은 모두 같은 잔고 사용)
+    apply_fill_events(fill_tracker, run_in_background, executor)
+
+    # ✅ 1. 모든 마켓의 최신 캔들/시세 + 계좌를 동시에 조회
+    prices = await refresh_market_data(market_feed, current_time)
+    ready = [state for state in market_states.values() if state.engine.candles and prices.get(state.market)]
+    if not ready:
+        return False
+
+    # ✅ 2. 보유 잔고 확인 (위에서 받은 계좌 스냅샷 사용, 추가 요청 없음)
+    krw_balance = get_balance("KRW") or 0
+
+    # ✅ 3. 현재 평가 금액 계산 (마켓별 배분 한도 = 총 평가 금액 × 배분 비율)
+    total_asset_value = krw_balance + sum(
+        (get_balance(state.coin) or 0) * prices[state.market] for state in ready
+    )
+    if current_time - last_print_time >= PRINT_INTERVAL:
+        print(f"\n💰 KRW 잔액: {krw_balance:,.0f} | 총 평가: {total_asset_value:,.0f} KRW")
+
+    # ✅ 4. 마켓별 매수/매도 판단 (주문은 마켓 순서대로, 후속 작업은 백그라운드로)
+    for state in ready:
+        evaluate_market(
+            state, prices[state.market], krw_balance, total_asset_value * weights[state.market], current_time,
+            fill_tracker, run_in_background, executor,
+        )
+        krw_balance = get_balance("KRW") or 0  # 주문 후에는 스냅샷이 새로 조회됨
+
+    if current_time - last_print_time >= PRINT_INTERVAL:
+        last_print_time = current_time
+    return True
+
+
+async def auto_trade_async(tick_interval=TICK_INTERVAL, startup_reports=False, started=None):
+    """bootstrap → 캔들 초기화 → 피드/체결 확인 시작 → 고정 간격 매매 틱 반복
+    - started: 시작 시각 (perf_counter, 첫 매매 판단까지 걸린 시간 측정용), 없으면 지금
+    - startup_reports: 첫 판단 이후 지갑 / 거래 내역을 백그라운드로 출력
+    """
+    started = time.perf_counter() if started is None else started
+    await asyncio.to_thread(bootstrap)
+    print(f"🚀 자동 매매를 시작합니다... ({len(market_states)}개 마켓: {', '.join(market_states)})")
+
+    # ✅ 로컬 캔들 저장소로 지표 초기화 (저장소에 없는 최신 구간만 받아 추가, 마켓별로 동시에)
+    # 모의 거래 모드는 시뮬레이터 캔들이 실제 캔들 저장소에 섞이지 않도록 건너뜀
+    paper = TRADING_MODE == "paper"
+    if WARM_START and not paper:
+        states = list(market_states.values())
+        loaded = await asyncio.gather(*(asyncio.to_thread(warm_start, state.engine) for state in states))
+        for state, ok in zip(states, loaded):
+            if ok:
+                print(f"📂 {state.market} 저장된 캔들 {len(state.engine.candles)}개로 지표 초기화")
+
+    # ✅ 웹소켓 피드 시작 (한 연결로 모든 마켓 구독, 끊겨 있는 동안은 REST 폴링으로 대체, 모의 거래는 REST만)
+    market_feed = None
+    if USE_WEBSOCKET and not paper:
+        from market_feed import MarketFeed  # websockets는 피드를 쓸 때만 불러옴
+
+        market_feed = MarketFeed(list(market_states)).start()
+    fill_tracker = OrderManager().start()  # ✅ 미체결 주문 일괄 조회 + 지정가 만료 / 재주문 스레드 (매매 루프는 기다리지 않음)
+    executor = Executor(fill_tracker).start() if EXECUTION_ENABLED else None  # ✅ 분할 주문은 별도 스레드에서
+    metrics.start()  # ✅ 로컬 `/metrics` 서버 + 주기적 JSON 스냅샷
+
+    first_decision = True
+    next_tick = time.monotonic()
+    while True:
+        tick_started = time.monotonic()
+        metrics.observe("tick_lag_seconds", max(0.0, tick_started - next_tick))  # 예정 시각보다 늦게 시작한 시간
+        current_time = time.time()
+        ready = await trade_tick(market_feed, fill_tracker, current_time, executor)
+        if not ready:
+            print(f"⚠️ OHLCV 데이터를 가져오지 못했습니다. {tick_interval}초 후 재시도...")
+        elif first_decision:
+            first_decision = False
+            elapsed = time.perf_counter() - started
+            metrics.set_gauge("time_to_first_decision_seconds", elapsed)
+            print(f"⏱️ 첫 매매 판단까지 {elapsed:.2f}초")
+            if startup_reports:
+                run_in_background(startup_report)
+
+        # ✅ 고정 간격 스케줄 (처리 시간만큼 밀리지 않음, 이미 지난 틱은 건너뜀)
+        now = time.monotonic()
+        metrics.observe("tick_duration_seconds", now - tick_started)
+        if now - next_tick > tick_interval:
+            metrics.inc("ticks_skipped_total", int((now - next_tick) // tick_interval))
+        next_tick += tick_interval
+        if next_tick < now:
+            next_tick += (now - next_tick) // tick_interval * tick_interval + tick_interval
+        if ready and market_feed is not None and market_feed.is_live():
+            # 새 시세가 들어오면 다음 틱을 기다리지 않고 바로 (최소 FEED_MIN_INTERVAL 간격)
+            updated = await asyncio.to_thread(market_feed.wait, max(0, next_tick - time.monotonic()))
+            if updated:
+                await asyncio.sleep(max(0, FEED_MIN_INTERVAL - (time.time() - current_time)))
+                next_tick = time.monotonic()
+                continue
+        await asyncio.sleep(max(0, next_tick - time.monotonic()))
+
+
+def auto_trade(startup_reports=False, started=None):
+    """asyncio 매매 루프 실행"""
+    asyncio.run(auto_trade_async(startup_reports=startup_reports, started=started))
+
+
+def benchmark_startup(latency=PAPER_LATENCY):
+    """첫 매매 판단까지 걸린 시간 측정 (모의 거래소 + 임시 DB, 거래소 접속 없음)
+    - import: 새 프로세스에서 `import auto_trade` 시간과 무거운 모듈(pandas / websockets) 로드 여부
+    - bootstrap / 첫 틱: 요청마다 latency초 지연을 주는 모의 거래소 기준
+    """
+    import os
+    import subprocess
+    import sys
+    import tempfile
+    import upbit_api
+    from simulator import SimulatedExchange
+
+    code = ("import sys, time; t = time.perf_counter(); import auto_trade; "
+            "print(time.perf_counter() - t, 'pandas' in sys.modules, 'websockets' in sys.modules)")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+    import_time, pandas_loaded, websockets_loaded = float(output[-3]), output[-2], output[-1]
+
+    init_storage(os.path.join(tempfile.mkdtemp(), "startup.db"))
+    previous = upbit_api.use_client(SimulatedExchange(latency=latency))
+    try:
+        started = time.perf_counter()
+        bootstrap()
+        booted = time.perf_counter()
+        asyncio.run(trade_tick(None, OrderManager(), time.time()))
+        decided = time.perf_counter()
+    finally:
+        upbit_api.use_client(previous)
+
+    print(f"""
+⏱️ **시작 시간 벤치마크** (요청 지연 {latency * 1000:.0f}ms) ⏱️
+📦 import auto_trade: {import_time * 1000:.0f}ms (pandas 로드: {pandas_loaded}, websockets 로드: {websockets_loaded})
+🔧 bootstrap: {(booted - started) * 1000:.0f}ms
+🎯 첫 틱 (캔들 / 시세 / 계좌 조회 + 판단): {(decided - booted) * 1000:.0f}ms
+✅ 첫 매매 판단까지: {(import_time + decided - started) * 1000:.0f}ms
+""")
 
-        # ✅ 10초 후 반복 실행
-        time.sleep(10)
 
 if __name__ == "__main__":
-    auto_trade()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="자동 매매 실행")
+    parser.add_argument("--benchmark-startup", action="store_true", help="첫 매매 판단까지 걸린 시간 측정 (모의 거래소)")
+    args = parser.parse_args()
+
+    if args.benchmark_startup:
+        benchmark_startup()
+    else:
+        auto_trade()
@@ -0,0 +1,202 @@
+import argparse
+import math
+import time
+import numpy as np
+from candles import load_candles
+from indicators import compute_frame
+from signals import DEFAULT_PARAMS
+from strategy import STRATEGIES, RsiMaBreakoutStrategy
+from config import FEE_RATE, MIN_ORDER_KRW
+
+BARS_PER_YEAR = 365 * 24 * 60  # 1분봉 기준 연율화
+
+
+def compute_indicators(candles, params=DEFAULT_PARAMS, strategy=None):
+    """전략이 요구하는 지표 배열을 벡터로 한 번에 계산 → {지표 키: 배열}"""
+    strategy = strategy or RsiMaBreakoutStrategy(params)
+    return compute_frame(candles, strategy.indicators())
+
+
+def _find_first(condition, start, end, chunk=1024):
+    """condition(a, b)가 True인 첫 인덱스 (구간을 점점 크게 나눠 벡터로 검색), 없으면 -1"""
+    while start < end:
+        stop = min(end, start + chunk)
+        hits = np.flatnonzero(condition(start, stop))
+        if hits.size:
+            return start + int(hits[0])
+        start = stop
+        chunk *= 2
+    return -1
+
+
+def run_backtest(candles, params=None, initial_krw=1_000_000, fee_rate=FEE_RATE, slippage=0.0, indicators=None,
+                 strategy=None):
+    """1분봉 배열을 auto_trade와 같은 전략으로 재생하고 결과 요약 반환
+    - 각 캔들 종가 시점에 한 번 판단 (현재가 = 종가)
+    - 시장가 체결 가정, 수수료 / 슬리피지 / 최소 주문 금액 반영
+    - 후보 캔들은 전략의 buy_mask / sell_mask로 벡터로 걸러내고, 후보에서만 전략의 buy / sell로 최종 확인
+    - strategy가 없으면 기존 자동매매 규칙 (RsiMaBreakoutStrategy)
+    """
+    strategy = strategy or RsiMaBreakoutStrategy(params)
+    params = strategy.params
+    if indicators is None:
+        indicators = compute_frame(candles, strategy.indicators())
+
+    close = np.asarray(candles["close"], dtype=np.float64)
+    times = np.asarray(candles["timestamp"], dtype=np.float64) + 60  # ✅ 캔들 마감 시각에 판단
+    n = len(close)
+
+    def row(i):
+        """i번째 캔들 시점의 지표 프레임 (실거래의 engine.frame()과 같은 형태)"""
+        return {key: values[i] for key, values in indicators.items()}
+
+    # ✅ 경로와 무관한 매수 조건은 미리 계산 (NaN 비교는 False)
+    buy_candidates = np.flatnonzero(strategy.buy_mask(indicators, close))
+
+    krw = float(initial_krw)
+    coins = 0.0
+    fees = 0.0
+    last_buy_time = 0.0
+    last_sell_time = 0.0
+    last_buy_price = float(close[0]) if n else 0.0  # auto_trade 시작 시처럼 현재가로 초기화
+    buy_cost = 0.0
+    events = []  # (캔들 인덱스, 체결 후 원화, 체결 후 코인)
+    wins = 0
+    sells = 0
+    i = 0
+
+    while i < n:
+        if coins == 0:
+            # ✅ 매수 후보: 지표 조건 + 쿨다운 이후
+            start = max(i, int(np.searchsorted(times, last_buy_time + params["cooldown"], side="right")))
+            k = int(np.searchsorted(buy_candidates, start))
+            if k >= len(buy_candidates):
+                break
+            i = int(buy_candidates[k])
+            price = float(close[i])
+            context = _context(price, times[i], last_buy_time, last_sell_time, last_buy_price, coins, krw)
+            if not strategy.buy(row(i), context):
+                i += 1
+                continue
+
+            amount = krw * params["buy_percent"] / 100.0
+            if amount < MIN_ORDER_KRW:
+                break  # 보유 원화가 더 늘어날 일이 없으므로 종료
+            fee = amount * fee_rate
+            coins = math.floor(amount / (price * (1 + slippage)) * 1e8) / 1e8  # 업비트 수량 단위 (소수점 8자리)
+            krw -= amount + fee
+            fees += fee
+            buy_cost = amount + fee
+            last_buy_time = times[i]
+            last_buy_price = price
+            events.append((i, krw, coins))
+            i += 1
+        else:
+            # ✅ 매도 후보: 전략의 매도 조건 (매수가 기준 익절/손절 포함), 쿨다운 이후
+            start = max(i, int(np.searchsorted(times, last_sell_time + params["cooldown"], side="right")))
+            entry_price = last_buy_price
+
+            def condition(a, b):
+                return strategy.sell_mask(indicators, close, entry_price, a, b)
+
+            j = _find_first(condition, start, n)
+            if j < 0:
+                break
+            i = j
+            price = float(close[i])
+            context = _context(price, times[i], last_buy_time, last_sell_time, last_buy_price, coins, krw)
+            if not strategy.sell(row(i), context):
+                i += 1
+                continue
+
+            volume = min(round(coins * params["sell_percent"] / 100.0, 8), coins)
+            if volume * price < MIN_ORDER_KRW:
+                i += 1  # 실거래처럼 주문이 거절되고 다음 틱에 다시 시도
+                continue
+            proceeds = volume * price * (1 - slippage)
+            fee = proceeds * fee_rate
+            krw += proceeds - fee
+            fees += fee
+            coins = round(coins - volume, 8)
+            sells += 1
+            wins += (proceeds - fee) > buy_cost
+            last_sell_time = times[i]
+            events.append((i, krw, coins))
+            i += 1
+
+    return _summarize(close, events, initial_krw, fees, sells, wins)
+
+
+def _context(price, now, last_buy_time, last_sell_time, last_buy_price, coins, krw):
+    """전략 판단에 넘기는 현재 상태 (auto_trade와 같은 형태)"""
+    return {"price": price, "now": now, "last_buy_time": last_buy_time, "last_sell_time": last_sell_time,
+            "last_buy_price": last_buy_price, "coin_balance": coins, "krw_balance": krw}
+
+
+def _summarize(close, events, initial_krw, fees, sells, wins):
+    """체결 기록으로 자산 곡선을 벡터로 만들고 손익 / 최대 낙폭 / 거래 수 계산"""
+    n = len(close)
+    if n == 0:
+        return {"bars": 0, "initial_krw": initial_krw, "final_equity": initial_krw, "pnl": 0.0,
+                "return_pct": 0.0, "max_drawdown_pct": 0.0, "sharpe": 0.0, "trades": 0, "buys": 0, "sells": 0,
+                "win_rate": 0.0, "fees": 0.0, "equity": np.empty(0)}
+
+    event_index = np.array([e[0] for e in events], dtype=np.int64)
+    krw_after = np.array([initial_krw] + [e[1] for e in events])
+    coins_after = np.array([0.0] + [e[2] for e in events])
+    segment = np.searchsorted(event_index, np.arange(n), side="right")  # 각 캔들 시점까지 체결된 횟수
+    equity = krw_after[segment] + coins_after[segment] * close
+
+    peak = np.maximum.accumulate(equity)
+    drawdown = (peak - equity) / peak
+    final_equity = float(equity[-1])
+
+    # ✅ 샤프 지수 (1분 수익률 평균 / 표준편차, 연율화, 무위험 수익률 0 가정)
+    returns = np.diff(equity) / equity[:-1]
+    std = returns.std() if returns.size else 0.0
+    sharpe = float(returns.mean() / std * math.sqrt(BARS_PER_YEAR)) if std > 0 else 0.0
+    return {
+        "bars": n,
+        "initial_krw": initial_krw,
+        "final_equity": final_equity,
+        "pnl": final_equity - initial_krw,
+        "return_pct": (final_equity / initial_krw - 1) * 100,
+        "max_drawdown_pct": float(drawdown.max()) * 100,
+        "sharpe": sharpe,
+        "trades": len(events),
+        "buys": len(events) - sells,
+        "sells": sells,
+        "win_rate": wins / sells * 100 if sells else 0.0,
+        "fees": fees,
+        "equity": equity,
+    }
+
+
+def format_report(result):
+    """백테스트 결과 출력용 문자열"""
+    return f"""
+📊 **백테스트 결과** 📊
+🕒 캔들 수: {result['bars']:,}개
+💰 시작 자산: {result['initial_krw']:,.0f} KRW → 최종 자산: {result['final_equity']:,.0f} KRW
+✅ 손익: {result['pnl']:,.0f} KRW ({result['return_pct']:.2f}%)
+📉 최대 낙폭: {result['max_drawdown_pct']:.2f}%, 샤프 지수: {result['sharpe']:.2f}
+🔁 거래 수: {result['trades']}회 (매수 {result['buys']} / 매도 {result['sells']}), 승률: {result['win_rate']:.1f}%
+💸 수수료 합계: {result['fees']:,.0f} KRW
+"""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 1분봉 파일로 자동매매 규칙 백테스트 (거래소 접속 없음)")
+    parser.add_argument("path", help="캔들 파일 (.npy 또는 .csv)")
+    parser.add_argument("--krw", type=float, default=1_000_000, help="시작 원화")
+    parser.add_argument("--fee", type=float, default=FEE_RATE, help="거래 수수료율")
+    parser.add_argument("--slippage", type=float, default=0.0, help="시장가 체결 슬리피지 비율")
+    parser.add_argument("--strategy", default=RsiMaBreakoutStrategy.name, choices=list(STRATEGIES), help="전략")
+    args = parser.parse_args()
+
+    candles = load_candles(args.path)
+    started = time.perf_counter()
+    result = run_backtest(candles, initial_krw=args.krw, fee_rate=args.fee, slippage=args.slippage,
+                          strategy=STRATEGIES[args.strategy]())
+    print(format_report(result))
+    print(f"⏱️ 소요 시간: {time.perf_counter() - started:.2f}초")
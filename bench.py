@@ -0,0 +1,287 @@
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from config import MARKETS, BENCH_RESULTS_FILE, BENCH_BASELINE_FILE, BENCH_TOLERANCE
+
+### ✅ 핫 경로 마이크로 벤치마크 (오프라인: 거래소 대신 모의 거래소, 실제 DB / 로그 대신 임시 폴더)
+### - 벤치마크 1개 = 준비 함수 → 측정할 동작 1회를 실행하는 함수 반환, 동작 number회 × repeat번 측정
+### - 결과: 동작 1회당 시간(µs) 중앙값 / 최솟값 → JSON 저장 + 저장된 기준값과 비교 (느려지면 종료 코드 1)
+
+CANDLES = 200  # get_ohlcv 기본 개수 (매매 루프가 실제로 계산하는 캔들 수)
+LOG_MB = 8  # 미리 채워 둘 지갑 로그 크기 (교체 기준 LOG_MAX_BYTES보다 작게)
+
+
+def _ohlcv(count=CANDLES, seed=0):
+    """호가 단위(1,000원)로 반올림한 합성 캔들 → get_ohlcv 응답과 같은 JSON 목록 (최신 캔들이 마지막)"""
+    import numpy as np
+    from candles import to_upbit
+    from simulator import synthetic_candles
+
+    candles = synthetic_candles(count, volatility=0.002, seed=seed)
+    for name in ("open", "high", "low", "close"):
+        candles[name] = np.round(candles[name], -3)
+    return to_upbit(candles)
+
+
+def _exchange(**kwargs):
+    """수동 시계 모의 거래소를 기본 클라이언트로 설치 (요청 지연 없음)"""
+    import upbit_api
+    from simulator import SimulatedExchange
+
+    exchange = SimulatedExchange(manual=True, latency=0, **kwargs)
+    upbit_api.use_client(exchange)
+    return exchange
+
+
+### ✅ 1. 지표 계산
+def bench_calculate_rsi():
+    from upbit_api import calculate_rsi
+
+    closes = [c["trade_price"] for c in _ohlcv()]
+    return lambda: calculate_rsi(closes)
+
+
+def bench_calculate_moving_average():
+    from upbit_api import calculate_moving_average
+
+    candles = _ohlcv()
+    return lambda: calculate_moving_average(candles, 5, 20)
+
+
+def bench_calculate_volatility_breakout():
+    from upbit_api import calculate_volatility_breakout
+
+    candles = _ohlcv()
+    return lambda: calculate_volatility_breakout(candles)
+
+
+### ✅ 2. 주문 요청 서명
+def bench_get_headers():
+    import upbit_api
+
+    upbit_api.use_client(upbit_api.UpbitClient(access_key="bench-access", secret_key="bench-secret"))
+    query = {"market": "KRW-BTC", "side": "bid", "price": "10000", "ord_type": "price"}
+    return lambda: upbit_api.get_headers(query)
+
+
+### ✅ 3. DB 쓰기
+def bench_save_balance_to_db():
+    from account import get_balance_list
+    from database import save_balance_to_db
+
+    exchange = _exchange()
+    exchange.balances.update({"BTC": 0.01, "ETH": 0.5, "XRP": 1200.0})
+    get_balance_list()  # 계좌 스냅샷을 미리 받아 둠 (매매 틱과 같은 조건 → DB 쓰기만 측정)
+    return save_balance_to_db
+
+
+def bench_save_last_buy_price():
+    from database import save_last_buy_price
+
+    prices = iter(range(100_000_000, 10**12, 1000))
+    return lambda: save_last_buy_price(next(prices))
+
+
+def bench_save_to_database():
+    """공개 체결 1페이지(200건) 저장, 매번 새 sequential_id"""
+    from trades import save_to_database
+
+    ids = iter(range(1, 10**12, CANDLES))
+
+    def run():
+        first = next(ids)
+        ticks = [
+            {"trade_date_utc": "2026-01-01", "trade_time_utc": "00:00:00", "trade_price": 100_000_000 + i % 1000,
+             "trade_volume": 0.001, "ask_bid": "BID" if i % 2 else "ASK", "sequential_id": first + i}
+            for i in range(CANDLES)
+        ]
+        save_to_database(ticks, "KRW-BTC")
+
+    return run
+
+
+### ✅ 4. 로그 (LOG_MB 크기의 기존 로그 파일에 추가, 기록 1개 + 파일 반영까지)
+def bench_save_to_wallet_log():
+    import logger
+    from config import WALLET_LOG_FILE
+
+    os.makedirs(os.path.dirname(WALLET_LOG_FILE), exist_ok=True)
+    line = json.dumps({"time": "2026-01-01T00:00:00", "iteration": 0, "kind": "wallet", "message": "x" * 200}) + "\n"
+    with open(WALLET_LOG_FILE, "w", encoding="utf-8") as f:
+        f.write(line * (LOG_MB * 1024 * 1024 // len(line)))
+    message = "💰 KRW: 1,000,000 | BTC: 0.01 (1,000,000 KRW) | 총 평가: 2,000,000 KRW"
+
+    def run():
+        logger.save_to_wallet_log(message)
+        logger.flush()
+
+    return run
+
+
+### ✅ 5. 자동매매 틱 1회 (모의 거래소: 티커 / 캔들 / 계좌 조회 + 지표 + 전략 판단 + 주문)
+def bench_auto_trade_tick():
+    import auto_trade
+    from order_manager import OrderManager
+
+    exchange = _exchange()
+    auto_trade.bootstrap()
+    tracker = OrderManager()
+    loop = asyncio.new_event_loop()
+
+    def run():
+        exchange.advance(60)  # 매 틱 새 캔들 → 캔들 조회 + 지표 갱신 경로까지 포함
+        loop.run_until_complete(auto_trade.trade_tick(None, tracker, exchange.now()))
+
+    return run
+
+
+# ✅ 이름 → (준비 함수, 측정 1번에 실행할 횟수)
+BENCHMARKS = {
+    "calculate_rsi": (bench_calculate_rsi, 2000),
+    "calculate_moving_average": (bench_calculate_moving_average, 2000),
+    "calculate_volatility_breakout": (bench_calculate_volatility_breakout, 2000),
+    "get_headers": (bench_get_headers, 2000),
+    "save_balance_to_db": (bench_save_balance_to_db, 200),
+    "save_last_buy_price": (bench_save_last_buy_price, 200),
+    "save_to_database": (bench_save_to_database, 50),
+    "save_to_wallet_log": (bench_save_to_wallet_log, 200),
+    "auto_trade_tick": (bench_auto_trade_tick, 200),
+}
+
+
+def measure(run, number, repeat):
+    """동작 1회당 시간(µs) 목록 (number회 실행 시간 / number, repeat번)"""
+    run()  # 준비 (캐시 / 연결 / 첫 캔들 로드)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            run()
+        samples.append((time.perf_counter() - started) / number * 1e6)
+    return samples
+
+
+def run_benchmarks(names=None, repeat=5, scale=1.0):
+    """임시 작업 폴더에서 벤치마크 실행 → 결과 딕셔너리 (출력은 버림)"""
+    import logger
+
+    names = names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"❌ 알 수 없는 벤치마크: {', '.join(unknown)} (사용 가능: {', '.join(BENCHMARKS)})")
+
+    results = {}
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="bench-"))  # ✅ data/, log/ 상대 경로가 모두 임시 폴더를 가리킴
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as null:
+            for name in names:
+                setup, number = BENCHMARKS[name]
+                number = max(1, int(number * scale))
+                with contextlib.redirect_stdout(null):
+                    samples = measure(setup(), number, repeat)
+                results[name] = {
+                    "median_us": statistics.median(samples),
+                    "min_us": min(samples),
+                    "number": number,
+                    "repeat": repeat,
+                }
+                print(f"⏱️ {name}: {results[name]['median_us']:,.1f}µs", file=sys.stderr)
+    finally:
+        logger.shutdown()  # 남은 로그 / 회차 번호 파일을 임시 폴더 안에서 마저 씀
+        os.chdir(cwd)
+
+    return {
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "markets": MARKETS,
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance=BENCH_TOLERANCE):
+    """기준값 대비 중앙값 비율 → {이름: (비율, 상태)}, 상태는 "regression" / "improvement" / "ok" / "new" """
+    comparison = {}
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            comparison[name] = (None, "new")
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        if ratio > 1 + tolerance:
+            comparison[name] = (ratio, "regression")
+        elif ratio < 1 / (1 + tolerance):
+            comparison[name] = (ratio, "improvement")
+        else:
+            comparison[name] = (ratio, "ok")
+    return comparison
+
+
+def print_report(report, comparison):
+    icons = {"regression": "🐢 느려짐", "improvement": "🚀 빨라짐", "ok": "✅", "new": "🆕 기준값 없음"}
+    lines = []
+    for name, result in report["results"].items():
+        ratio, status = comparison.get(name, (None, "new"))
+        versus = f" | 기준값 대비 {ratio:.2f}배" if ratio is not None else ""
+        lines.append(f"{name:<32} {result['median_us']:>12,.1f}µs (최소 {result['min_us']:,.1f}µs){versus} {icons[status]}")
+    print(f"""
+⏱️ **핫 경로 벤치마크** (Python {report['python']}, 동작 1회당 중앙값) ⏱️
+{chr(10).join(lines)}
+""")
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="핫 경로 마이크로 벤치마크 (오프라인)")
+    parser.add_argument("names", nargs="*", help=f"실행할 벤치마크 (기본: 전체 = {', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (중앙값 / 최솟값 계산)")
+    parser.add_argument("--quick", action="store_true", help="실행 횟수를 1/10로 줄여 빠르게 확인")
+    parser.add_argument("--output", default=BENCH_RESULTS_FILE, help="결과 JSON 경로 (- 이면 표준 출력)")
+    parser.add_argument("--baseline", default=BENCH_BASELINE_FILE, help="비교할 기준값 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=BENCH_TOLERANCE, help="성능 저하로 볼 느려짐 비율")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    args = parser.parse_args()
+
+    # ✅ 결과 / 기준값 경로는 임시 작업 폴더로 옮기기 전에 절대 경로로
+    output = args.output if args.output == "-" else os.path.abspath(args.output)
+    baseline_path = os.path.abspath(args.baseline)
+
+    report = run_benchmarks(args.names, args.repeat, 0.1 if args.quick else 1.0)
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+    comparison = compare(report, baseline, args.tolerance)
+    report["comparison"] = {
+        name: {"ratio": ratio, "status": status} for name, (ratio, status) in comparison.items()
+    }
+
+    if output == "-":
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_report(report, comparison)
+        _write_json(output, report)
+        print(f"✅ 결과가 {output} 파일에 저장되었습니다.")
+    if args.save_baseline:
+        _write_json(baseline_path, {key: value for key, value in report.items() if key != "comparison"})
+        print(f"✅ 기준값이 {baseline_path} 파일에 저장되었습니다.", file=sys.stderr)
+
+    regressions = [name for name, (_, status) in comparison.items() if status == "regression"]
+    if regressions:
+        print(f"⚠️ 성능 저하: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
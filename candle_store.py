@@ -0,0 +1,176 @@
+import argparse
+import os
+import time
+import numpy as np
+from candles import CANDLE_DTYPE, from_upbit, to_upbit
+from upbit_api import get_ohlcv
+from config import CANDLE_DIR, MARKETS
+
+PAGE_SIZE = 200  # 업비트 캔들 요청 1회 최대 개수
+
+
+def candle_path(market, unit=1, directory=CANDLE_DIR):
+    """마켓/분 단위별 캔들 파일 경로 (예: data/candles/KRW-BTC_1m.bin)"""
+    return os.path.join(directory, f"{market}_{unit}m.bin")
+
+
+def _open(path):
+    """캔들 파일을 메모리 매핑으로 열기 (파일이 없거나 비어 있으면 빈 배열)"""
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    count = size // CANDLE_DTYPE.itemsize  # ✅ 쓰다가 중단된 마지막 레코드 조각은 무시
+    if count == 0:
+        return np.empty(0, dtype=CANDLE_DTYPE)
+    return np.memmap(path, dtype=CANDLE_DTYPE, mode="r", shape=(count,))
+
+
+def read_candles(market, unit=1, start=None, end=None, directory=CANDLE_DIR):
+    """저장된 캔들 중 start <= timestamp < end 구간 (epoch 초, 시간순 정렬이므로 이진 탐색으로 잘라 복사 없이 반환)"""
+    candles = _open(candle_path(market, unit, directory))
+    timestamps = candles["timestamp"]
+    lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+    hi = len(candles) if end is None else int(np.searchsorted(timestamps, end, side="left"))
+    return candles[lo:hi]
+
+
+def _merge(*arrays):
+    """캔들 배열 합치기 (시각 기준 중복 제거, 같은 시각이면 나중 배열의 값 사용)"""
+    merged = np.concatenate([np.asarray(a, dtype=CANDLE_DTYPE) for a in arrays])
+    # ✅ 뒤에서부터 첫 번째 값을 고르면 나중에 받은 캔들이 남음
+    _, index = np.unique(merged["timestamp"][::-1], return_index=True)
+    return merged[::-1][index]
+
+
+def _completed(array, unit, now=None):
+    """진행 중인 캔들은 제외 (저장소에는 마감된 캔들만 추가)"""
+    now = time.time() if now is None else now
+    return array[array["timestamp"] + unit * 60 <= now]
+
+
+def _fetch_page(market, unit, to=None):
+    """캔들 한 페이지 요청 (to 이전 최대 200개, 실패하면 None)"""
+    page = get_ohlcv(market, PAGE_SIZE, to=to, unit=unit)
+    if not isinstance(page, list):
+        return None
+    return from_upbit(page)
+
+
+def _to_param(timestamp):
+    """epoch 초 → 업비트 `to` 파라미터 (UTC)"""
+    return f"{np.datetime64(int(timestamp), 's')}Z"
+
+
+### ✅ 1. 최신 캔들 추가 (append-only)
+def update_candles(market, unit=1, directory=CANDLE_DIR, max_pages=None):
+    """저장된 마지막 캔들 이후의 마감된 캔들을 받아 파일 끝에 추가하고 추가한 개수 반환"""
+    path = candle_path(market, unit, directory)
+    stored = _open(path)
+    last = int(stored["timestamp"][-1]) if len(stored) else None
+
+    pages = []
+    to = None
+    while max_pages is None or len(pages) < max_pages:
+        page = _fetch_page(market, unit, to)
+        if page is None or len(page) == 0:
+            break
+        pages.append(page)
+        if last is not None and page["timestamp"][0] <= last:
+            break  # 저장된 구간까지 도달
+        if last is None and max_pages is None:
+            break  # 저장소가 비어 있으면 최신 1페이지만 (과거 구간은 backfill_candles로)
+        to = _to_param(page["timestamp"][0])
+    else:
+        if last is not None:  # ✅ 저장된 구간까지 닿지 못함 → 최신 구간만 추가 (사이 구간은 비어 있음)
+            print(f"⚠️ {market} 캔들 {max_pages}페이지로 저장된 구간까지 닿지 못해 사이 구간을 건너뜁니다.")
+
+    if not pages:
+        return 0
+    new = _completed(_merge(*reversed(pages)), unit)
+    if last is not None:
+        new = new[new["timestamp"] > last]
+    if len(new) == 0:
+        return 0
+
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "ab") as f:
+        f.write(new.tobytes())
+    return len(new)
+
+
+### ✅ 2. 과거 캔들 채우기 (저장된 첫 캔들 이전으로 페이지 넘김)
+def backfill_candles(market, unit=1, since=None, days=30, directory=CANDLE_DIR):
+    """since(epoch 초, 기본: days일 전)까지 과거 캔들을 받아 저장소 앞쪽에 채우고 추가한 개수 반환"""
+    since = time.time() - days * 86400 if since is None else since
+    path = candle_path(market, unit, directory)
+    stored = _open(path)
+    if len(stored) == 0:
+        update_candles(market, unit, directory)
+        stored = _open(path)
+        if len(stored) == 0:
+            print(f"⚠️ {market} 캔들을 가져오지 못했습니다.")
+            return 0
+
+    oldest = int(stored["timestamp"][0])
+    pages = []
+    fetched = 0
+    while oldest > since:
+        page = _fetch_page(market, unit, _to_param(oldest))
+        if page is None:
+            print(f"⚠️ {market} 과거 캔들 요청 실패, 받은 구간까지만 저장합니다.")
+            break
+        if len(page) == 0:
+            break  # 상장 이전 구간
+        pages.append(page)
+        fetched += len(page)
+        oldest = int(page["timestamp"][0])
+        if len(pages) % 50 == 0:
+            print(f"⏳ {market} {fetched:,}개 수신 ({np.datetime64(oldest, 's')}까지)")
+
+    if not pages:
+        return 0
+
+    # ✅ 과거 구간은 파일 앞에 들어가야 하므로 한 번만 새 파일로 쓰고 교체 (중간에 중단돼도 기존 파일 유지)
+    older = _merge(*reversed(pages))
+    older = older[(older["timestamp"] >= since) & (older["timestamp"] < stored["timestamp"][0])]
+    merged = np.concatenate([older, stored])
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(merged.tobytes())
+    del stored
+    os.replace(temp_path, path)
+    return len(older)
+
+
+def sync_candles(market, unit=1, days=30, directory=CANDLE_DIR):
+    """과거 채우기 + 최신 추가를 한 번에 (저장소를 days일 전 ~ 현재로 맞춤)"""
+    added = backfill_candles(market, unit, days=days, directory=directory)
+    added += update_candles(market, unit, directory)
+    return added
+
+
+def warm_start(engine, unit=1, directory=CANDLE_DIR):
+    """저장소를 최신으로 맞춘 뒤 마지막 캔들들로 지표 엔진 초기화 (REST 200개 요청 대신 디스크에서 읽음)
+    - 시작 시 요청은 지표 버퍼(engine.maxlen)를 채울 만큼만, 더 과거 구간은 backfill_candles로
+    """
+    max_pages = -(-engine.maxlen // PAGE_SIZE) + 1  # ✅ 진행 중인 캔들 / 페이지 경계 몫으로 1페이지 더
+    update_candles(engine.market, unit, directory, max_pages=max_pages)
+    recent = read_candles(engine.market, unit, directory=directory)[-engine.maxlen:]
+    if len(recent) == 0:
+        return False
+    return engine.seed(to_upbit(recent, engine.market))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="업비트 과거 분봉을 로컬 저장소에 받아 두기")
+    parser.add_argument("markets", nargs="*", default=MARKETS, help="마켓 목록 (기본: config.MARKETS)")
+    parser.add_argument("--unit", type=int, default=1, help="분 단위 (1, 3, 5, 10, 15, 30, 60, 240)")
+    parser.add_argument("--days", type=float, default=30, help="채울 과거 기간 (일)")
+    args = parser.parse_args()
+
+    for market in args.markets:
+        started = time.perf_counter()
+        added = sync_candles(market, args.unit, args.days)
+        stored = read_candles(market, args.unit)
+        span = ""
+        if len(stored):
+            span = f" ({np.datetime64(int(stored['timestamp'][0]), 's')} ~ {np.datetime64(int(stored['timestamp'][-1]), 's')})"
+        print(f"✅ {market} {added:,}개 추가, 총 {len(stored):,}개{span} - {time.perf_counter() - started:.1f}초")
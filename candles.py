@@ -0,0 +1,105 @@
+import numpy as np
+
+# ✅ 캔들 배열 형식 (시간순, 한 행 = 캔들 1개, timestamp는 캔들 시작 시각 epoch 초)
+CANDLE_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+
+def from_upbit(candles):
+    """업비트 캔들 JSON 목록 → 시간순으로 정렬된 캔들 배열"""
+    array = np.empty(len(candles), dtype=CANDLE_DTYPE)
+    if len(candles) == 0:
+        return array
+    array["timestamp"] = np.array(
+        [c["candle_date_time_utc"] for c in candles], dtype="datetime64[s]"
+    ).astype(np.int64)
+    array["open"] = [c["opening_price"] for c in candles]
+    array["high"] = [c["high_price"] for c in candles]
+    array["low"] = [c["low_price"] for c in candles]
+    array["close"] = [c["trade_price"] for c in candles]
+    array["volume"] = [c.get("candle_acc_trade_volume", 0.0) for c in candles]
+    return array[np.argsort(array["timestamp"], kind="stable")]
+
+
+# ✅ 캔들 배열 열 이름 → 업비트 캔들 JSON 키
+UPBIT_FIELDS = {
+    "open": "opening_price",
+    "high": "high_price",
+    "low": "low_price",
+    "close": "trade_price",
+    "volume": "candle_acc_trade_volume",
+}
+
+
+def candle_column(data, name, last=None):
+    """캔들 데이터에서 열 하나를 float64 배열로 (pandas 없이, 필요한 열만 읽음)
+    - 캔들 배열: 복사 없이 열 뷰 그대로
+    - 업비트 캔들 JSON 목록: 해당 키만 한 번에 읽음 (last가 있으면 마지막 last개만)
+    - 그 밖에 업비트 키로 열을 꺼낼 수 있는 객체 (DataFrame 등): 그 열을 배열로
+    """
+    if isinstance(data, np.ndarray) and data.dtype.names:
+        return data[name]
+    key = UPBIT_FIELDS[name]
+    if isinstance(data, list):
+        rows = data[-last:] if last else data
+        return np.fromiter((c[key] for c in rows), dtype=np.float64, count=len(rows))
+    return np.asarray(data[key], dtype=np.float64)
+
+
+def close_prices(data, last=None):
+    """종가 배열 (캔들 배열 / 캔들 JSON 목록이면 종가 열, 가격 목록 / Series면 그대로 배열로)
+    - last: 목록이면 마지막 last개만 변환 (최신 값 계산에 필요한 구간만 읽음)
+    """
+    if isinstance(data, np.ndarray) and data.dtype.names or isinstance(data, list) and data and isinstance(data[0], dict):
+        return candle_column(data, "close", last)
+    if isinstance(data, list) and last:
+        data = data[-last:]
+    return np.asarray(data, dtype=np.float64)
+
+
+def to_upbit(array, market=None):
+    """캔들 배열 → 업비트 캔들 JSON 형식 목록 (지표 엔진 초기화용)"""
+    times = array["timestamp"].astype("datetime64[s]").astype(str).tolist()
+    return [
+        {
+            "market": market,
+            "candle_date_time_utc": t,
+            "opening_price": float(o),
+            "high_price": float(h),
+            "low_price": float(l),
+            "trade_price": float(c),
+            "candle_acc_trade_volume": float(v),
+        }
+        for t, o, h, l, c, v in zip(
+            times, array["open"], array["high"], array["low"], array["close"], array["volume"]
+        )
+    ]
+
+
+def load_candles(path):
+    """로컬 캔들 파일 불러오기
+    - .npy: CANDLE_DTYPE 배열 (메모리 매핑으로 복사 없이 읽음)
+    - .bin: candle_store.py 저장소 파일 (CANDLE_DTYPE 레코드를 이어 붙인 파일, 메모리 매핑)
+    - .csv: timestamp,open,high,low,close,volume 헤더가 있는 파일 (timestamp는 epoch 초)
+    """
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    if path.endswith(".bin"):
+        return np.memmap(path, dtype=CANDLE_DTYPE, mode="r")
+
+    raw = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+    array = np.empty(len(raw), dtype=CANDLE_DTYPE)
+    for i, name in enumerate(CANDLE_DTYPE.names):
+        array[name] = raw[:, i]
+    return array[np.argsort(array["timestamp"], kind="stable")]
+
+
+def save_candles(path, array):
+    """캔들 배열을 .npy로 저장"""
+    np.save(path, np.asarray(array, dtype=CANDLE_DTYPE))
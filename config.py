@@ -8,20 +8,119 @@ load_dotenv()
 ACCESS_KEY = os.getenv("UPBIT_ACCESS_KEY")
 SECRET_KEY = os.getenv("UPBIT_SECRET_KEY")
 SERVER_URL = "https://api.upbit.com"
+WS_URL = "wss://api.upbit.com/websocket/v1"  # 실시간 시세 웹소켓
+
+# ✅ 거래 모드 ("live": 업비트 실거래, "paper": 로컬 모의 거래소 → 주문이 실제로 나가지 않음)
+TRADING_MODE = os.getenv("TRADING_MODE", "live")
+
+# ✅ HTTP 요청 설정 (연결 풀 + 타임아웃 + 조회 요청 재시도)
+REQUEST_TIMEOUT = (3, 10)  # (연결, 응답) 타임아웃 초
+REQUEST_RETRIES = 3  # 조회(GET) 실패 시 재시도 횟수
+REQUEST_BACKOFF = 0.5  # 재시도 간격 (0.5초, 1초, 2초 ...)
+HTTP_POOL_SIZE = 10  # keep-alive 연결 풀 크기
+
+# ✅ 업비트 요청 그룹별 초당 허용 횟수 (응답의 Remaining-Req 헤더로 실제 남은 횟수에 맞춰 조정)
+RATE_LIMITS = {
+    "default": 30,  # 거래소 API (계좌, 주문 조회 등)
+    "order": 8,  # 주문 접수
+    "market": 10,
+    "candle": 10,
+    "crix-trade": 10,
+    "ticker": 10,
+    "orderbook": 10,
+}
 
 # 저장할 폴더 경로 설정
 DB_DIR = "data"  # 데이터베이스 폴더
 LOG_DIR = "log"  # 로그 폴더
 
-# ✅ 데이터베이스 파일 개별 저장
+# ✅ 데이터베이스 (지갑 / 거래 기록 / 거래 내역 / 자동매매 상태를 하나의 WAL 모드 DB에 저장)
+LIVE_DB = os.path.join(DB_DIR, "trading.db")  # 실거래 기록
+TRADING_DB = os.path.join(DB_DIR, "paper.db") if TRADING_MODE == "paper" else LIVE_DB  # 모의 거래 기록은 별도 DB
+
+# ✅ 기존 개별 DB 파일 (처음 실행할 때 한 번만 trading.db로 가져옴, 모의 거래 / 임시 DB에는 가져오지 않음)
 WALLET_DB = os.path.join(DB_DIR, "wallet.db")  # ✅ 지갑 정보 전용 DB
 TRADE_HISTORY_DB = os.path.join(DB_DIR, "trade_history.db")  # ✅ 거래 기록 DB
 TRANSACTIONS_DB = os.path.join(DB_DIR, "transactions.db")  # ✅ 거래 내역 DB
 TRADE_STATE_DB = os.path.join(DB_DIR, "trade_state.db")  # ✅ 자동매매 상태 저장 DB (새롭게 추가)
+LEGACY_DBS = {
+    "wallet": WALLET_DB,
+    "trade_history": TRADE_HISTORY_DB,
+    "transactions": TRANSACTIONS_DB,
+    "trade_state": TRADE_STATE_DB,
+}
+CANDLE_DIR = os.path.join(DB_DIR, "candles")  # ✅ 과거 캔들 저장소 (마켓/분 단위별 파일 1개)
 
-# ✅ 로그 파일 경로
-WALLET_LOG_FILE = os.path.join(LOG_DIR, "wallet_log.txt")
-TRADES_LOG_FILE = os.path.join(LOG_DIR, "trades_log.txt")
+# ✅ 로그 파일 경로 (JSON Lines, 한 줄 = 기록 1개)
+WALLET_LOG_FILE = os.path.join(LOG_DIR, "wallet_log.jsonl")
+TRADES_LOG_FILE = os.path.join(LOG_DIR, "trades_log.jsonl")
+RECENT_TRADES_FILE = os.path.join(LOG_DIR, "recent_trades.txt")  # ✅ 최근 매수/매도 내역 (매번 덮어쓰는 현황 파일)
+LEGACY_LOG_FILES = {  # 기존 텍스트 로그 (회차 번호를 이어서 매기기 위해 처음 한 번만 읽음)
+    WALLET_LOG_FILE: os.path.join(LOG_DIR, "wallet_log.txt"),
+    TRADES_LOG_FILE: os.path.join(LOG_DIR, "trades_log.txt"),
+}
+
+# ✅ 로그 교체 설정 (크기 또는 날짜가 바뀌면 gzip으로 압축 보관)
+LOG_MAX_BYTES = 10 * 1024 * 1024  # 10MB
+LOG_ROTATE_DAILY = True
+LOG_BACKUP_COUNT = 30  # 보관할 압축 파일 수
+
+# ✅ 지표 수집 (로컬 HTTP `/metrics` + 주기적 JSON 스냅샷)
+METRICS_ENABLED = True
+METRICS_HOST = "127.0.0.1"  # 외부에 노출하지 않도록 로컬에서만 접근
+METRICS_PORT = 9108
+METRICS_FILE = os.path.join(LOG_DIR, "metrics.json")
+METRICS_SNAPSHOT_INTERVAL = 60  # JSON 스냅샷 저장 간격 (초)
 
 # ✅ 거래 시장 설정 (기본값)
 MARKET = "KRW-BTC"
+MARKETS = [MARKET]  # ✅ 동시에 자동매매할 마켓 목록 (예: ["KRW-BTC", "KRW-ETH", "KRW-XRP"])
+MARKET_ALLOCATIONS = {}  # ✅ 마켓별 자본 배분 비중 (예: {"KRW-BTC": 2, "KRW-ETH": 1}), 비어 있으면 균등 배분
+ACTIVE_STRATEGIES = ["rsi_ma_breakout"]  # ✅ 사용할 전략 (strategy.py의 STRATEGIES, 앞쪽 전략의 신호가 우선)
+
+# ✅ 실시간 시세 설정 (웹소켓 사용 시 REST 폴링 대신 푸시된 시세/캔들 사용)
+USE_WEBSOCKET = True
+FEED_MIN_INTERVAL = 1  # 시세가 들어와도 최소 1초 간격으로 판단
+TICK_INTERVAL = 10  # ✅ 매매 틱 간격 (초), 처리 시간과 관계없이 고정 간격으로 실행
+PRICE_TTL = 5  # ✅ 시세 캐시 유효 시간 (초), 지갑 평가와 매매 루프가 함께 사용
+MARKET_LIST_TTL = 3600  # 거래 가능한 마켓 목록 캐시 유효 시간 (초)
+WARM_START = True  # ✅ 시작 시 로컬 캔들 저장소를 최신으로 맞추고 지표를 디스크에서 초기화
+
+# ✅ 주문 / 수수료 설정 (실거래 주문 검증과 백테스트 체결 시뮬레이션에 공통 사용)
+MIN_ORDER_KRW = 5000  # 업비트 최소 주문 금액
+FEE_RATE = 0.0005  # 업비트 KRW 마켓 거래 수수료 (0.05%)
+
+# ✅ 주문 실행 설정 (execution.py: 호가로 예상 슬리피지를 계산해 시장가 / 지정가 IOC / 분할 주문 중 선택)
+EXECUTION_ENABLED = True  # False면 기존처럼 항상 시장가 1번
+EXEC_MARKET_MAX_IMPACT = 0.001  # 예상 슬리피지(최우선 호가 대비)가 0.1% 이하면 시장가 1번
+EXEC_LIMIT_MAX_IMPACT = 0.003  # 0.3% 이하면 가격 상한을 둔 지정가 IOC 1번 (즉시 체결되지 않은 수량은 취소)
+EXEC_MAX_SLIPPAGE = 0.005  # 지정가 / 분할 주문 가격 한도 (판단가 대비 0.5%)
+EXEC_MAX_SLICES = 10  # 분할 주문 최대 횟수 (조각마다 최소 주문 금액 이상)
+EXEC_SLICE_INTERVAL = 10  # 분할 주문 간격 (초), 조각 수 × 간격이 매매 쿨다운보다 짧게
+EXEC_PASSIVE_LIMIT = False  # True면 시장가로 충분한 주문도 최우선 호가에 지정가로 대기 (스프레드를 내지 않음, 체결은 늦어짐)
+
+# ✅ 체결 확인 설정 (주문 접수 후 백그라운드에서 체결 내역을 조회해 거래 기록에 저장)
+FILL_POLL_INTERVAL = 0.5  # 첫 조회 간격 (초), 미체결이면 점점 늘어남
+FILL_MAX_POLL_INTERVAL = 30  # 최대 조회 간격 (초, 오래 걸리는 지정가 주문)
+
+# ✅ 주문 관리 설정 (order_manager.py: 미체결 주문 일괄 조회 + 오래된 지정가 주문 취소 / 재주문)
+ORDER_POLL_BATCH = 100  # 한 번에 상태를 조회할 주문 수 (`/v1/orders/uuids` 최대 100개)
+LIMIT_ORDER_TTL = 60  # 지정가 주문 대기 시간 (초), 지나면 취소 (재주문 허용 주문은 새 최우선 호가로 다시 주문)
+LIMIT_ORDER_MAX_REPLACES = 3  # 최대 재주문 횟수, (재주문 + 1) × 대기 시간이 매매 쿨다운보다 짧게
+
+# ✅ 모의 거래 설정 (TRADING_MODE = "paper", simulator.py)
+PAPER_INITIAL_KRW = 1_000_000  # 시작 원화
+PAPER_DATA = {}  # 마켓 → 재생할 캔들 파일 (.npy / .csv / .bin), 없는 마켓은 합성 캔들
+PAPER_LATENCY = 0.05  # 요청 1회 지연 (초)
+PAPER_BOOK_DEPTH = 5_000_000  # 가상 호가 1단계 잔량 (KRW, 멀어질수록 늘어남)
+PAPER_SPREAD = 0.0002  # 가상 호가 단계 간격 (가격 대비 비율)
+
+# ✅ 공개 체결(틱) 수집 설정
+TRADES_PAGE_SIZE = 500  # `/v1/trades/ticks` 요청 1회 최대 개수
+TRADES_MAX_PAGES = 20  # 한 번 수집할 때 과거로 넘길 최대 페이지 수
+INGEST_BATCH_SIZE = 10000  # 한 트랜잭션에 넣을 행 수 (쓰기 잠금을 짧게 유지)
+
+# ✅ 핫 경로 벤치마크 설정 (bench.py, 결과는 JSON으로 저장하고 기준값과 비교)
+BENCH_RESULTS_FILE = os.path.join(LOG_DIR, "bench.json")  # 마지막 실행 결과
+BENCH_BASELINE_FILE = os.path.join(DB_DIR, "bench_baseline.json")  # 비교 기준값 (--save-baseline으로 갱신)
+BENCH_TOLERANCE = 0.25  # 중앙값이 기준값보다 25% 넘게 느리면 성능 저하로 표시
@@ -0,0 +1,404 @@
+import collections
+import heapq
+import itertools
+import math
+import threading
+import time
+from upbit_api import get_orderbook, place_order
+from config import (
+    MIN_ORDER_KRW, EXEC_MARKET_MAX_IMPACT, EXEC_LIMIT_MAX_IMPACT, EXEC_MAX_SLIPPAGE, EXEC_MAX_SLICES,
+    EXEC_SLICE_INTERVAL, EXEC_PASSIVE_LIMIT, LIMIT_ORDER_TTL,
+)
+import metrics
+
+METHOD_NAMES = {"market": "시장가", "limit": "지정가 IOC", "twap": "분할 주문", "passive": "최우선 호가 지정가"}
+
+
+### ✅ 1. 호가 단위 (KRW 마켓)
+def tick_size(price):
+    """KRW 마켓 호가 단위"""
+    for floor, tick in ((2_000_000, 1000), (1_000_000, 500), (500_000, 100), (100_000, 50), (10_000, 10),
+                        (1_000, 1), (100, 0.1), (10, 0.01), (1, 0.001), (0.1, 0.0001), (0.01, 0.00001)):
+        if price >= floor:
+            return tick
+    return 0.000001
+
+
+def round_to_tick(price, side):
+    """지정가를 호가 단위에 맞춤 (매수는 올림, 매도는 내림 → 항상 즉시 체결 가능한 쪽으로)"""
+    tick = tick_size(price)
+    steps = price / tick
+    steps = math.ceil(steps - 1e-9) if side == "bid" else math.floor(steps + 1e-9)
+    return round(steps * tick, 8)
+
+
+def _floor8(volume):
+    """업비트 수량 단위 (소수점 8자리, 버림)"""
+    return math.floor(volume * 1e8) / 1e8
+
+
+### ✅ 2. 호가 / 예상 슬리피지
+def parse_orderbook(orderbook):
+    """업비트 호가 응답 1개 → (매도 호가 [(가격, 잔량)] 낮은 순, 매수 호가 [(가격, 잔량)] 높은 순)"""
+    units = orderbook.get("orderbook_units") or []
+    asks = [(float(unit["ask_price"]), float(unit["ask_size"])) for unit in units]
+    bids = [(float(unit["bid_price"]), float(unit["bid_size"])) for unit in units]
+    return asks, bids
+
+
+def estimate_impact(orderbook, side, amount=None, volume=None):
+    """주문이 호가를 가까운 쪽부터 먹을 때의 예상 체결 (매수는 금액 amount, 매도는 수량 volume 기준)
+    - impact: 최우선 호가 대비 평균 체결가가 불리한 비율 (0.001 = 0.1%)
+    - complete: 보이는 호가만으로 전량 체결되는지 (아니면 보이는 호가까지만 계산한 값)
+    """
+    asks, bids = parse_orderbook(orderbook)
+    levels = asks if side == "bid" else bids
+    target = amount if side == "bid" else volume
+    filled = funds = 0.0
+    best = worst = levels[0][0] if levels else 0.0
+    for price, size in levels:
+        left = target - (funds if side == "bid" else filled)
+        if left <= target * 1e-12:
+            break
+        take = min(size, left / price if side == "bid" else left)
+        filled += take
+        funds += take * price
+        worst = price
+
+    avg = funds / filled if filled > 0 else best
+    impact = ((avg - best) / best if side == "bid" else (best - avg) / best) if best > 0 else 0.0
+    done = funds if side == "bid" else filled
+    return {
+        "best_price": best,
+        "avg_price": avg,
+        "worst_price": worst,
+        "volume": filled,
+        "funds": funds,
+        "impact": impact,
+        "complete": bool(levels) and target - done <= target * 1e-9,
+    }
+
+
+def _limit_price(side, book_price, decision_price):
+    """지정가 IOC 가격: 필요한 호가까지, 단 판단가 대비 EXEC_MAX_SLIPPAGE 한도 안 (호가 단위 맞춤 오차 1칸 이내)"""
+    if side == "bid":
+        return round_to_tick(min(book_price, decision_price * (1 + EXEC_MAX_SLIPPAGE)), side)
+    return round_to_tick(max(book_price, decision_price * (1 - EXEC_MAX_SLIPPAGE)), side)
+
+
+def _size_args(side, size):
+    return (size, None) if side == "bid" else (None, size)
+
+
+def plan_execution(orderbook, side, decision_price, amount=None, volume=None, passive=False):
+    """예상 슬리피지로 실행 방법 선택 → {"method", "slices", "estimate", "limit_price"}
+    - market: 전량 예상 슬리피지 ≤ EXEC_MARKET_MAX_IMPACT → 시장가 1번
+      (passive=True면 대신 같은 쪽 최우선 호가에 지정가 1번 → 체결될 때까지 OrderManager가 취소 / 재주문)
+    - limit: ≤ EXEC_LIMIT_MAX_IMPACT → 전량을 먹는 호가(판단가 대비 한도 이내)에 지정가 IOC 1번
+    - twap: 그보다 크거나 보이는 호가가 모자라면 조각마다 예상 슬리피지가 EXEC_MARKET_MAX_IMPACT 이하가 되도록
+      나눠 EXEC_SLICE_INTERVAL초 간격으로 지정가 IOC (조각은 최소 주문 금액 이상, 최대 EXEC_MAX_SLICES개)
+    """
+    size = amount if side == "bid" else volume
+    estimate = estimate_impact(orderbook, side, amount, volume)
+    if estimate["complete"] and estimate["impact"] <= EXEC_MARKET_MAX_IMPACT:
+        asks, bids = parse_orderbook(orderbook)
+        levels = bids if side == "bid" else asks
+        if passive and levels:
+            return {"method": "passive", "slices": 1, "estimate": estimate, "limit_price": levels[0][0]}
+        return {"method": "market", "slices": 1, "estimate": estimate, "limit_price": None}
+
+    value = amount if side == "bid" else volume * decision_price
+    max_slices = max(1, min(EXEC_MAX_SLICES, int(value // MIN_ORDER_KRW)))
+    if (estimate["complete"] and estimate["impact"] <= EXEC_LIMIT_MAX_IMPACT) or max_slices == 1:
+        limit_price = _limit_price(side, estimate["worst_price"], decision_price)
+        return {"method": "limit", "slices": 1, "estimate": estimate, "limit_price": limit_price}
+
+    slices, first = max_slices, None
+    for n in range(2, max_slices + 1):
+        first = estimate_impact(orderbook, side, *_size_args(side, size / n))
+        if first["complete"] and first["impact"] <= EXEC_MARKET_MAX_IMPACT:
+            slices = n
+            break
+    limit_price = _limit_price(side, first["worst_price"], decision_price)
+    return {"method": "twap", "slices": slices, "estimate": estimate, "limit_price": limit_price}
+
+
+### ✅ 3. 실행기
+class Executor:
+    """주문 실행기 (첫 주문은 호출한 틱에서 바로, 나머지 분할 주문은 백그라운드 스레드가 간격을 두고 실행)
+    - execute(): 호가 조회 → 실행 방법 선택 → 첫 주문 접수 → 첫 주문 응답 반환 (실패하면 None)
+    - 접수한 주문은 fill_tracker로 체결 추적, record_fill()로 체결 요약을 받아 실행 단위로 실현 슬리피지 보고
+    """
+
+    def __init__(self, fill_tracker=None, slice_interval=EXEC_SLICE_INTERVAL):
+        self.fill_tracker = fill_tracker
+        self.slice_interval = slice_interval
+        self.executions = {}  # 실행 번호 → 진행 상태
+        self.reports = collections.deque(maxlen=100)  # 끝난 실행의 슬리피지 보고
+        self._orders = {}  # 주문 UUID → 실행 번호
+        self._schedule = []  # (다음 조각 시각, 실행 번호) 힙
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    ### ✅ 매매 루프 쪽 인터페이스
+    def execute(self, side, market, decision_price, amount=None, volume=None):
+        """매수는 금액 amount(KRW), 매도는 수량 volume을 실행 (decision_price = 판단 시점 가격, 슬리피지 기준)"""
+        self._cancel_opposite(market, side)
+        books = get_orderbook(market)
+        orderbook = books[0] if books else None
+        if orderbook is None:
+            # 호가를 받지 못하면 기존처럼 시장가 1번
+            plan = {"method": "market", "slices": 1, "estimate": None, "limit_price": None}
+        else:
+            plan = plan_execution(orderbook, side, decision_price, amount, volume, passive=self._passive())
+
+        execution = {
+            "id": next(self._ids), "market": market, "side": side, "decision_price": decision_price,
+            "method": plan["method"], "slices": plan["slices"], "placed": 0,
+            "size": amount if side == "bid" else volume, "remaining": amount if side == "bid" else volume,
+            "orders": 0, "settled": 0, "volume": 0.0, "funds": 0.0, "fee": 0.0,
+            "estimate": plan["estimate"], "started": time.time(),
+        }
+        with self._lock:
+            self.executions[execution["id"]] = execution
+        order = self._place_slice(execution, plan["limit_price"])
+        if order is None:
+            with self._lock:
+                self.executions.pop(execution["id"], None)
+            return None
+
+        impact = f", 예상 슬리피지 {plan['estimate']['impact'] * 1e4:.1f}bp" if plan["estimate"] else ""
+        slices = f" {plan['slices']}조각 × {self.slice_interval}초" if plan["method"] == "twap" else ""
+        print(f"🧭 {market} {'매수' if side == 'bid' else '매도'} 실행: {METHOD_NAMES[plan['method']]}{slices}{impact}")
+        if execution["placed"] < execution["slices"]:
+            with self._lock:
+                heapq.heappush(self._schedule, (time.time() + self.slice_interval, execution["id"]))
+            self._wake.set()
+        return order
+
+    def record_fill(self, event):
+        """체결 요약(FillTracker 이벤트)을 실행에 반영 → 이 실행의 지금까지 평균 체결가 (실행기 주문이 아니면 None)"""
+        with self._lock:
+            execution_id = self._orders.pop(event["uuid"], None)
+            execution = self.executions.get(execution_id)
+            if execution is None:
+                return None
+            if event.get("replaced_by"):  # ✅ 취소 후 재주문된 지정가 → 새 주문도 같은 실행으로
+                self._orders[event["replaced_by"]] = execution_id
+                execution["orders"] += 1
+            execution["settled"] += 1
+            execution["volume"] += event["volume"]
+            execution["funds"] += event["funds"]
+            execution["fee"] += event["fee"]
+            avg_price = execution["funds"] / execution["volume"] if execution["volume"] > 0 else None
+        self._finish_if_done(execution)
+        return avg_price
+
+    def pending(self):
+        """아직 끝나지 않은 실행 수"""
+        with self._lock:
+            return len(self.executions)
+
+    def _cancel_opposite(self, market, side):
+        """같은 마켓의 반대 방향 실행이 남은 조각은 주문하지 않음 (이미 접수한 주문의 체결은 그대로 보고)"""
+        with self._lock:
+            stopped = [(execution, execution["slices"] - execution["placed"]) for execution in self.executions.values()
+                       if execution["market"] == market and execution["side"] != side
+                       and execution["placed"] < execution["slices"]]
+            for execution, _ in stopped:
+                execution["slices"] = execution["placed"]
+        for execution, left in stopped:
+            print(f"✋ {market} 반대 방향 신호 → {'매수' if execution['side'] == 'bid' else '매도'} 분할 주문 남은 {left}조각 취소")
+            self._finish_if_done(execution)
+
+    def _passive(self):
+        """최우선 호가 지정가는 만료 / 재주문을 맡을 OrderManager가 있을 때만"""
+        from order_manager import OrderManager
+
+        return EXEC_PASSIVE_LIMIT and isinstance(self.fill_tracker, OrderManager)
+
+    ### ✅ 주문 접수
+    def _place_slice(self, execution, limit_price=None):
+        """다음 조각 1개 주문 (마지막 조각은 남은 수량 전부), 접수되면 체결 추적 시작"""
+        side, market = execution["side"], execution["market"]
+        left = execution["slices"] - execution["placed"]
+        size = execution["remaining"] if left == 1 else execution["remaining"] / left
+
+        if execution["method"] == "market":
+            order = place_order(side=side, price=size if side == "bid" else None,
+                                volume=None if side == "bid" else _floor8(size), market=market)
+        else:
+            if limit_price is None:  # 두 번째 조각부터는 새 호가로 가격 결정
+                books = get_orderbook(market)
+                book_price = execution["decision_price"]
+                if books:
+                    book_price = estimate_impact(books[0], side, *_size_args(side, size))["worst_price"] or book_price
+                limit_price = _limit_price(side, book_price, execution["decision_price"])
+            order_volume = _floor8(size / limit_price if side == "bid" else size)
+            time_in_force = None if execution["method"] == "passive" else "ioc"
+            order = place_order(side=side, price=limit_price, volume=order_volume, market=market,
+                                time_in_force=time_in_force)
+
+        with self._lock:
+            execution["placed"] += 1
+            if order is None or not order.get("uuid"):
+                execution["slices"] = execution["placed"]  # 실패하면 남은 조각은 포기
+                return None
+            execution["remaining"] -= size
+            execution["orders"] += 1
+            self._orders[order["uuid"]] = execution["id"]
+        if self.fill_tracker is None:
+            return order
+        if execution["method"] == "passive":
+            self.fill_tracker.track(order, ttl=LIMIT_ORDER_TTL, replace=True)
+        else:
+            self.fill_tracker.track(order)
+        return order
+
+    ### ✅ 실행 완료 보고 (실현 슬리피지 = 판단가 대비 평균 체결가가 불리한 비율)
+    def _finish_if_done(self, execution):
+        with self._lock:
+            done = execution["placed"] >= execution["slices"] and execution["settled"] >= execution["orders"]
+            if not done or self.executions.pop(execution["id"], None) is None:
+                return
+        self._report(execution)
+
+    def _report(self, execution):
+        side, decision = execution["side"], execution["decision_price"]
+        volume, funds = execution["volume"], execution["funds"]
+        avg_price = funds / volume if volume > 0 else 0.0
+        slippage = ((avg_price - decision) / decision if side == "bid" else (decision - avg_price) / decision) \
+            if volume > 0 and decision else 0.0
+        filled = (funds if side == "bid" else volume) / execution["size"] if execution["size"] else 0.0
+        expected = execution["estimate"]["impact"] if execution["estimate"] else None
+        report = {
+            "market": execution["market"], "side": side, "method": execution["method"],
+            "orders": execution["orders"], "decision_price": decision, "avg_price": avg_price,
+            "volume": volume, "funds": funds, "fee": execution["fee"], "filled_ratio": filled,
+            "slippage": slippage, "expected_impact": expected, "seconds": time.time() - execution["started"],
+        }
+        self.reports.append(report)
+        metrics.inc("executions_total", method=execution["method"])
+        if volume <= 0:
+            print(f"⚠️ {execution['market']} {METHOD_NAMES[execution['method']]} 실행이 체결 없이 끝났습니다.")
+            return
+        metrics.set_gauge("execution_slippage_bps", slippage * 1e4, market=execution["market"], side=side)
+        expected_text = f" (예상 {expected * 1e4:.1f}bp)" if expected is not None else ""
+        print(f"📐 {execution['market']} {'매수' if side == 'bid' else '매도'} 실행 완료 "
+              f"({METHOD_NAMES[execution['method']]}, 주문 {execution['orders']}회): "
+              f"평균 체결가 {avg_price:,.0f} KRW / 판단가 {decision:,.0f} KRW → 실현 슬리피지 {slippage * 1e4:+.1f}bp"
+              f"{expected_text}, 체결 비율 {filled:.0%}")
+
+    ### ✅ 분할 주문 스레드
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                due = self._schedule[0][0] if self._schedule else None
+            if due is None or due > time.time():
+                self._wake.wait(None if due is None else due - time.time())
+                self._wake.clear()
+                continue
+
+            with self._lock:
+                _, execution_id = heapq.heappop(self._schedule)
+                execution = self.executions.get(execution_id)
+            if execution is None or execution["placed"] >= execution["slices"]:
+                continue  # 끝났거나 남은 조각이 취소된 실행
+            try:
+                order = self._place_slice(execution)
+            except Exception as e:
+                print(f"⚠️ {execution['market']} 분할 주문 중 오류: {e}")
+                with self._lock:
+                    execution["slices"] = execution["placed"]
+                order = None
+            if order is not None and execution["placed"] < execution["slices"]:
+                with self._lock:
+                    heapq.heappush(self._schedule, (time.time() + self.slice_interval, execution_id))
+            self._finish_if_done(execution)  # 남은 조각을 포기했고 앞선 주문이 모두 끝났으면 바로 보고
+
+    def start(self):
+        """백그라운드 분할 주문 스레드 시작"""
+        self._thread = threading.Thread(target=self._run, name="executor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """스레드 종료 (남은 조각은 주문하지 않음)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def simulate(amounts=(1_000_000, 300_000_000, 1_000_000_000), market="KRW-BTC"):
+    """모의 거래소에서 매수 금액별 실행 방법 / 예상 · 실현 슬리피지 비교 (분할 간격 0.05초)"""
+    import os
+    import tempfile
+    import upbit_api
+    from fills import FillTracker
+    from simulator import SimulatedExchange
+    from storage import init_storage, use_storage
+
+    exchange = SimulatedExchange(initial_krw=sum(amounts) * 1.01, latency=0)
+    previous = upbit_api.use_client(exchange)
+    previous_db = use_storage(os.path.join(tempfile.mkdtemp(), "simulate.db"))  # ✅ 모의 체결은 임시 DB에만 저장
+    init_storage()
+    tracker = FillTracker(poll_interval=0.05).start()
+    executor = Executor(tracker, slice_interval=0.05).start()
+    try:
+        for amount in amounts:
+            decision_price = upbit_api.get_market_price(market)
+            if executor.execute("bid", market, decision_price, amount=amount) is None:
+                continue
+            while executor.pending():
+                for event in tracker.pop_events():
+                    executor.record_fill(event)
+                time.sleep(0.01)
+            # 다음 주문이 같은 호가창을 쓰도록 매수한 코인은 정리
+            coin = market.split("-")[1]
+            exchange.balances[coin] = 0.0
+    finally:
+        executor.stop()
+        tracker.stop()
+        upbit_api.use_client(previous)
+        use_storage(previous_db)
+
+    lines = [
+        f"💵 {report['funds']:>15,.0f} KRW: {METHOD_NAMES[report['method']]:<8} 주문 {report['orders']:>2}회 | "
+        f"예상 {report['expected_impact'] * 1e4:5.1f}bp | 실현 {report['slippage'] * 1e4:+6.1f}bp | "
+        f"체결 비율 {report['filled_ratio']:.0%}"
+        for report in executor.reports
+    ]
+    print(f"""
+⏱️ **주문 실행 시뮬레이션** ({market}, 판단가 대비 실현 슬리피지) ⏱️
+{chr(10).join(lines)}
+""")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="호가 기반 주문 실행 계획 확인")
+    parser.add_argument("--market", default="KRW-BTC")
+    parser.add_argument("--side", choices=("bid", "ask"), default="bid")
+    parser.add_argument("--size", type=float, default=10_000_000, help="매수는 금액(KRW), 매도는 수량")
+    parser.add_argument("--simulate", action="store_true", help="모의 거래소에서 금액별 실행 / 슬리피지 비교")
+    args = parser.parse_args()
+
+    if args.simulate:
+        simulate(market=args.market)
+    else:
+        # ✅ 실제 호가로 실행 계획만 출력 (주문은 보내지 않음)
+        from upbit_api import get_market_price
+
+        books = get_orderbook(args.market)
+        if books:
+            price = get_market_price(args.market)
+            plan = plan_execution(books[0], args.side, price, *_size_args(args.side, args.size))
+            estimate = plan["estimate"]
+            print(f"🧭 {args.market} {args.side} {args.size:,}: {METHOD_NAMES[plan['method']]} {plan['slices']}조각, "
+                  f"예상 평균가 {estimate['avg_price']:,.0f} KRW, 예상 슬리피지 {estimate['impact'] * 1e4:.1f}bp"
+                  f"{'' if estimate['complete'] else ' (보이는 호가 부족)'}")
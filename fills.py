@@ -0,0 +1,167 @@
+import queue
+import threading
+import time
+from upbit_api import get_order
+from account import invalidate_accounts
+from ledger import record_fills
+from config import FILL_POLL_INTERVAL, FILL_MAX_POLL_INTERVAL
+import metrics
+
+DONE_STATES = ("done", "cancel")  # 더 이상 체결이 추가되지 않는 주문 상태
+
+
+def fills_from_order(order):
+    """업비트 주문 조회 결과 → 체결 목록 (수수료 paid_fee는 체결 금액 비율로 나눔)"""
+    trades = order.get("trades") or []
+    total_funds = sum(float(trade["funds"]) for trade in trades)
+    paid_fee = float(order.get("paid_fee") or 0)
+    fills = []
+    for trade in trades:
+        funds = float(trade["funds"])
+        fills.append({
+            "market": trade.get("market") or order["market"],
+            "side": trade.get("side") or order["side"],
+            "price": float(trade["price"]),
+            "volume": float(trade["volume"]),
+            "fee": paid_fee * funds / total_funds if total_funds > 0 else 0.0,
+            "trade_time": trade.get("created_at") or order.get("created_at"),
+            "order_uuid": order["uuid"],
+            "trade_uuid": trade["uuid"],
+        })
+    return fills
+
+
+def summarize_fills(order, fills):
+    """주문 전체 체결 요약 (평균 체결가 = 체결 금액 합 / 체결 수량 합)"""
+    volume = sum(fill["volume"] for fill in fills)
+    funds = sum(fill["price"] * fill["volume"] for fill in fills)
+    return {
+        "uuid": order["uuid"],
+        "market": order["market"],
+        "side": order["side"],
+        "state": order["state"],
+        "volume": volume,
+        "funds": funds,
+        "avg_price": funds / volume if volume > 0 else 0.0,
+        "fee": sum(fill["fee"] for fill in fills),
+    }
+
+
+class FillTracker:
+    """접수된 주문의 체결을 백그라운드 스레드에서 확인해 거래 기록에 저장 (매매 루프는 기다리지 않음)
+    - track(order): place_order 응답을 넘기면 체결이 끝날 때까지 조회 (간격은 점점 늘어남)
+    - 주문이 끝나면 체결을 trade_history / transactions / 포지션에 한 번에 저장하고 events 큐에 요약을 넣음
+    """
+
+    def __init__(self, poll_interval=FILL_POLL_INTERVAL, max_interval=FILL_MAX_POLL_INTERVAL, clock=time.time):
+        self.clock = clock  # 현재 시각 (모의 거래소 수동 시계로 바꿔 끼울 수 있음)
+        self.poll_interval = poll_interval
+        self.max_interval = max_interval
+        self.pending = {}  # 주문 UUID → {"next_poll": 시각, "interval": 초, "tracked": 추적 시작 시각}
+        self.events = queue.Queue()  # 체결이 끝난 주문 요약 (매매 루프에서 꺼내 씀)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    ### ✅ 1. 매매 루프 쪽 인터페이스
+    def track(self, order):
+        """주문 응답(uuid 포함)을 추적 목록에 추가"""
+        uuid = order.get("uuid") if isinstance(order, dict) else None
+        if not uuid:
+            return False
+        with self._lock:
+            self.pending.setdefault(uuid, {  # 이미 추적 중인 주문이면 그대로 둠
+                "next_poll": self.clock() + self.poll_interval, "interval": self.poll_interval, "tracked": self.clock(),
+            })
+        self._wake.set()
+        return True
+
+    def pop_events(self):
+        """체결이 끝난 주문 요약 목록 (없으면 빈 목록)"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    ### ✅ 2. 체결 조회
+    def poll_once(self, now=None):
+        """조회 시각이 된 주문만 확인하고 다음 조회까지 남은 시간(초) 반환"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            due = [uuid for uuid, entry in self.pending.items() if entry["next_poll"] <= now]
+
+        for uuid in due:
+            order = get_order(uuid)
+            if order is not None and order.get("state") in DONE_STATES:
+                self._settle(order)
+                continue
+            self._backoff(uuid)  # ✅ 아직 미체결(지정가 대기 등)이거나 조회 실패
+        return self._next_wait()
+
+    def _backoff(self, uuid, until=None):
+        """다음 조회 간격을 두 배로 늘림 (until이 있으면 그 시각보다 늦게 조회하지 않음)"""
+        with self._lock:
+            entry = self.pending.get(uuid)
+            if entry is not None:
+                entry["interval"] = min(entry["interval"] * 2, self.max_interval)
+                entry["next_poll"] = self.clock() + entry["interval"]
+                if until is not None:
+                    entry["next_poll"] = min(entry["next_poll"], until)
+
+    def _next_wait(self):
+        """가장 빠른 다음 조회까지 남은 시간 (추적할 주문이 없으면 None)"""
+        with self._lock:
+            if not self.pending:
+                return None
+            return max(0.0, min(entry["next_poll"] for entry in self.pending.values()) - self.clock())
+
+    def _settle(self, order, **extra):
+        """끝난 주문의 체결을 한 번에 저장하고 요약 이벤트 발행 (extra는 요약에 덧붙임), 저장 실패면 False"""
+        fills = fills_from_order(order)
+        try:
+            inserted = record_fills(fills) if fills else 0
+        except Exception as e:
+            print(f"⚠️ 체결 기록 저장 실패 ({order['uuid']}): {e}")
+            return False  # 추적 목록에 남겨 두고 다음 조회 때 다시 저장 시도
+
+        with self._lock:
+            entry = self.pending.pop(order["uuid"], None)
+        if entry is not None:
+            metrics.observe("fill_latency_seconds", self.clock() - entry["tracked"], side=order["side"])
+        invalidate_accounts()  # ✅ 체결로 잔고가 바뀌었으므로 다음 조회 때 새로 받아옴
+
+        summary = summarize_fills(order, fills)
+        summary["inserted"] = inserted
+        summary.update(extra)
+        self.events.put(summary)
+        if fills:
+            print(f"🧾 {summary['market']} {summary['side']} 체결 {len(fills)}건 기록 "
+                  f"(평균 {summary['avg_price']:,.0f} KRW, 수량 {summary['volume']:.8f}, 수수료 {summary['fee']:,.2f} KRW)")
+        return True
+
+    ### ✅ 3. 백그라운드 스레드
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                wait = self.poll_once()
+            except Exception as e:
+                print(f"⚠️ 체결 확인 중 오류: {e}")
+                wait = self.poll_interval
+            self._wake.wait(wait)  # 추적할 주문이 없으면 track() 호출 때까지 대기
+            self._wake.clear()
+
+    def start(self):
+        """백그라운드 체결 확인 스레드 시작"""
+        self._thread = threading.Thread(target=self._run, name="fill-tracker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """스레드 종료"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,627 @@
+import math
+import time
+from collections import deque
+import numpy as np
+from upbit_api import get_ohlcv
+import metrics
+
+NAN = float("nan")
+
+
+class RollingWindow:
+    """고정 길이 구간의 합계를 O(1)로 유지 (pandas `rolling(window).mean()`과 같은 값)"""
+
+    __slots__ = ("values", "total", "nonzero", "_ops")
+
+    def __init__(self, window):
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.nonzero = 0  # ✅ 0이 아닌 값 개수 (모두 0이면 합계를 정확히 0으로 유지)
+        self._ops = 0
+
+    def push(self, value):
+        """새 값을 추가하고, 구간이 가득 찼으면 가장 오래된 값을 제거"""
+        if len(self.values) == self.values.maxlen:
+            oldest = self.values[0]
+            self.total -= oldest
+            self.nonzero -= oldest != 0
+        self.values.append(value)
+        self.total += value
+        self.nonzero += value != 0
+        self._resync()
+
+    def replace_last(self, value):
+        """진행 중인 캔들처럼 마지막 값만 바뀐 경우 교체"""
+        last = self.values[-1]
+        self.total += value - last
+        self.nonzero += (value != 0) - (last != 0)
+        self.values[-1] = value
+        self._resync()
+
+    def _resync(self):
+        """누적 합계의 부동소수점 오차 정리 (구간 길이만큼 갱신될 때마다 한 번 → 평균 O(1))"""
+        if self.nonzero == 0:
+            self.total = 0.0
+        self._ops += 1
+        if self._ops >= self.values.maxlen:
+            self.total = math.fsum(self.values)
+            self._ops = 0
+
+    def mean(self):
+        """구간이 다 차지 않았으면 NaN (pandas와 동일)"""
+        if len(self.values) < self.values.maxlen:
+            return NAN
+        return self.total / len(self.values)
+
+
+def rsi_from_means(avg_gain, avg_loss):
+    """평균 상승분/하락분으로 RSI 계산 (`calculate_rsi`와 같은 NaN/100 처리)"""
+    if math.isnan(avg_gain) or math.isnan(avg_loss):
+        return NAN
+    if avg_loss == 0:
+        return NAN if avg_gain == 0 else 100.0  # 0/0 → NaN, x/0 → inf → RSI 100
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+### ✅ 증분(실시간) 지표 상태 — 캔들 추가는 push, 진행 중인 캔들 갱신은 replace_last
+### bar / prev = (고가, 저가, 종가, 거래량), prev는 직전 캔들 (첫 캔들이면 None)
+class LiveSma:
+    def __init__(self, period):
+        self.window = RollingWindow(period)
+
+    def push(self, bar, prev):
+        self.window.push(bar[2])
+
+    def replace_last(self, bar, prev):
+        self.window.replace_last(bar[2])
+
+    def value(self):
+        return self.window.mean()
+
+
+class LiveEma:
+    """지수 이동평균 (첫 종가에서 시작, 캔들 period개 전에는 NaN)"""
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.before = NAN  # 마지막 캔들 반영 전 값 (진행 중인 캔들 갱신용)
+        self.current = NAN
+        self.count = 0
+
+    def _next(self, close):
+        return close if self.count == 1 else self.before + self.alpha * (close - self.before)
+
+    def push(self, bar, prev):
+        self.before = self.current
+        self.count += 1
+        self.current = self._next(bar[2])
+
+    def replace_last(self, bar, prev):
+        self.current = self._next(bar[2])
+
+    def value(self):
+        return self.current if self.count >= self.period else NAN
+
+
+class LiveRsi:
+    def __init__(self, period):
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+
+    @staticmethod
+    def _delta(bar, prev):
+        # ✅ 첫 캔들의 변화량은 pandas에서 NaN → where()로 0 처리되므로 동일하게 0
+        return bar[2] - prev[2] if prev is not None else 0.0
+
+    def push(self, bar, prev):
+        delta = self._delta(bar, prev)
+        self.gains.push(delta if delta > 0 else 0.0)
+        self.losses.push(-delta if delta < 0 else 0.0)
+
+    def replace_last(self, bar, prev):
+        delta = self._delta(bar, prev)
+        self.gains.replace_last(delta if delta > 0 else 0.0)
+        self.losses.replace_last(-delta if delta < 0 else 0.0)
+
+    def value(self):
+        return rsi_from_means(self.gains.mean(), self.losses.mean())
+
+
+class LiveBollinger:
+    """볼린저 밴드 한쪽 (중심선 ± k × 표준편차), side=1이면 상단 / -1이면 하단"""
+
+    def __init__(self, period, k, side):
+        self.closes = deque(maxlen=period)
+        self.k = k
+        self.side = side
+
+    def push(self, bar, prev):
+        self.closes.append(bar[2])
+
+    def replace_last(self, bar, prev):
+        self.closes[-1] = bar[2]
+
+    def value(self):
+        n = self.closes.maxlen
+        if len(self.closes) < n:
+            return NAN
+        mean = math.fsum(self.closes) / n
+        std = math.sqrt(math.fsum((x - mean) ** 2 for x in self.closes) / n)
+        return mean + self.side * self.k * std
+
+
+class LiveAtr:
+    """평균 실제 변동폭 (true range의 단순 이동평균)"""
+
+    def __init__(self, period):
+        self.window = RollingWindow(period)
+
+    @staticmethod
+    def _true_range(bar, prev):
+        high, low = bar[0], bar[1]
+        if prev is None:
+            return high - low
+        return max(high - low, abs(high - prev[2]), abs(low - prev[2]))
+
+    def push(self, bar, prev):
+        self.window.push(self._true_range(bar, prev))
+
+    def replace_last(self, bar, prev):
+        self.window.replace_last(self._true_range(bar, prev))
+
+    def value(self):
+        return self.window.mean()
+
+
+class LiveBreakout:
+    """직전 캔들 종가 + (고가 - 저가) * k"""
+
+    def __init__(self, k):
+        self.k = k
+        self.prev = None
+
+    def push(self, bar, prev):
+        self.prev = prev
+
+    def replace_last(self, bar, prev):
+        self.prev = prev
+
+    def value(self):
+        if self.prev is None:
+            return NAN
+        return self.prev[2] + (self.prev[0] - self.prev[1]) * self.k
+
+
+class LiveVwap:
+    """최근 period개 캔들의 거래량 가중 평균가 (대표가 = (고가 + 저가 + 종가) / 3)"""
+
+    def __init__(self, period):
+        self.amounts = RollingWindow(period)
+        self.volumes = RollingWindow(period)
+
+    def push(self, bar, prev):
+        self.amounts.push((bar[0] + bar[1] + bar[2]) / 3 * bar[3])
+        self.volumes.push(bar[3])
+
+    def replace_last(self, bar, prev):
+        self.amounts.replace_last((bar[0] + bar[1] + bar[2]) / 3 * bar[3])
+        self.volumes.replace_last(bar[3])
+
+    def value(self):
+        volume = self.volumes.mean()
+        return self.amounts.mean() / volume if volume > 0 else NAN
+
+
+def _bar(candle):
+    """업비트 캔들 → (고가, 저가, 종가, 거래량)"""
+    return (
+        float(candle["high_price"]),
+        float(candle["low_price"]),
+        float(candle["trade_price"]),
+        float(candle.get("candle_acc_trade_volume", 0.0)),
+    )
+
+
+class IndicatorEngine:
+    """최근 캔들 버퍼를 유지하면서 지표를 틱마다 O(1)로 갱신
+    - 기본 지표: RSI / 단기·장기 MA / 변동성 돌파가 (자동매매 규칙)
+    - 전략이 추가로 요구한 지표는 require(specs)로 등록 → 마켓당 엔진 1개를 모든 전략이 공유
+    """
+
+    def __init__(self, market, maxlen=200, rsi_period=14, short_window=5, long_window=20, k=0.5, specs=()):
+        self.market = market
+        self.maxlen = maxlen
+        self.rsi_period = rsi_period
+        self.short_window = short_window
+        self.long_window = long_window
+        self.k = k
+        self._rsi_key = indicator_key(("rsi", rsi_period))
+        self._short_key = indicator_key(("sma", short_window))
+        self._long_key = indicator_key(("sma", long_window))
+        self._breakout_key = indicator_key(("breakout", k))
+        self.specs = {}  # 지표 키 → 스펙
+        for spec in [("rsi", rsi_period), ("sma", short_window), ("sma", long_window), ("breakout", k), *specs]:
+            self.specs.setdefault(indicator_key(spec), tuple(spec))
+        self.last_refresh_minute = None  # 마지막으로 REST 캔들을 받은 분 (epoch 분)
+        self.reset()
+
+    def reset(self):
+        """버퍼와 누적값 초기화"""
+        self.candles = deque(maxlen=self.maxlen)  # ✅ 오래된 캔들 → 최신 캔들 순서
+        self._states = {key: make_live(spec) for key, spec in self.specs.items()}
+
+    def require(self, specs):
+        """지표 추가 등록 (이미 있는 지표는 그대로 공유, 버퍼가 있으면 새 지표만 버퍼로 채움)"""
+        for spec in specs:
+            key = indicator_key(spec)
+            if key in self.specs:
+                continue
+            self.specs[key] = tuple(spec)
+            state = self._states[key] = make_live(spec)
+            prev = None
+            for candle in self.candles:
+                bar = _bar(candle)
+                state.push(bar, prev)
+                prev = bar
+
+    ### ✅ 1. 캔들 반영
+    def seed(self, candles):
+        """캔들 목록 전체로 버퍼를 다시 채움 (업비트 응답은 최신순이므로 시간순으로 정렬)"""
+        if not isinstance(candles, list) or len(candles) == 0:
+            return False
+        with metrics.timer("indicator_seconds", op="seed"):
+            self.reset()
+            for candle in sorted(candles, key=lambda c: c["candle_date_time_utc"]):
+                self.update(candle)
+        return True
+
+    def update(self, candle):
+        """캔들 1개 반영 (같은 시각이면 진행 중인 캔들 갱신, 더 최신이면 추가, 과거 캔들은 무시)"""
+        candle_time = candle["candle_date_time_utc"]
+        if self.candles and candle_time == self.candles[-1]["candle_date_time_utc"]:
+            self._replace_last(candle)
+        elif not self.candles or candle_time > self.candles[-1]["candle_date_time_utc"]:
+            self._append(candle)
+
+    def _append(self, candle):
+        bar = _bar(candle)
+        prev = _bar(self.candles[-1]) if self.candles else None
+        for state in self._states.values():
+            state.push(bar, prev)
+        self.candles.append(candle)
+
+    def _replace_last(self, candle):
+        bar = _bar(candle)
+        prev = _bar(self.candles[-2]) if len(self.candles) > 1 else None
+        for state in self._states.values():
+            state.replace_last(bar, prev)
+        self.candles[-1] = candle
+
+    ### ✅ 2. 최신 캔들만 요청해서 갱신
+    def refresh(self):
+        """최근 2개 캔들(직전 완성 캔들 + 진행 중 캔들)만 받아 갱신, 처음이거나 공백이 생기면 전체 재요청"""
+        self.last_refresh_minute = int(time.time() // 60)
+        if not self.candles:
+            return self.seed(get_ohlcv(self.market, self.maxlen))
+
+        latest = get_ohlcv(self.market, 2)
+        if not isinstance(latest, list) or len(latest) == 0:
+            return False
+
+        latest = sorted(latest, key=lambda c: c["candle_date_time_utc"])
+        if latest[0]["candle_date_time_utc"] > self.candles[-1]["candle_date_time_utc"]:
+            # ✅ 중간 캔들을 놓쳤을 수 있음 (거래 없는 분은 캔들이 없어서 시각만으로 판단 불가)
+            return self.seed(get_ohlcv(self.market, self.maxlen))
+
+        with metrics.timer("indicator_seconds", op="update"):
+            for candle in latest:
+                self.update(candle)
+        return True
+
+    def needs_refresh(self, now):
+        """이번 분에 아직 REST 캔들을 받지 않았으면 True (분이 바뀔 때만 캔들 요청)"""
+        return not self.candles or self.last_refresh_minute is None or int(now // 60) > self.last_refresh_minute
+
+    def update_price(self, price, now):
+        """티커 가격으로 진행 중인 캔들의 종가/고가/저가 갱신 (같은 분의 캔들일 때만)"""
+        if not self.candles or not price:
+            return False
+        minute = time.strftime("%Y-%m-%dT%H:%M:00", time.gmtime(now))
+        last = self.candles[-1]
+        if last["candle_date_time_utc"] != minute:
+            return False
+        candle = dict(last)
+        candle["trade_price"] = price
+        candle["high_price"] = max(last["high_price"], price)
+        candle["low_price"] = min(last["low_price"], price)
+        self._replace_last(candle)
+        return True
+
+    ### ✅ 3. 지표 값
+    def value(self, spec):
+        """지표 1개의 최신 값 (require로 등록된 지표만)"""
+        return self._states[indicator_key(spec)].value()
+
+    def frame(self):
+        """등록된 모든 지표의 최신 값 {지표 키: 값} (전략들이 함께 읽는 지표 프레임)"""
+        return {key: state.value() for key, state in self._states.items()}
+
+    @property
+    def rsi(self):
+        return self._states[self._rsi_key].value()
+
+    @property
+    def short_ma(self):
+        return self._states[self._short_key].value()
+
+    @property
+    def long_ma(self):
+        return self._states[self._long_key].value()
+
+    @property
+    def breakout_price(self):
+        """직전 캔들 종가 + (고가 - 저가) * k"""
+        return self._states[self._breakout_key].value()
+
+
+### ✅ 배치(벡터) 계산 — 백테스트처럼 전체 캔들 배열의 지표를 한 번에 계산
+def rolling_mean(values, window):
+    """구간 평균 배열 (앞쪽 window-1개는 NaN, pandas `rolling(window).mean()`과 같은 값)"""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    # ✅ 누적합 대신 구간 위치별 덧셈 (큰 가격에서도 오차 없이 0/동일값 구간 유지)
+    total = values[: n - window + 1].copy()
+    for offset in range(1, window):
+        total += values[offset: n - window + 1 + offset]
+    out[window - 1:] = total / window
+    return out
+
+
+def rsi_series(closes, period=14):
+    """RSI 배열 (`calculate_rsi`와 같은 단순 이동평균 방식)"""
+    closes = np.asarray(closes, dtype=np.float64)
+    if len(closes) == 0:
+        return np.empty(0)
+    delta = np.diff(closes, prepend=closes[0])  # ✅ 첫 변화량은 0 (pandas NaN → 0 처리와 동일)
+    avg_gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    avg_loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def breakout_series(high, low, close, k=0.5):
+    """각 캔들 시점의 변동성 돌파가 배열 (직전 캔들 종가 + (고가 - 저가) * k)"""
+    out = np.full(len(close), np.nan)
+    out[1:] = close[:-1] + (high[:-1] - low[:-1]) * k
+    return out
+
+
+def ema_series(values, period):
+    """지수 이동평균 배열 (첫 값에서 시작, 앞쪽 period-1개는 NaN → LiveEma와 같은 값)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) == 0:
+        return out
+    alpha = 2.0 / (period + 1)
+    ema = np.empty(len(values))
+    current = float(values[0])
+    # ✅ 재귀식이라 벡터화 대신 파이썬 float 반복 (배열 원소 접근보다 빠름)
+    for i, value in enumerate(values.tolist()):
+        current = value if i == 0 else current + alpha * (value - current)
+        ema[i] = current
+    out[period - 1:] = ema[period - 1:]
+    return out
+
+
+def bollinger_series(close, period=20, k=2.0):
+    """볼린저 밴드 (중심선, 상단, 하단) 배열 (모집단 표준편차, 앞쪽 period-1개는 NaN)"""
+    close = np.asarray(close, dtype=np.float64)
+    mid, upper, lower = (np.full(len(close), np.nan) for _ in range(3))
+    if len(close) < period:
+        return mid, upper, lower
+    windows = np.lib.stride_tricks.sliding_window_view(close, period)
+    mean = windows.mean(axis=1)
+    std = windows.std(axis=1)
+    mid[period - 1:] = mean
+    upper[period - 1:] = mean + k * std
+    lower[period - 1:] = mean - k * std
+    return mid, upper, lower
+
+
+def true_range_series(high, low, close):
+    """실제 변동폭 배열 (첫 캔들은 고가 - 저가)"""
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    tr = high - low
+    if len(close) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)))
+    return tr
+
+
+def atr_series(high, low, close, period=14):
+    """평균 실제 변동폭 배열 (true range의 단순 이동평균)"""
+    return rolling_mean(true_range_series(high, low, close), period)
+
+
+def vwap_series(high, low, close, volume, period=20):
+    """최근 period개 캔들의 거래량 가중 평균가 배열 (거래량이 0인 구간은 NaN)"""
+    high, low, close, volume = (np.asarray(a, dtype=np.float64) for a in (high, low, close, volume))
+    amount = rolling_mean((high + low + close) / 3 * volume, period)
+    total = rolling_mean(volume, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, amount / total, np.nan)
+
+
+### ✅ 최신 값만 계산 — 마지막 구간만 읽음 (전체 지표 배열을 만들지 않음, `upbit_api.calculate_*`가 사용)
+### 합계는 정확히 반올림되는 math.fsum → 호가 단위 가격에서는 pandas `rolling().mean()`과 비트까지 같은 값
+def last_mean(values, window):
+    """마지막 window개 평균 (개수가 모자라면 NaN)"""
+    n = len(values)
+    if window <= 0 or n < window:
+        return NAN
+    return math.fsum(values[n - window:].tolist()) / window
+
+
+def last_rsi(closes, period=14):
+    """마지막 캔들의 RSI (`rsi_series(closes, period)[-1]`과 같은 값, 마지막 period+1개만 읽음)"""
+    n = len(closes)
+    if period <= 0 or n < period:
+        return NAN
+    tail = closes[max(n - period - 1, 0):].tolist()  # 캔들이 period개뿐이면 첫 변화량은 0으로 취급
+    gains, losses = [], []
+    for prev, price in zip(tail, tail[1:]):
+        if price > prev:
+            gains.append(price - prev)
+        elif price < prev:
+            losses.append(prev - price)
+    return rsi_from_means(math.fsum(gains) / period, math.fsum(losses) / period)
+
+
+def last_breakout(high, low, close, k=0.5):
+    """마지막 캔들 시점의 변동성 돌파가 (직전 캔들 종가 + (고가 - 저가) * k), 캔들이 2개 미만이면 NaN"""
+    if len(close) < 2:
+        return NAN
+    return float(close[-2] + (high[-2] - low[-2]) * k)
+
+
+### ✅ 지표 레지스트리 — 스펙 (종류, 파라미터...) 하나 = 배치 함수 + 증분 상태
+### 예: ("rsi", 14), ("sma", 5), ("ema", 12), ("bb_upper", 20, 2), ("atr", 14), ("breakout", 0.5), ("vwap", 20)
+INDICATORS = {
+    "sma": (lambda c, period: rolling_mean(c["close"], period), LiveSma),
+    "ema": (lambda c, period: ema_series(c["close"], period), LiveEma),
+    "rsi": (lambda c, period: rsi_series(c["close"], period), LiveRsi),
+    "bb_upper": (lambda c, period, k: bollinger_series(c["close"], period, k)[1],
+                 lambda period, k: LiveBollinger(period, k, 1)),
+    "bb_lower": (lambda c, period, k: bollinger_series(c["close"], period, k)[2],
+                 lambda period, k: LiveBollinger(period, k, -1)),
+    "atr": (lambda c, period: atr_series(c["high"], c["low"], c["close"], period), LiveAtr),
+    "breakout": (lambda c, k: breakout_series(c["high"], c["low"], c["close"], k), LiveBreakout),
+    "vwap": (lambda c, period: vwap_series(c["high"], c["low"], c["close"], c["volume"], period), LiveVwap),
+}
+
+
+def indicator_key(spec):
+    """스펙 → 지표 프레임의 키 (예: ("sma", 5) → "sma(5)", ("bb_upper", 20, 2.0) → "bb_upper(20,2)")"""
+    kind, *args = spec
+    return f"{kind}({','.join(format(arg, 'g') for arg in args)})"
+
+
+def make_live(spec):
+    """스펙 → 증분 지표 상태"""
+    kind, *args = spec
+    return INDICATORS[kind][1](*args)
+
+
+def compute_indicator(candles, spec):
+    """스펙 → 전체 캔들 배열의 지표 배열 (candles는 캔들 배열 또는 열 이름 → 배열 딕셔너리)"""
+    kind, *args = spec
+    return INDICATORS[kind][0](candles, *args)
+
+
+def compute_frame(candles, specs):
+    """여러 스펙의 지표 배열을 한 번씩만 계산 {지표 키: 배열} (같은 지표를 여러 전략이 요구해도 1회)"""
+    frame = {}
+    for spec in specs:
+        key = indicator_key(spec)
+        if key not in frame:
+            frame[key] = compute_indicator(candles, spec)
+    return frame
+
+
+### ✅ 기존 pandas 계산 (검증 / 벤치마크 기준값, 매매 코드에서는 쓰지 않음)
+def _pandas_rsi(data, period=14):
+    import pandas as pd
+
+    data = pd.Series(data)
+    delta = data.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    return (100 - (100 / (1 + rs))).iloc[-1]
+
+
+def _pandas_moving_average(data, short_window=7, long_window=25):
+    import pandas as pd
+
+    data = pd.DataFrame(data)
+    data["short_MA"] = data["trade_price"].rolling(window=short_window).mean()
+    data["long_MA"] = data["trade_price"].rolling(window=long_window).mean()
+    return data.iloc[-1]["short_MA"], data.iloc[-1]["long_MA"]
+
+
+def _pandas_breakout(data, k=0.5):
+    import pandas as pd
+
+    yesterday = pd.DataFrame(data).iloc[-2]
+    return yesterday["trade_price"] + (yesterday["high_price"] - yesterday["low_price"]) * k
+
+
+def benchmark_calculations(bars=200, repeat=2000, windows=500, seed=3):
+    """`upbit_api.calculate_*` (캔들 배열 + 최신 값 커널) vs 기존 pandas 버전: 호출당 시간 + 결과 일치 확인
+    - 입력: 호가 단위(1,000원)로 반올림한 합성 캔들 bars개 (get_ohlcv 응답과 같은 JSON 목록 / 캔들 배열)
+    - 일치: 서로 다른 windows개 구간에서 RSI / 단기·장기 MA / 돌파가가 pandas 결과와 비트까지 같은지
+    """
+    from candles import to_upbit
+    from simulator import synthetic_candles
+    from upbit_api import calculate_rsi, calculate_moving_average, calculate_volatility_breakout
+
+    candles = synthetic_candles(bars + windows, volatility=0.002, seed=seed)
+    for name in ("open", "high", "low", "close"):
+        candles[name] = np.round(candles[name], -3)
+    rows = to_upbit(candles)
+
+    # ✅ 1. 결과 일치 (NaN은 NaN끼리 같다고 봄)
+    def same(a, b):
+        return (math.isnan(a) and math.isnan(b)) or a == b
+
+    for start in range(windows):
+        window = rows[start:start + bars]
+        closes = [c["trade_price"] for c in window]
+        expected = (_pandas_rsi(closes), *_pandas_moving_average(window, 5, 20), _pandas_breakout(window))
+        actual = (calculate_rsi(closes), *calculate_moving_average(window, 5, 20), calculate_volatility_breakout(window))
+        for name, e, a in zip(("rsi", "short_ma", "long_ma", "breakout"), expected, actual):
+            if not same(float(e), a):
+                raise AssertionError(f"{start}번째 구간 {name} 불일치: pandas={e!r}, array={a!r}")
+
+    # ✅ 2. 호출당 시간 (같은 200개 캔들로 repeat번)
+    window, array = rows[-bars:], candles[-bars:]
+    closes = [c["trade_price"] for c in window]
+    cases = [
+        ("RSI", lambda: _pandas_rsi(closes), lambda: calculate_rsi(closes), lambda: calculate_rsi(array)),
+        ("이동평균", lambda: _pandas_moving_average(window, 5, 20), lambda: calculate_moving_average(window, 5, 20),
+         lambda: calculate_moving_average(array, 5, 20)),
+        ("변동성 돌파", lambda: _pandas_breakout(window), lambda: calculate_volatility_breakout(window),
+         lambda: calculate_volatility_breakout(array)),
+    ]
+
+    def per_call(fn):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - started) / repeat * 1e6
+
+    lines = []
+    for name, pandas_fn, list_fn, array_fn in cases:
+        pandas_us, list_us, array_us = per_call(pandas_fn), per_call(list_fn), per_call(array_fn)
+        lines.append(f"📊 {name}: pandas {pandas_us:,.1f}µs | JSON 목록 {list_us:,.1f}µs ({pandas_us / list_us:,.0f}배) "
+                     f"| 캔들 배열 {array_us:,.1f}µs ({pandas_us / array_us:,.0f}배)")
+    print(f"""
+⏱️ **지표 계산 벤치마크** (캔들 {bars}개, {repeat}회 평균) ⏱️
+{chr(10).join(lines)}
+✅ {windows}개 구간에서 pandas 결과와 비트까지 일치합니다.
+""")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # ✅ 결과 검증(pandas / 배치 지표와 일치)은 tests/test_indicators.py
+    parser = argparse.ArgumentParser(description="지표 계산 벤치마크")
+    parser.add_argument("--benchmark", action="store_true", help="calculate_* 함수와 기존 pandas 버전 속도 비교 (기본 동작)")
+    parser.parse_args()
+    benchmark_calculations()
@@ -0,0 +1,158 @@
+import argparse
+import time
+from storage import transaction, fetch_one, fetch_all
+
+# ✅ 마켓별 포지션 요약 (평균 단가 방식, 업비트 평균 매수가와 같은 기준)
+POSITION_FIELDS = ("volume", "cost_basis", "realized_pnl", "fees", "buy_amount", "sell_amount")
+DUST = 1e-12  # 이보다 작은 잔량은 0으로 처리 (부동소수점 오차)
+
+
+def empty_position():
+    """기록이 없는 마켓의 포지션"""
+    return dict.fromkeys(POSITION_FIELDS, 0.0)
+
+
+def apply_to_position(position, side, price, volume, fee=0.0):
+    """체결 1건을 포지션에 반영 (bid: 수량·원가 증가, ask: 평균 단가로 원가를 빼고 실현 손익 누적)"""
+    amount = price * volume
+    position["fees"] += fee
+    if side == "bid":
+        position["volume"] += volume
+        position["cost_basis"] += amount + fee  # ✅ 매수 수수료는 원가에 포함
+        position["buy_amount"] += amount
+    else:
+        held = position["volume"]
+        cost_out = position["cost_basis"] * min(volume / held, 1.0) if held > 0 else 0.0
+        position["realized_pnl"] += amount - fee - cost_out
+        position["cost_basis"] -= cost_out
+        position["volume"] = held - volume
+        position["sell_amount"] += amount
+        if position["volume"] <= DUST:
+            position["volume"] = 0.0
+            position["cost_basis"] = 0.0
+    return position
+
+
+def replay(rows):
+    """(마켓, 매매구분, 가격, 수량, 수수료) 행을 순서대로 한 번 훑어 마켓별 포지션 계산"""
+    positions = {}
+    for market, side, price, volume, fee in rows:
+        position = positions.setdefault(market, empty_position())
+        apply_to_position(position, side, price or 0.0, volume or 0.0, fee or 0.0)
+    return positions
+
+
+def save_position(conn, market, position):
+    """포지션 요약 한 행 저장 (호출한 쪽의 트랜잭션 안에서 실행)"""
+    conn.execute(f"""
+        INSERT OR REPLACE INTO positions (market, {", ".join(POSITION_FIELDS)}, updated_at)
+        VALUES (?, {", ".join("?" * len(POSITION_FIELDS))}, ?)
+    """, (market, *(position[field] for field in POSITION_FIELDS), time.time()))
+
+
+### ✅ 1. 체결 기록 (거래 기록 추가 + 포지션 갱신을 한 트랜잭션으로)
+def record_fill(market, side, price, volume, fee=0.0, trade_time=None):
+    """체결 1건을 trade_history에 추가하고 포지션 요약을 갱신한 뒤 갱신된 포지션 반환"""
+    trade_time = trade_time or time.strftime("%Y-%m-%d %H:%M:%S")
+    with transaction() as conn:
+        # ✅ INSERT가 먼저 쓰기 잠금을 잡으므로 아래 읽기-수정-쓰기가 다른 쓰기와 섞이지 않음
+        conn.execute("""
+            INSERT INTO trade_history (trade_time, market, trade_type, price, volume, total_cost, fee)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (trade_time, market, side, price, volume, price * volume, fee))
+        row = conn.execute(
+            f"SELECT {', '.join(POSITION_FIELDS)} FROM positions WHERE market = ?", (market,)
+        ).fetchone()
+        position = dict(zip(POSITION_FIELDS, row)) if row else empty_position()
+        apply_to_position(position, side, price, volume, fee)
+        save_position(conn, market, position)
+    return position
+
+
+def record_fills(fills):
+    """체결 여러 건을 trade_history / transactions에 한 트랜잭션으로 저장하고 포지션 갱신
+    - fills: market, side, price, volume, fee, trade_time, order_uuid, trade_uuid 키를 가진 dict 목록
+    - 이미 저장된 체결(trade_uuid 중복)은 건너뛰고 새로 저장된 건수 반환
+    """
+    inserted = 0
+    with transaction() as conn:
+        positions = {}
+        for fill in fills:
+            cursor = conn.execute("""
+                INSERT OR IGNORE INTO trade_history
+                (trade_time, market, trade_type, price, volume, total_cost, fee, order_uuid, trade_uuid)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (fill["trade_time"], fill["market"], fill["side"], fill["price"], fill["volume"],
+                  fill["price"] * fill["volume"], fill["fee"], fill["order_uuid"], fill["trade_uuid"]))
+            if cursor.rowcount == 0:
+                continue  # 이미 기록된 체결
+            conn.execute("""
+                INSERT OR IGNORE INTO transactions (trade_time, market, price, volume, trade_type, order_uuid, trade_uuid)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (fill["trade_time"], fill["market"], fill["price"], fill["volume"], fill["side"],
+                  fill["order_uuid"], fill["trade_uuid"]))
+
+            market = fill["market"]
+            if market not in positions:
+                row = conn.execute(
+                    f"SELECT {', '.join(POSITION_FIELDS)} FROM positions WHERE market = ?", (market,)
+                ).fetchone()
+                positions[market] = dict(zip(POSITION_FIELDS, row)) if row else empty_position()
+            apply_to_position(positions[market], fill["side"], fill["price"], fill["volume"], fill["fee"])
+            inserted += 1
+
+        for market, position in positions.items():
+            save_position(conn, market, position)
+    return inserted
+
+
+### ✅ 2. 포지션 / 손익 조회 (요약 테이블 한 행, O(1))
+def get_position(market):
+    """마켓 포지션 요약 (기록이 없으면 모두 0)"""
+    row = fetch_one(f"SELECT {', '.join(POSITION_FIELDS)} FROM positions WHERE market = ?", (market,))
+    return dict(zip(POSITION_FIELDS, row)) if row else empty_position()
+
+
+def get_pnl(market, current_price):
+    """현재가 기준 손익 (평균 단가, 평가 금액, 실현 / 평가 / 총 손익 포함)"""
+    position = get_position(market)
+    volume = position["volume"]
+    current_value = volume * (current_price or 0)
+    unrealized = current_value - position["cost_basis"] if volume > 0 else 0.0
+    return {
+        **position,
+        "avg_price": position["cost_basis"] / volume if volume > 0 else 0.0,
+        "current_price": current_price or 0,
+        "current_value": current_value,
+        "unrealized_pnl": unrealized,
+        "total_pnl": position["realized_pnl"] + unrealized,
+    }
+
+
+### ✅ 3. 재계산 (거래 기록 전체를 한 번 훑어 요약 테이블 재작성)
+def rebuild_positions():
+    """trade_history 전체로 positions 테이블을 다시 만들고 마켓별 포지션 반환"""
+    with transaction() as conn:
+        conn.execute("DELETE FROM positions")  # ✅ 쓰기 잠금을 먼저 잡아 재계산 중 들어오는 체결과 섞이지 않게 함
+        positions = replay(conn.execute(
+            "SELECT market, trade_type, price, volume, COALESCE(fee, 0) FROM trade_history ORDER BY id"
+        ))
+        for market, position in positions.items():
+            save_position(conn, market, position)
+    return positions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="마켓별 포지션 / 손익 요약")
+    parser.add_argument("--rebuild", action="store_true", help="거래 기록 전체로 요약 테이블 재계산")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        started = time.perf_counter()
+        rebuild_positions()
+        print(f"✅ 포지션 요약을 다시 계산했습니다. ({time.perf_counter() - started:.2f}초)")
+
+    for market, *values in fetch_all(f"SELECT market, {', '.join(POSITION_FIELDS)} FROM positions ORDER BY market"):
+        position = dict(zip(POSITION_FIELDS, values))
+        print(f"📌 {market}: 보유 {position['volume']:.8f}, 원가 {position['cost_basis']:,.0f} KRW, "
+              f"실현 손익 {position['realized_pnl']:,.0f} KRW, 수수료 {position['fees']:,.0f} KRW")
@@ -1,32 +1,220 @@
+import atexit
+import datetime
+import glob
+import gzip
+import json
 import os
-from config import WALLET_LOG_FILE, TRADES_LOG_FILE
-
-def get_iteration(log_file):
-    """현재 몇 번째 실행인지 로그 파일을 확인하여 회차 증가"""
-    if not os.path.exists(log_file):
-        return 1  # 첫 번째 실행
-
-    with open(log_file, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-        count = sum(1 for line in lines if "회차" in line)  # "회차" 등장 횟수 세기
-        return count + 1  # 다음 회차 반환
-
-def save_to_wallet_log(data):
-    """회차별 지갑 정보를 log/wallet_log.txt 파일에 추가"""
-    iteration = get_iteration(WALLET_LOG_FILE)
-    
-    with open(WALLET_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"\n{iteration} 회차 (지갑 정보)\n")
-        f.write(data)
-    
+import queue
+import shutil
+import threading
+from config import (
+    WALLET_LOG_FILE, TRADES_LOG_FILE, LEGACY_LOG_FILES, LOG_MAX_BYTES, LOG_ROTATE_DAILY, LOG_BACKUP_COUNT,
+)
+
+
+class JsonLineLog:
+    """JSON Lines 로그 파일 1개 (회차 번호는 메모리 + 보조 파일로 관리, 크기/날짜 기준으로 gzip 교체)"""
+
+    def __init__(self, path, max_bytes=LOG_MAX_BYTES, daily=LOG_ROTATE_DAILY, backup_count=LOG_BACKUP_COUNT):
+        self.path = path
+        self.counter_path = f"{path}.count"  # ✅ 마지막 회차 번호 (로그 파일을 다시 읽지 않음)
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        self.iteration = self._load_iteration()
+        self.written = self.iteration  # 파일에 쓴 마지막 회차 (보조 파일에 저장하는 값)
+        self._file = None
+        self._size = 0
+        self._day = None
+
+    def _load_iteration(self):
+        """보조 파일의 회차 번호 (없으면 기존 텍스트 로그의 "회차" 줄 수로 한 번만 계산)
+        - 보조 파일 저장 전에 종료됐으면 로그 파일 마지막 기록의 회차가 더 크므로 큰 쪽 사용
+        """
+        counted = None
+        try:
+            with open(self.counter_path, encoding="utf-8") as f:
+                counted = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            pass
+        logged = self._last_logged()
+        if counted is None and not logged:
+            legacy = LEGACY_LOG_FILES.get(self.path)
+            if legacy and os.path.exists(legacy):
+                with open(legacy, encoding="utf-8") as f:
+                    return sum(1 for line in f if "회차" in line)  # 한 줄씩 읽음 (파일 전체를 메모리에 올리지 않음)
+        return max(counted or 0, logged)
+
+    def _last_logged(self):
+        """로그 파일 마지막 기록의 회차 번호 (파일 끝부분만 읽음, 없으면 0)"""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(max(0, os.path.getsize(self.path) - 64 * 1024))
+                lines = f.read().splitlines()
+        except OSError:
+            return 0
+        for line in reversed(lines):
+            try:
+                return int(json.loads(line)["iteration"])
+            except (ValueError, KeyError, TypeError):
+                continue  # 쓰다가 중단된 마지막 줄 / 잘린 첫 줄
+        return 0
+
+    def next_iteration(self):
+        """다음 회차 번호 (메모리에서 1 증가)"""
+        with self._lock:
+            self.iteration += 1
+            return self.iteration
+
+    ### ✅ 아래는 모두 쓰기 스레드에서만 호출
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._day = (
+            datetime.date.fromtimestamp(os.path.getmtime(self.path)) if self._size else datetime.date.today()
+        )
+
+    def write(self, record):
+        """기록 1개 추가 (필요하면 먼저 파일 교체) → 기록당 O(1)"""
+        if self._file is None:
+            self._open()
+        today = datetime.date.today()
+        if self._size and (self._size >= self.max_bytes or (self.daily and today != self._day)):
+            self._rotate()
+            self._day = today
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"  # numpy 숫자 등은 문자열로
+        self._file.write(line)
+        self._size += len(line.encode("utf-8"))
+        self.written = max(self.written, record.get("iteration", 0))
+
+    def flush(self):
+        """파일 버퍼를 내리고 회차 번호를 보조 파일에 저장"""
+        if self._file is not None:
+            self._file.flush()
+        with open(self.counter_path, "w", encoding="utf-8") as f:
+            f.write(str(self.written))
+
+    def _rotate(self):
+        """현재 파일을 날짜가 붙은 이름으로 옮기고 gzip 압축 (압축은 별도 스레드), 오래된 압축 파일 삭제"""
+        self._file.close()
+        base, ext = os.path.splitext(self.path)
+        stamp = f"{datetime.datetime.now():%Y%m%d-%H%M%S}"
+        rotated, n = f"{base}.{stamp}{ext}", 1
+        while os.path.exists(rotated) or os.path.exists(f"{rotated}.gz"):
+            rotated, n = f"{base}.{stamp}-{n}{ext}", n + 1  # 1초 안에 여러 번 교체되는 경우
+        os.replace(self.path, rotated)
+        threading.Thread(target=self._compress, args=(rotated,), daemon=True).start()
+        self._open()
+        self._day = datetime.date.today()
+
+    def _compress(self, rotated):
+        with open(rotated, "rb") as src, gzip.open(f"{rotated}.gz.tmp", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(f"{rotated}.gz.tmp", f"{rotated}.gz")  # 압축이 끝난 뒤에만 원본 삭제
+        os.remove(rotated)
+        base, ext = os.path.splitext(self.path)
+        backups = sorted(glob.glob(f"{base}.*{ext}.gz"))
+        for old in backups[:-self.backup_count] if self.backup_count else []:
+            os.remove(old)
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+### ✅ 백그라운드 쓰기 스레드 (호출한 쪽은 큐에 넣고 바로 반환)
+_queue = queue.Queue()
+_logs = {}
+_logs_lock = threading.Lock()
+_thread = None
+
+
+def _writer():
+    dirty = set()  # 마지막으로 큐가 빈 뒤에 기록한 로그
+    while True:
+        item = _queue.get()
+        if item is None:
+            _queue.task_done()
+            break
+        log, record = item
+        try:
+            try:
+                log.write(record)
+                dirty.add(log)
+            except Exception as e:  # ✅ 어떤 오류든 쓰기 스레드는 계속 (죽으면 flush()가 영원히 대기)
+                print(f"⚠️ 로그 기록 실패 ({log.path}): {e}")
+            if _queue.empty():
+                _flush_logs(dirty)  # ✅ 큐가 빌 때만 디스크에 반영 (몰려 들어오면 한 번에), 기록한 로그 모두
+        finally:
+            _queue.task_done()
+    for log in _logs.values():
+        log.close()
+
+
+def _flush_logs(logs):
+    """로그 파일 버퍼와 회차 보조 파일을 함께 저장"""
+    for log in logs:
+        try:
+            log.flush()
+        except Exception as e:
+            print(f"⚠️ 로그 저장 실패 ({log.path}): {e}")
+    logs.clear()
+
+
+def get_log(path):
+    """경로별 로그 객체 (처음 호출할 때 쓰기 스레드 시작)"""
+    global _thread
+    with _logs_lock:
+        if path not in _logs:
+            _logs[path] = JsonLineLog(path)
+        if _thread is None:
+            _thread = threading.Thread(target=_writer, name="log-writer", daemon=True)
+            _thread.start()
+            atexit.register(shutdown)
+        return _logs[path]
+
+
+def log_record(path, kind, message, **fields):
+    """구조화된 기록 1개를 큐에 넣고 회차 번호 반환"""
+    log = get_log(path)
+    iteration = log.next_iteration()
+    record = {
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "iteration": iteration,
+        "kind": kind,
+        "message": message,
+        **fields,
+    }
+    _queue.put((log, record))
+    return iteration
+
+
+def flush():
+    """큐에 쌓인 기록이 모두 파일에 쓰일 때까지 대기"""
+    if _thread is not None:
+        _queue.join()
+
+
+def shutdown():
+    """남은 기록을 모두 쓰고 파일 닫기 (프로그램 종료 시 자동 호출)"""
+    global _thread
+    if _thread is not None:
+        _queue.put(None)
+        _thread.join(5)
+        _thread = None
+
+
+def save_to_wallet_log(data, **fields):
+    """회차별 지갑 정보를 log/wallet_log.jsonl 파일에 추가"""
+    iteration = log_record(WALLET_LOG_FILE, "wallet", data, **fields)
     print(f"✅ {iteration} 회차 지갑 정보가 {WALLET_LOG_FILE} 파일에 저장되었습니다.")
 
-def save_to_trades_log(data):
-    """회차별 거래 내역을 log/trades_log.txt 파일에 추가"""
-    iteration = get_iteration(TRADES_LOG_FILE)
-    
-    with open(TRADES_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"\n{iteration} 회차 (거래 내역)\n")
-        f.write(data)
-    
+
+def save_to_trades_log(data, **fields):
+    """회차별 거래 내역을 log/trades_log.jsonl 파일에 추가"""
+    iteration = log_record(TRADES_LOG_FILE, "trades", data, **fields)
     print(f"✅ {iteration} 회차 거래 내역이 {TRADES_LOG_FILE} 파일에 저장되었습니다.")
@@ -1,25 +1,21 @@
-from wallet import display_wallet
-from trades import display_buy_sell_data
-from database import setup_database
-from auto_trade import auto_trade 
-from calculate_pnl import calculate_pnl
-
-def main():
-    """전체 프로그램 실행"""
-    setup_database()
+import time
 
-    print("🚀 지갑 정보를 조회하는 중...")
-    display_wallet()
+started = time.perf_counter()  # ✅ 첫 매매 판단까지 걸린 시간 측정 기준 (import 시간 포함)
 
-    print("🚀 거래 내역을 조회하는 중...")
-    display_buy_sell_data()
+from auto_trade import auto_trade
+from calculate_pnl import calculate_pnl
+from upbit_api import get_market_prices
+from config import MARKETS
 
-    """자동 매매 실행"""
+def main():
+    """전체 프로그램 실행 (DB 준비 / 초기 시세는 auto_trade의 bootstrap에서, 지갑 / 거래 내역 출력은 첫 틱 이후 백그라운드로)"""
     try:
-        auto_trade()  # ✅ 자동 매매 시작
+        auto_trade(startup_reports=True, started=started)  # ✅ 자동 매매 시작
     except KeyboardInterrupt:
         print("\n🚀 프로그램 종료 중... 손익 정리")
-        calculate_pnl()  # ✅ 종료 시 손익 계산
+        prices = get_market_prices(MARKETS)  # ✅ 시세는 한 번에 조회
+        for market in MARKETS:
+            calculate_pnl(market, prices.get(market))  # ✅ 종료 시 마켓별 손익 계산 (시세가 없으면 개별 조회)
         print("✅ 프로그램 종료 완료.")
 
 if __name__ == "__main__":
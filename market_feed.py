@@ -0,0 +1,261 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, timezone
+import websockets
+from config import WS_URL
+from upbit_api import get_ohlcv
+
+KST = timezone(timedelta(hours=9))
+
+
+def _parse_candle_time(candle):
+    """REST 캔들의 `candle_date_time_utc` → 분 시작 epoch 초"""
+    dt = datetime.strptime(candle["candle_date_time_utc"], "%Y-%m-%dT%H:%M:%S")
+    return int(dt.replace(tzinfo=timezone.utc).timestamp())
+
+
+class CandleBuilder:
+    """체결(trade) 메시지로 업비트 REST와 같은 형식의 1분봉을 직접 만드는 클래스"""
+
+    def __init__(self, market):
+        self.market = market
+        self.current = None  # 진행 중인 캔들
+        self.current_start = None  # 진행 중인 캔들의 분 시작 epoch 초
+
+    def adopt(self, candle):
+        """REST로 받은 캔들을 진행 중인 캔들로 이어받기 (재연결/백필 후 연속성 유지)"""
+        start = _parse_candle_time(candle)
+        if self.current_start is None or start >= self.current_start:
+            self.current = dict(candle)
+            self.current.setdefault("candle_acc_trade_price", 0.0)
+            self.current.setdefault("candle_acc_trade_volume", 0.0)
+            self.current_start = start
+
+    def add_trade(self, price, volume, timestamp_ms):
+        """체결 1건 반영 → (방금 마감된 캔들 또는 None, 진행 중인 캔들) 반환"""
+        start = timestamp_ms // 60000 * 60
+        if self.current_start is not None and start < self.current_start:
+            return None, self.current  # ✅ 이미 지난 분의 늦은 체결은 무시
+
+        closed = None
+        if self.current_start is None or start > self.current_start:
+            closed = self.current
+            utc = datetime.fromtimestamp(start, timezone.utc)
+            self.current = {
+                "market": self.market,
+                "candle_date_time_utc": utc.strftime("%Y-%m-%dT%H:%M:%S"),
+                "candle_date_time_kst": utc.astimezone(KST).strftime("%Y-%m-%dT%H:%M:%S"),
+                "opening_price": price,
+                "high_price": price,
+                "low_price": price,
+                "trade_price": price,
+                "timestamp": timestamp_ms,
+                "candle_acc_trade_price": 0.0,
+                "candle_acc_trade_volume": 0.0,
+                "unit": 1,
+            }
+            self.current_start = start
+
+        candle = self.current
+        candle["high_price"] = max(candle["high_price"], price)
+        candle["low_price"] = min(candle["low_price"], price)
+        candle["trade_price"] = price
+        candle["timestamp"] = timestamp_ms
+        candle["candle_acc_trade_price"] += price * volume
+        candle["candle_acc_trade_volume"] += volume
+        return closed, candle
+
+
+class MarketFeed:
+    """업비트 웹소켓(ticker / trade / orderbook) 구독 → 1분봉을 만들어 트레이딩 루프로 전달"""
+
+    def __init__(self, markets, url=WS_URL, channels=("ticker", "trade", "orderbook"),
+                 reconnect_delay=1, max_reconnect_delay=60, stale_after=30):
+        self.markets = list(markets)
+        self.url = url
+        self.channels = channels
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.stale_after = stale_after  # 이 시간(초) 동안 메시지가 없으면 끊긴 것으로 간주
+
+        self.prices = {}  # 마켓 → 최근 체결가 (ticker)
+        self.orderbooks = {}  # 마켓 → 최근 호가 (orderbook)
+        self.builders = {market: CandleBuilder(market) for market in self.markets}
+        self.connected = False
+        self.reconnects = 0
+        self.last_message_time = 0
+
+        self._pending = {market: deque() for market in self.markets}  # 루프가 아직 가져가지 않은 캔들
+        self._lock = threading.Lock()
+        self._updated = threading.Event()
+        self._loop = None
+        self._task = None
+        self._thread = None
+
+    ### ✅ 1. 트레이딩 루프에서 사용하는 인터페이스
+    def is_live(self):
+        """연결되어 있고 최근 메시지를 받고 있는지"""
+        return self.connected and time.time() - self.last_message_time < self.stale_after
+
+    def get_price(self, market):
+        return self.prices.get(market)
+
+    def pop_candles(self, market):
+        """쌓인 캔들 갱신분을 꺼내기 (시간순, 같은 분 캔들은 여러 번 나올 수 있음)"""
+        with self._lock:
+            pending = self._pending[market]
+            candles = list(pending)
+            pending.clear()
+        return candles
+
+    def wait(self, timeout):
+        """새 시세/캔들이 들어오거나 timeout이 지날 때까지 대기"""
+        updated = self._updated.wait(timeout)
+        self._updated.clear()
+        return updated
+
+    def start(self):
+        """별도 스레드에서 이벤트 루프를 돌리며 구독 시작"""
+        self._thread = threading.Thread(target=asyncio.run, args=(self.run(),), name="market-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    ### ✅ 2. 연결 / 재연결
+    async def run(self):
+        """끊기면 지수 백오프로 재연결하고, 재연결 직후 빠진 캔들을 REST로 채움"""
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        delay = self.reconnect_delay
+
+        try:
+            while True:
+                try:
+                    async with websockets.connect(self.url, ping_interval=20, max_size=None) as ws:
+                        await ws.send(json.dumps(self._subscription()))
+                        await self._backfill()
+                        self.connected = True
+                        delay = self.reconnect_delay
+                        print(f"✅ 웹소켓 연결 완료: {', '.join(self.markets)}")
+
+                        async for message in ws:
+                            try:
+                                self._handle(message)
+                            except (KeyError, TypeError, ValueError) as e:
+                                print(f"⚠️ 웹소켓 메시지 처리 실패 (무시): {e!r}")
+                except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+                    print(f"⚠️ 웹소켓 연결 끊김: {e!r} → {delay}초 후 재연결")
+
+                self.connected = False
+                self.reconnects += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.connected = False
+
+    def _subscription(self):
+        """업비트 구독 요청 메시지"""
+        request = [{"ticket": str(uuid.uuid4())}]
+        for channel in self.channels:
+            request.append({"type": channel, "codes": self.markets})
+        request.append({"format": "DEFAULT"})
+        return request
+
+    async def _backfill(self):
+        """연결이 끊겼던 동안의 캔들을 기존 REST `get_ohlcv`로 받아 채우기"""
+        now = time.time()
+        for market, builder in self.builders.items():
+            if builder.current_start is None:
+                count = 2  # 첫 연결: 진행 중인 캔들만 이어받기
+            else:
+                count = min(int((now - builder.current_start) // 60) + 2, 200)
+
+            candles = await asyncio.to_thread(get_ohlcv, market, count)
+            if not isinstance(candles, list) or len(candles) == 0:
+                continue
+
+            candles = sorted(candles, key=lambda c: c["candle_date_time_utc"])
+            self._push(market, candles)
+            builder.adopt(candles[-1])
+
+    ### ✅ 3. 메시지 처리
+    def _handle(self, message):
+        data = json.loads(message)
+        kind = data.get("type")
+        market = data.get("code")
+        if market not in self.builders:
+            return
+        self.last_message_time = time.time()
+
+        if kind == "ticker":
+            self.prices[market] = data["trade_price"]
+            self._updated.set()
+        elif kind == "trade":
+            closed, current = self.builders[market].add_trade(
+                data["trade_price"], data["trade_volume"], data["trade_timestamp"]
+            )
+            # ✅ 진행 중인 캔들은 복사해서 넘김 (이후 체결로 값이 바뀌므로)
+            self._push(market, [closed, dict(current)] if closed else [dict(current)])
+            if closed:
+                self._updated.set()
+        elif kind == "orderbook":
+            self.orderbooks[market] = data
+
+    def _push(self, market, candles):
+        with self._lock:
+            self._pending[market].extend(candles)
+
+
+### ✅ 4. 녹화된 메시지로 테스트하기 위한 로컬 웹소켓 서버
+def load_recorded(path):
+    """JSON Lines 파일에 저장된 웹소켓 메시지 불러오기"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def record_messages(path, markets, seconds=60, url=WS_URL, channels=("ticker", "trade", "orderbook")):
+    """실제 웹소켓 메시지를 JSON Lines 파일로 녹화 (재생 서버용)"""
+    feed = MarketFeed(markets, url=url, channels=channels)
+    deadline = time.time() + seconds
+    count = 0
+    async with websockets.connect(url) as ws:
+        await ws.send(json.dumps(feed._subscription()))
+        with open(path, "w", encoding="utf-8") as f:
+            while time.time() < deadline:
+                try:
+                    message = await asyncio.wait_for(ws.recv(), timeout=deadline - time.time())
+                except asyncio.TimeoutError:
+                    break
+                f.write(json.dumps(json.loads(message), ensure_ascii=False) + "\n")
+                count += 1
+    print(f"✅ 웹소켓 메시지 {count}개를 {path}에 녹화했습니다.")
+
+
+async def replay_server(messages, host="127.0.0.1", port=0, interval=0.0, close_after=False):
+    """구독 요청을 받으면 녹화된 메시지를 순서대로 보내주는 업비트 대역 서버 (반환된 서버의 포트로 접속)"""
+    async def handler(ws):
+        try:
+            await ws.recv()  # 구독 요청
+            for message in messages:
+                await ws.send(json.dumps(message).encode("utf-8"))  # 업비트처럼 바이너리 프레임 전송
+                if interval:
+                    await asyncio.sleep(interval)
+            if close_after:
+                await ws.close()
+            else:
+                await ws.wait_closed()
+        except websockets.ConnectionClosed:
+            pass  # 클라이언트가 먼저 끊은 경우
+
+    return await websockets.serve(handler, host, port)
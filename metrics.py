@@ -0,0 +1,255 @@
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config import METRICS_ENABLED, METRICS_HOST, METRICS_PORT, METRICS_FILE, METRICS_SNAPSHOT_INTERVAL
+
+# ✅ 지연 시간 히스토그램 구간 (초), 1ms ~ 10초
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ✅ 매매 루프 / API 클라이언트 / DB가 함께 쓰는 지표 저장소 ((이름, 라벨) → 값)
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_histograms = {}
+_help = {
+    "upbit_request_seconds": "업비트 REST 요청 지연 (엔드포인트별)",
+    "upbit_requests_total": "업비트 REST 요청 수 (엔드포인트 / 상태 코드별)",
+    "upbit_request_errors_total": "업비트 REST 오류 수 (네트워크 오류 + 2xx가 아닌 응답)",
+    "indicator_seconds": "지표 계산 시간",
+    "db_write_seconds": "DB 쓰기 트랜잭션 시간",
+    "order_roundtrip_seconds": "주문 판단 → 접수 응답까지 걸린 시간",
+    "fill_latency_seconds": "주문 접수 → 체결 기록까지 걸린 시간",
+    "tick_duration_seconds": "매매 틱 1회 처리 시간",
+    "tick_lag_seconds": "예정 시각보다 틱이 늦게 시작된 시간",
+    "ticks_skipped_total": "처리가 밀려 건너뛴 틱 수",
+    "time_to_first_decision_seconds": "프로그램 시작 → 첫 매매 판단까지 걸린 시간",
+    "execution_slippage_bps": "마지막 주문 실행의 실현 슬리피지 (판단가 대비, bp)",
+    "executions_total": "주문 실행 수 (시장가 / 지정가 IOC / 분할 주문 / 최우선 호가 지정가별)",
+    "open_orders": "체결을 기다리는 미체결 주문 수",
+    "orders_cancelled_total": "대기 시간이 지나 취소한 지정가 주문 수 (재주문 / 만료별)",
+    "orders_replaced_total": "취소 후 새 최우선 호가로 다시 낸 지정가 주문 수",
+}
+
+
+class Histogram:
+    """누적 구간 카운트 + 합계 + 횟수 (관측 1번 = 이진 탐색 1번)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """Prometheus 형식의 누적 구간 카운트 [(상한, 누적 횟수)]"""
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items())) if labels else ()
+
+
+### ✅ 1. 기록 (핫 경로: 잠금 1번 + 딕셔너리 조회 1번)
+def inc(name, value=1, **labels):
+    """카운터 증가"""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name, value, **labels):
+    """게이지 값 설정"""
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(name, seconds, **labels):
+    """히스토그램에 관측값 1개 추가"""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+
+@contextmanager
+def timer(name, **labels):
+    """with 블록 실행 시간을 히스토그램에 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+### ✅ 2. 내보내기
+def snapshot():
+    """현재 지표 전체를 JSON으로 바꿀 수 있는 딕셔너리로 반환 (히스토그램은 횟수 / 합계 / 평균 / 누적 구간 카운트)"""
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = {key: (h.count, h.sum, h.cumulative()) for key, h in _histograms.items()}
+
+    def label_text(labels):
+        return ",".join(f"{k}={v}" for k, v in labels)
+
+    result = {"time": time.time(), "counters": {}, "gauges": {}, "histograms": {}}
+    for (name, labels), value in counters.items():
+        result["counters"].setdefault(name, {})[label_text(labels)] = value
+    for (name, labels), value in gauges.items():
+        result["gauges"].setdefault(name, {})[label_text(labels)] = value
+    for (name, labels), (count, total, buckets) in histograms.items():
+        result["histograms"].setdefault(name, {})[label_text(labels)] = {
+            "count": count,
+            "sum": total,
+            "avg": total / count if count else 0.0,
+            "buckets": {("+Inf" if bound == float("inf") else str(bound)): n for bound, n in buckets},
+        }
+    return result
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in items)
+    return "{" + body + "}"
+
+
+def _sort_key(item):
+    (name, labels), _ = item
+    return name, [(k, str(v)) for k, v in labels]
+
+
+def render():
+    """Prometheus 텍스트 형식 (`/metrics` 응답 본문)"""
+    with _lock:
+        counters = sorted(_counters.items(), key=_sort_key)
+        gauges = sorted(_gauges.items(), key=_sort_key)
+        histograms = sorted(((key, (h.count, h.sum, h.cumulative())) for key, h in _histograms.items()), key=_sort_key)
+
+    lines, declared = [], set()
+
+    def declare(name, kind):
+        if name not in declared:
+            declared.add(name)
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in counters:
+        declare(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), value in gauges:
+        declare(name, "gauge")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), (count, total, buckets) in histograms:
+        declare(name, "histogram")
+        for bound, n in buckets:
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {n}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """모든 지표 초기화"""
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+
+### ✅ 3. 로컬 HTTP `/metrics` + 주기적 JSON 스냅샷 (별도 스레드, 매매 루프와 무관)
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            body, content_type = render().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/metrics.json":
+            body, content_type = json.dumps(snapshot(), ensure_ascii=False).encode("utf-8"), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 콘솔 출력하지 않음
+
+
+def start_server(host=METRICS_HOST, port=METRICS_PORT):
+    """`/metrics` HTTP 서버를 데몬 스레드로 시작하고 서버 반환 (포트 사용 중이면 None)"""
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        print(f"⚠️ 지표 서버 시작 실패 ({host}:{port}): {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"📈 지표 서버 시작: http://{server.server_address[0]}:{server.server_address[1]}/metrics")
+    return server
+
+
+def write_snapshot(path=METRICS_FILE):
+    """현재 지표를 JSON 파일로 저장 (임시 파일에 쓴 뒤 교체 → 읽는 쪽이 반쯤 쓴 파일을 보지 않음)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, ensure_ascii=False, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def start_snapshots(path=METRICS_FILE, interval=METRICS_SNAPSHOT_INTERVAL):
+    """interval초마다 JSON 스냅샷을 저장하는 데몬 스레드 시작, 중지용 Event 반환"""
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                write_snapshot(path)
+            except OSError as e:
+                print(f"⚠️ 지표 스냅샷 저장 실패 ({path}): {e}")
+
+    threading.Thread(target=run, name="metrics-snapshot", daemon=True).start()
+    return stop
+
+
+def start():
+    """설정이 켜져 있으면 HTTP 서버 + 주기적 스냅샷 시작"""
+    if not METRICS_ENABLED:
+        return None
+    start_snapshots()
+    return start_server()
+
+
+if __name__ == "__main__":
+    # ✅ 저장된 마지막 스냅샷 요약 출력
+    with open(METRICS_FILE, encoding="utf-8") as f:
+        data = json.load(f)
+    for name, series in data["histograms"].items():
+        for labels, h in series.items():
+            print(f"{name} {{{labels}}}: {h['count']}회, 평균 {h['avg'] * 1000:.1f}ms")
+    for name, series in data["counters"].items():
+        for labels, value in series.items():
+            print(f"{name} {{{labels}}}: {value}")
@@ -0,0 +1,168 @@
+import argparse
+import csv
+import itertools
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from backtest import run_backtest
+from candles import load_candles, save_candles
+from indicators import indicator_key, compute_indicator
+from signals import DEFAULT_PARAMS
+from strategy import RsiMaBreakoutStrategy
+
+# ✅ 기본 탐색 범위 (지표 파라미터를 앞에 두면 같은 지표를 쓰는 조합이 같은 작업 묶음에 모여 캐시 효율이 좋아짐)
+DEFAULT_GRID = {
+    "rsi_period": [7, 14, 21],
+    "short_window": [3, 5, 10],
+    "long_window": [20, 30, 60],
+    "breakout_k": [0.3, 0.5, 0.7],
+    "rsi_buy": [25, 30, 35],
+    "rsi_sell": [65, 70, 75],
+    "take_profit": [0.005, 0.01, 0.02],
+    "cooldown": [60, 300, 900],
+}
+
+RESULT_COLUMNS = ["sharpe", "pnl", "return_pct", "max_drawdown_pct", "trades", "win_rate"]
+
+# ✅ 워커 프로세스 전역 상태 (프로세스마다 한 번만 초기화)
+_columns = None
+_indicator_cache = {}
+_CACHE_LIMIT = 64
+
+
+def _init_worker(path):
+    """캔들 파일을 메모리 매핑으로 열기 (작업마다 배열을 피클링해서 보내지 않음)"""
+    global _columns
+    candles = np.load(path, mmap_mode="r")
+    # ✅ 구조체 배열의 필드는 띄엄띄엄 놓여 있으므로 자주 쓰는 열만 연속 배열로 한 번 변환
+    _columns = {name: np.ascontiguousarray(candles[name]) for name in ("timestamp", "high", "low", "close")}
+
+
+def _cached(key, compute):
+    """지표 계산 결과를 워커 안에서 재사용 (같은 RSI 기간 / MA 길이는 한 번만 계산)"""
+    value = _indicator_cache.get(key)
+    if value is None:
+        if len(_indicator_cache) >= _CACHE_LIMIT:
+            _indicator_cache.pop(next(iter(_indicator_cache)))
+        value = _indicator_cache[key] = compute()
+    return value
+
+
+def _evaluate(params):
+    """파라미터 조합 하나를 백테스트하고 결과 행 반환"""
+    strategy = RsiMaBreakoutStrategy(params)
+    indicators = {
+        indicator_key(spec): _cached(indicator_key(spec), lambda spec=spec: compute_indicator(_columns, spec))
+        for spec in strategy.indicators()
+    }
+    result = run_backtest(_columns, indicators=indicators, strategy=strategy)
+    return {**params, **{column: result[column] for column in RESULT_COLUMNS}}
+
+
+def build_combinations(grid, samples=None, seed=0):
+    """그리드 전체 조합 또는 무작위 samples개 조합 (기본 파라미터와 합쳐서 반환)"""
+    names = list(grid)
+    total = 1
+    for values in grid.values():
+        total *= len(values)
+
+    if samples is None or samples >= total:
+        combos = itertools.product(*(grid[name] for name in names))
+    else:
+        rng = random.Random(seed)
+        picked = sorted(rng.sample(range(total), samples))  # 인덱스 정렬 → 지표가 같은 조합끼리 가깝게
+        combos = []
+        for index in picked:
+            combo = []
+            for name in reversed(names):
+                index, position = divmod(index, len(grid[name]))
+                combo.append(grid[name][position])
+            combos.append(tuple(reversed(combo)))
+
+    return [{**DEFAULT_PARAMS, **dict(zip(names, combo))} for combo in combos]
+
+
+def optimize(path, grid=DEFAULT_GRID, samples=None, workers=None, seed=0):
+    """모든 코어에서 파라미터 조합을 백테스트하고 샤프 지수 → 손익 → 낙폭 순으로 정렬된 결과 반환"""
+    temp_path = None
+    if not path.endswith(".npy"):
+        # ✅ CSV는 워커들이 메모리 매핑으로 공유할 수 있도록 임시 .npy로 한 번 변환
+        fd, temp_path = tempfile.mkstemp(suffix=".npy")
+        os.close(fd)
+        save_candles(temp_path, load_candles(path))
+        path = temp_path
+
+    combos = build_combinations(grid, samples, seed)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(combos) // (workers * 8))
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as pool:
+            results = list(pool.map(_evaluate, combos, chunksize=chunksize))
+    finally:
+        if temp_path:
+            os.remove(temp_path)
+
+    results.sort(key=lambda r: (-r["sharpe"], -r["pnl"], r["max_drawdown_pct"]))
+    return results
+
+
+def format_table(results, top=20):
+    """상위 결과 표 문자열"""
+    names = [name for name in DEFAULT_PARAMS if len({r[name] for r in results}) > 1]  # 탐색한 파라미터만 표시
+    header = ["#"] + names + RESULT_COLUMNS
+    rows = []
+    for rank, result in enumerate(results[:top], 1):
+        row = [str(rank)]
+        for name in names + RESULT_COLUMNS:
+            value = result[name]
+            row.append(f"{value:,.2f}" if isinstance(value, float) else str(value))
+        rows.append(row)
+    widths = [max(len(h), *(len(r[i]) for r in rows)) if rows else len(h) for i, h in enumerate(header)]
+    lines = ["  ".join(h.rjust(w) for h, w in zip(header, widths))]
+    lines += ["  ".join(v.rjust(w) for v, w in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def save_results(path, results):
+    """전체 결과를 CSV로 저장"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"✅ 파라미터 탐색 결과 {len(results)}개가 {path}에 저장되었습니다.")
+
+
+def _parse_grid(options):
+    """`--grid rsi_period=7,14,21` 형식을 탐색 범위에 반영"""
+    grid = dict(DEFAULT_GRID)
+    for option in options or []:
+        name, _, values = option.partition("=")
+        if name not in DEFAULT_PARAMS:
+            raise SystemExit(f"❌ 알 수 없는 파라미터: {name}")
+        cast = type(DEFAULT_PARAMS[name])
+        grid[name] = [cast(v) if cast is int else float(v) for v in values.split(",")]
+    return grid
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프로세스 풀로 자동매매 파라미터 그리드/랜덤 탐색")
+    parser.add_argument("path", help="캔들 파일 (.npy 권장, .csv는 임시 .npy로 변환)")
+    parser.add_argument("--grid", action="append", help="탐색 범위 지정 (예: --grid rsi_period=7,14,21)")
+    parser.add_argument("--random", type=int, default=None, help="그리드 대신 무작위로 뽑을 조합 수")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 상위 결과 수")
+    parser.add_argument("--csv", default=None, help="전체 결과를 저장할 CSV 경로")
+    parser.add_argument("--seed", type=int, default=0, help="무작위 탐색 시드")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = optimize(args.path, _parse_grid(args.grid), args.random, args.workers, args.seed)
+    print(f"\n🏆 파라미터 탐색 결과 (상위 {min(args.top, len(results))}개 / 전체 {len(results)}개)")
+    print(format_table(results, args.top))
+    print(f"⏱️ 소요 시간: {time.perf_counter() - started:.1f}초")
+    if args.csv:
+        save_results(args.csv, results)
@@ -0,0 +1,198 @@
+from upbit_api import get_orders, get_order, cancel_order, get_orderbook, place_order
+from fills import FillTracker, DONE_STATES
+from execution import parse_orderbook, _floor8
+from config import ORDER_POLL_BATCH, LIMIT_ORDER_TTL, LIMIT_ORDER_MAX_REPLACES, MIN_ORDER_KRW
+import metrics
+
+### ✅ 주문 수명 관리 (FillTracker 확장: 체결 저장 / 이벤트는 그대로, 조회 방식과 지정가 주문 처리만 다름)
+### - 미체결 주문을 UUID로 메모리에 보관, 조회 시각이 된 주문을 `/v1/orders/uuids`로 한 번에 조회 (최대 ORDER_POLL_BATCH개)
+### - 끝난(done / cancel) 주문만 `/v1/order`로 체결 목록을 받아 저장 → 조회 요청 = 주기당 1번 + 끝난 주문 수
+### - 지정가 주문은 ttl초가 지나면 취소, replace=True면 남은 수량을 새 최우선 호가에 다시 주문 (최대 max_replaces번)
+
+
+class OrderManager(FillTracker):
+    """미체결 주문 목록 + 일괄 상태 조회 + 오래된 지정가 주문 취소 / 재주문
+    - track(order, ttl, replace): place_order 응답을 넘기면 끝날 때까지 관리 (ttl이 없으면 체결 확인만)
+    - 재주문으로 취소된 주문의 체결 이벤트에는 "replaced_by"(새 주문 UUID)가 붙음
+    """
+
+    def __init__(self, batch_size=ORDER_POLL_BATCH, max_replaces=LIMIT_ORDER_MAX_REPLACES, **kwargs):
+        super().__init__(**kwargs)
+        self.batch_size = batch_size
+        self.max_replaces = max_replaces
+        self.open_orders = {}  # 주문 UUID → 마지막으로 확인한 상태 + 수명 정보 (만료 시각, 재주문 여부 / 횟수)
+
+    ### ✅ 1. 매매 루프 쪽 인터페이스
+    def track(self, order, ttl=None, replace=False, replaces=0):
+        """주문 응답을 미체결 목록에 추가 (지정가 주문에 ttl을 주면 ttl초 뒤 취소, replace=True면 취소 후 재주문)"""
+        uuid = order.get("uuid") if isinstance(order, dict) else None
+        if not uuid:
+            return False
+        with self._lock:
+            if uuid not in self.open_orders:  # 이미 관리 중인 주문이면 그대로 둠
+                limit = ttl is not None and order.get("ord_type") == "limit"
+                self.open_orders[uuid] = {
+                    "market": order.get("market"), "side": order.get("side"), "ord_type": order.get("ord_type"),
+                    "price": order.get("price"), "volume": order.get("volume"), "state": order.get("state"),
+                    "executed_volume": order.get("executed_volume"),
+                    "ttl": ttl if limit else None, "expires_at": self.clock() + ttl if limit else None,
+                    "replace": replace and limit, "replaces": replaces,
+                    "cancel_requested": False, "replaced_by": None,
+                }
+            metrics.set_gauge("open_orders", len(self.open_orders))
+        return super().track(order)
+
+    def open_count(self):
+        """관리 중인 미체결 주문 수"""
+        with self._lock:
+            return len(self.open_orders)
+
+    ### ✅ 2. 일괄 조회
+    def poll_once(self, now=None):
+        """조회 시각이 된 주문을 batch_size개씩 한 번에 조회하고 다음 조회까지 남은 시간(초) 반환"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            due = [uuid for uuid, entry in self.pending.items() if entry["next_poll"] <= now]
+        for start in range(0, len(due), self.batch_size):
+            self._poll_batch(due[start:start + self.batch_size], now)
+        return self._next_wait()
+
+    def _poll_batch(self, uuids, now):
+        orders = get_orders(uuids)
+        found = {order["uuid"]: order for order in orders or []}
+        for uuid in uuids:
+            order = found.get(uuid)
+            if order is None:
+                self._backoff(uuid)  # 조회 실패 / 아직 보이지 않는 주문
+                continue
+            if order.get("state") in DONE_STATES:
+                self._finish(uuid)
+                continue
+
+            with self._lock:
+                info = self.open_orders.get(uuid)
+                if info is not None:
+                    info.update(state=order.get("state"), executed_volume=order.get("executed_volume"))
+            if info is None or info["expires_at"] is None:
+                self._backoff(uuid)
+            elif info["cancel_requested"]:
+                self._backoff(uuid)  # 취소 확인 대기
+            elif now >= info["expires_at"]:
+                self._expire(uuid, info)
+            else:
+                self._backoff(uuid, until=info["expires_at"])  # ✅ 만료 시각을 넘겨 조회하지 않음
+
+    def _finish(self, uuid):
+        """끝난 주문: 체결 목록을 받아 저장 (재주문 대상이면 새 주문을 먼저 낸 뒤 이벤트에 표시)"""
+        order = get_order(uuid)  # 체결 목록 trades는 개별 조회에만 있음
+        if order is None or order.get("state") not in DONE_STATES:
+            self._backoff(uuid)
+            return
+        with self._lock:
+            info = self.open_orders.get(uuid)
+        extra = {}
+        if info is not None and info["cancel_requested"] and info["replace"]:
+            if info["replaced_by"] is None:  # 저장 실패로 다시 들어와도 재주문은 한 번만
+                replacement = self._replace(order, info)
+                info["replaced_by"] = replacement["uuid"] if replacement else ""
+            if info["replaced_by"]:
+                extra["replaced_by"] = info["replaced_by"]
+        if self._settle(order, **extra):
+            with self._lock:
+                self.open_orders.pop(uuid, None)
+                metrics.set_gauge("open_orders", len(self.open_orders))
+
+    ### ✅ 3. 만료 / 재주문
+    def _expire(self, uuid, info):
+        """대기 시간이 지난 지정가 주문 취소 요청 (취소 결과는 다음 일괄 조회에서 확인)"""
+        replace = info["replace"] and info["replaces"] < self.max_replaces
+        if cancel_order(uuid) is None:
+            self._backoff(uuid)  # 그 사이 체결됐거나 요청 실패 → 다음 조회에서 상태 확인
+            return
+        with self._lock:
+            info["cancel_requested"] = True
+            info["replace"] = replace
+            entry = self.pending.get(uuid)
+            if entry is not None:  # ✅ 취소 결과는 빨리 확인 (재주문이 늦어지지 않게)
+                entry["interval"] = self.poll_interval
+                entry["next_poll"] = self.clock() + self.poll_interval
+        metrics.inc("orders_cancelled_total", reason="replace" if replace else "expire")
+        print(f"⏰ {info['market']} 지정가 주문 {info['ttl']}초 미체결 → 취소{' 후 재주문' if replace else ''}")
+
+    def _replace(self, order, info):
+        """취소된 주문의 남은 수량을 새 최우선 호가에 다시 주문 (매수는 남은 금액 기준), 실패하면 None"""
+        market, side = order["market"], order["side"]
+        remaining = float(order.get("remaining_volume") or 0)
+        price = self._best_price(market, side)
+        if price is None or remaining <= 0:
+            return None
+        volume = _floor8(remaining * float(order["price"]) / price) if side == "bid" else remaining
+        if volume * price < MIN_ORDER_KRW:
+            print(f"⚠️ {market} 남은 수량이 최소 주문 금액보다 작아 재주문하지 않습니다.")
+            return None
+
+        replacement = place_order(side=side, price=price, volume=volume, market=market)
+        if replacement is None or not replacement.get("uuid"):
+            return None
+        replaces = info["replaces"] + 1
+        self.track(replacement, ttl=info["ttl"], replace=True, replaces=replaces)
+        metrics.inc("orders_replaced_total")
+        print(f"🔁 {market} 지정가 재주문 {replaces}/{self.max_replaces}: {price:,.0f} KRW × {volume:.8f}")
+        return replacement
+
+    @staticmethod
+    def _best_price(market, side):
+        """같은 쪽 최우선 호가 (매수는 최우선 매수 호가, 매도는 최우선 매도 호가 → 바로 체결되지 않고 대기)"""
+        books = get_orderbook(market)
+        if not books:
+            return None
+        asks, bids = parse_orderbook(books[0])
+        levels = bids if side == "bid" else asks
+        return levels[0][0] if levels else None
+
+
+def simulate(orders=3, ttl=LIMIT_ORDER_TTL, market="KRW-BTC"):
+    """모의 거래소에서 지정가 매수 orders개를 관리 (캔들 저가보다 1% 아래 → 만료 → 최우선 호가로 재주문 → 체결)
+    후 이벤트 / 요청 수 출력, 체결 이벤트 목록 반환 (모의 체결은 임시 DB에만 저장)"""
+    import os
+    import tempfile
+    import time
+    import upbit_api
+    from execution import round_to_tick
+    from simulator import SimulatedExchange
+    from storage import init_storage, use_storage
+
+    # ✅ 분 시작부터 → 캔들이 바뀌는 시점이 실행할 때마다 같음
+    exchange = SimulatedExchange(manual=True, latency=0, initial_krw=orders * 1_000_000,
+                                 start_time=time.time() // 60 * 60)
+    previous = upbit_api.use_client(exchange)
+    previous_db = use_storage(os.path.join(tempfile.mkdtemp(), "simulate.db"))
+    init_storage()
+    events = []
+    try:
+        manager = OrderManager(poll_interval=1, max_interval=ttl, clock=exchange.now)
+        low = upbit_api.get_ohlcv(market, count=1)[0]["low_price"]
+        price = round_to_tick(low * 0.99, "ask")  # ✅ 저가 아래 → ttl 동안 체결되지 않고 대기
+        for _ in range(orders):
+            order = place_order(side="bid", price=price, volume=_floor8(900_000 / price), market=market)
+            manager.track(order, ttl=ttl, replace=True)
+
+        steps = 0
+        while manager.open_count() and steps < 10_000:
+            exchange.advance(max(1.0, manager.poll_once() or 0.0))
+            steps += 1
+        events = manager.pop_events()
+    finally:
+        upbit_api.use_client(previous)
+        use_storage(previous_db)
+
+    for event in events:
+        replaced = f" → {event['replaced_by'][:8]}" if event.get("replaced_by") else ""
+        print(f"{event['uuid'][:8]} {event['state']}: {event['volume']:.8f} @ {event['avg_price']:,.0f}{replaced}")
+    for endpoint, stats in sorted(exchange.stats.items()):
+        print(f"{endpoint}: {stats['requests']}회")
+    return events
+
+
+if __name__ == "__main__":
+    simulate()
@@ -0,0 +1,167 @@
+import threading
+import time
+from config import RATE_LIMITS
+
+# ✅ 요청 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_ORDER = 0  # 주문 접수/취소
+PRIORITY_EXCHANGE = 1  # 계좌·주문 조회 등 인증 API
+PRIORITY_QUOTATION = 2  # 시세 조회
+
+# ✅ 업비트 `Remaining-Req` 헤더를 받기 전까지 사용할 기본 그룹 (응답 헤더를 보고 자동으로 갱신)
+QUOTATION_GROUPS = {
+    "/v1/market/all": "market",
+    "/v1/candles": "candle",
+    "/v1/trades/ticks": "crix-trade",
+    "/v1/ticker": "ticker",
+    "/v1/orderbook": "orderbook",
+}
+
+
+def parse_remaining_req(header):
+    """`group=default; min=1799; sec=29` → ("default", 29)"""
+    fields = {}
+    for part in header.split(";"):
+        key, _, value = part.strip().partition("=")
+        fields[key] = value
+    try:
+        return fields["group"], int(fields["sec"])
+    except (KeyError, ValueError):
+        return None, None
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "blocked_until")
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # 429 응답 후 잠시 요청 중단
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, now):
+        """토큰을 하나 쓰면 0, 부족하면 기다려야 할 시간(초) 반환"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def sync(self, remaining, now):
+        """서버가 알려준 이번 초의 남은 요청 수에 맞춤 (서버 쪽이 더 적으면 그쪽을 따름)"""
+        self._refill(now)
+        self.tokens = min(self.tokens, float(remaining))
+
+    def block(self, seconds, now):
+        self.tokens = 0.0
+        self.updated = now
+        self.blocked_until = now + seconds
+
+
+class RequestScheduler:
+    """그룹별(시세 / 거래소 / 주문) 토큰 버킷으로 요청 속도를 맞추고, 주문 요청을 시세 조회보다 먼저 처리"""
+
+    def __init__(self, limits=RATE_LIMITS, throttle_pause=1.0):
+        self.limits = dict(limits)
+        self.throttle_pause = throttle_pause  # 429 응답 시 해당 그룹을 쉬는 시간(초)
+        self._cond = threading.Condition()
+        self._buckets = {}
+        self._waiting = [0, 0, 0]  # 우선순위별 대기 중인 요청 수
+        self._learned_groups = {}  # 엔드포인트 → 헤더로 확인한 그룹
+        self.stats = {}  # 엔드포인트별 카운터
+
+    ### ✅ 1. 그룹 / 우선순위 결정
+    def classify(self, method, path):
+        """(그룹, 우선순위) 반환"""
+        endpoint = f"{method} {path}"
+        if path.startswith("/v1/order") and method in ("POST", "DELETE"):
+            priority = PRIORITY_ORDER
+        elif any(path.startswith(prefix) for prefix in QUOTATION_GROUPS):
+            priority = PRIORITY_QUOTATION
+        else:
+            priority = PRIORITY_EXCHANGE
+
+        group = self._learned_groups.get(endpoint)
+        if group is None:
+            if method == "POST" and path == "/v1/orders":
+                group = "order"
+            else:
+                group = next((g for prefix, g in QUOTATION_GROUPS.items() if path.startswith(prefix)), "default")
+        return group, priority
+
+    def _bucket(self, group):
+        bucket = self._buckets.get(group)
+        if bucket is None:
+            bucket = self._buckets[group] = TokenBucket(self.limits.get(group, self.limits["default"]))
+        return bucket
+
+    ### ✅ 2. 요청 전 / 후
+    def acquire(self, method, path):
+        """보낼 수 있을 때까지 대기 (더 높은 우선순위 요청이 기다리는 중이면 양보), 대기 시간(초) 반환"""
+        group, priority = self.classify(method, path)
+        start = time.monotonic()
+
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    if any(self._waiting[:priority]):
+                        wait = 0.05  # 주문 요청이 먼저 나갈 때까지 양보
+                    else:
+                        wait = self._bucket(group).try_acquire(now)
+                        if wait == 0:
+                            break
+                    self._cond.wait(wait)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+        waited = time.monotonic() - start
+        stats = self._stats(f"{method} {path}")
+        if waited > 0.001:
+            stats["delayed"] += 1
+            stats["wait_time"] += waited
+        return waited
+
+    def record(self, method, path, response):
+        """응답의 `Remaining-Req` 헤더와 상태 코드 반영 (response가 None이면 네트워크 오류)"""
+        endpoint = f"{method} {path}"
+        stats = self._stats(endpoint)
+        stats["requests"] += 1
+
+        if response is None:
+            stats["errors"] += 1
+            return
+        stats["status"][response.status_code] = stats["status"].get(response.status_code, 0) + 1
+
+        now = time.monotonic()
+        with self._cond:
+            header = response.headers.get("Remaining-Req")
+            group, remaining = parse_remaining_req(header) if header else (None, None)
+            if group is not None:
+                self._learned_groups[endpoint] = group
+                self._bucket(group).sync(remaining, now)
+            else:
+                group, _ = self.classify(method, path)
+
+            if response.status_code == 429:
+                stats["throttled"] += 1
+                self._bucket(group).block(self.throttle_pause, now)
+                print(f"⚠️ 요청 제한 초과 ({endpoint}, 그룹 {group}) → {self.throttle_pause}초 대기")
+
+    def _stats(self, endpoint):
+        stats = self.stats.get(endpoint)
+        if stats is None:
+            stats = self.stats.setdefault(endpoint, {
+                "requests": 0, "errors": 0, "throttled": 0, "delayed": 0, "wait_time": 0.0, "status": {},
+            })
+        return stats
@@ -0,0 +1,45 @@
+from config import MIN_ORDER_KRW
+
+# ✅ 자동매매 규칙의 기본 파라미터 (실거래 / 백테스트 / 파라미터 탐색이 모두 같은 값을 사용)
+DEFAULT_PARAMS = {
+    "rsi_period": 14,  # RSI 기간
+    "short_window": 5,  # 단기 이동평균
+    "long_window": 20,  # 장기 이동평균
+    "breakout_k": 0.5,  # 변동성 돌파 계수
+    "rsi_buy": 30,  # RSI 과매도 기준
+    "rsi_sell": 70,  # RSI 과매수 기준
+    "take_profit": 0.01,  # 1% 상승 시 매도
+    "min_profit": 0.005,  # 최소 0.5% 이상 올라야 매도
+    "cooldown": 300,  # 매수/매도 후 추가 거래 제한 (초)
+    "buy_percent": 90,  # 매수 시 사용할 원화 비율
+    "sell_percent": 100,  # 매도 시 팔 코인 비율
+}
+
+
+def buy_signal(rsi, short_ma, long_ma, now, last_buy_time, coin_balance, krw_balance, params=DEFAULT_PARAMS):
+    """매수 조건을 만족하면 사유 문자열, 아니면 None (NaN 지표는 조건 불만족)"""
+    if not (rsi < params["rsi_buy"] or short_ma > long_ma):
+        return None
+    if now - last_buy_time <= params["cooldown"] or coin_balance != 0 or krw_balance <= MIN_ORDER_KRW:
+        return None
+    return "RSI 과매도 감지" if rsi < params["rsi_buy"] else "골든크로스 감지"
+
+
+def sell_signal(price, rsi, breakout_price, last_buy_price, now, last_sell_time, coin_balance, params=DEFAULT_PARAMS):
+    """매도 조건을 만족하면 사유 문자열, 아니면 None"""
+    take_profit_price = last_buy_price * (1 + params["take_profit"])
+    min_profit_price = last_buy_price * (1 + params["min_profit"])
+    if not (rsi > params["rsi_sell"] or price > breakout_price or price > take_profit_price):
+        return None
+    if not (price > min_profit_price or price > take_profit_price):
+        return None
+    if now - last_sell_time <= params["cooldown"] or coin_balance <= 0:
+        return None
+
+    if rsi > params["rsi_sell"]:
+        return "RSI 과매수 감지"
+    elif price > breakout_price:
+        return "변동성 돌파 초과 감지"
+    elif price > take_profit_price:
+        return f"{params['take_profit'] * 100:g}% 상승 감지 (매도 실행)"
+    return f"{params['min_profit'] * 100:g}% 상승 감지 (매도 실행)"
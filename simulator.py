@@ -0,0 +1,525 @@
+import datetime
+import math
+import threading
+import time
+import uuid as uuid_lib
+import numpy as np
+from candles import CANDLE_DTYPE, load_candles
+from config import (
+    MARKET, MARKETS, MIN_ORDER_KRW, FEE_RATE,
+    PAPER_INITIAL_KRW, PAPER_DATA, PAPER_LATENCY, PAPER_BOOK_DEPTH, PAPER_SPREAD,
+)
+
+HISTORY_BARS = 200  # 시작 시점 이전에 남겨 둘 캔들 수 (지표 초기화용)
+
+
+def synthetic_candles(bars=100_000, start_price=100_000_000.0, volatility=0.001, seed=0, start=0):
+    """기하 브라운 운동으로 만든 1분봉 배열 (timestamp는 start부터 60초 간격)"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, volatility, (bars, 4))
+    close = start_price * np.exp(np.cumsum(returns[:, 0]))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    wick = np.abs(returns[:, 1:3]) * close[:, None]
+    array = np.empty(bars, dtype=CANDLE_DTYPE)
+    array["timestamp"] = start + np.arange(bars, dtype=np.int64) * 60
+    array["open"] = open_
+    array["close"] = close
+    array["high"] = np.maximum(open_, close) + wick[:, 0]
+    array["low"] = np.minimum(open_, close) - wick[:, 1]
+    array["volume"] = np.abs(returns[:, 3]) * 1000
+    return array
+
+
+def _iso(ts, kst=False):
+    """epoch 초 → 업비트 응답의 시각 문자열 (UTC 또는 KST)"""
+    moment = datetime.datetime.fromtimestamp(ts + (9 * 3600 if kst else 0), datetime.timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class SimulatedExchange:
+    """`UpbitClient`와 같은 메서드를 가진 로컬 거래소 (계좌 / 시세 / 캔들 / 체결 / 주문 / 주문 조회)
+    - 시세: 녹화된 캔들 파일 또는 합성 캔들, 시작 분을 현재 시각에 맞춰 재생
+    - 시장가 주문: 가상 호가창을 차례로 먹으며 체결 (주문 금액이 클수록 슬리피지 증가), 수수료 / 최소 주문 금액 반영
+    - 지연: 실시간 모드는 요청마다 latency초 대기, 수동 시계 모드(manual=True)는 대기 없이 advance()로 시간을 넘기고
+      주문은 latency초가 지난 뒤 체결 완료로 보임 → 초당 수천 틱의 오프라인 부하 / 통합 테스트용
+    """
+
+    def __init__(self, candles=None, initial_krw=PAPER_INITIAL_KRW, fee_rate=FEE_RATE, latency=PAPER_LATENCY,
+                 book_depth=PAPER_BOOK_DEPTH, spread=PAPER_SPREAD, levels=20, manual=False, start_time=None):
+        if candles is None:
+            candles = {market: synthetic_candles(seed=i) for i, market in enumerate(MARKETS)}
+        self.fee_rate = fee_rate
+        self.latency = latency
+        self.book_depth = book_depth
+        self.spread = spread
+        self.levels = levels
+        self.manual = manual
+        self._lock = threading.RLock()
+
+        # ✅ 시작 분이 현재 시각(또는 start_time)이 되도록 캔들 시각을 옮김 (시작 전 HISTORY_BARS개는 과거로 보임)
+        now = time.time() if start_time is None else start_time
+        self._now = now
+        self.data = {}
+        for market, array in candles.items():
+            array = np.asarray(array)
+            offset = int(now // 60 * 60) - int(array["timestamp"][min(HISTORY_BARS, len(array) - 1)])
+            self.data[market] = {
+                "timestamp": array["timestamp"].astype(np.int64) + offset,
+                **{name: np.ascontiguousarray(array[name], dtype=np.float64)
+                   for name in ("open", "high", "low", "close", "volume")},
+            }
+
+        self.balances = {"KRW": float(initial_krw)}
+        self.locked = {}
+        self.avg_buy_price = {}
+        self.orders = {}  # uuid → 주문 (업비트 주문 조회 응답 형태)
+        self._open_limits = []  # 미체결 지정가 주문 uuid
+        self.stats = {}  # 엔드포인트별 요청 수 (get_request_stats와 같은 형태)
+
+    @classmethod
+    def from_config(cls, **kwargs):
+        """설정(PAPER_DATA)의 캔들 파일로 생성, 지정되지 않은 마켓은 합성 캔들"""
+        candles = {
+            market: load_candles(PAPER_DATA[market]) if market in PAPER_DATA else synthetic_candles(seed=i)
+            for i, market in enumerate(MARKETS)
+        }
+        return cls(candles, **kwargs)
+
+    ### ✅ 1. 시계 / 시세
+    def now(self):
+        return self._now if self.manual else time.time()
+
+    def advance(self, seconds):
+        """수동 시계를 seconds초 넘기고 지정가 주문 체결 확인"""
+        with self._lock:
+            self._now += seconds
+            self._match_limits()
+
+    def _request(self, endpoint):
+        stats = self.stats.get(endpoint)
+        if stats is None:
+            stats = self.stats[endpoint] = {"requests": 0, "errors": 0, "throttled": 0, "delayed": 0,
+                                            "wait_time": 0.0, "status": {}}
+        stats["requests"] += 1
+        if not self.manual and self.latency:
+            time.sleep(self.latency)  # ✅ 네트워크 왕복 시간
+
+    def _index(self, market, now=None):
+        """now 시점의 캔들 위치 (데이터가 끝나면 마지막 캔들에 고정)"""
+        timestamps = self.data[market]["timestamp"]
+        i = int(np.searchsorted(timestamps, self.now() if now is None else now, side="right")) - 1
+        return min(max(i, 0), len(timestamps) - 1)
+
+    def _price(self, market):
+        data = self.data[market]
+        return float(data["close"][self._index(market)])
+
+    def _book(self, market, side):
+        """시장가 주문이 먹을 호가 [(가격, 잔량)] (매수는 매도 호가, 매도는 매수 호가 쪽)"""
+        mid = self._price(market)
+        sign = 1 if side == "bid" else -1
+        prices = mid * (1 + sign * self.spread * (np.arange(self.levels) + 0.5))
+        volumes = self.book_depth * (1 + np.arange(self.levels) * 0.5) / prices  # 멀수록 잔량이 많음
+        return prices, volumes
+
+    ### ✅ 2. 조회 (UpbitClient와 같은 반환 형태)
+    def auth_headers(self, query=None):
+        return {"Authorization": "Bearer paper"}
+
+    def get_balance(self, currency=None):
+        self._request("GET /v1/accounts")
+        with self._lock:
+            if currency:
+                return self.balances.get(currency, 0)
+            return [
+                {"currency": c, "balance": f"{balance:.8f}", "locked": f"{self.locked.get(c, 0.0):.8f}",
+                 "avg_buy_price": str(self.avg_buy_price.get(c, 0)), "avg_buy_price_modified": False,
+                 "unit_currency": "KRW"}
+                for c, balance in self.balances.items()
+            ]
+
+    def get_market_price(self, market=None):
+        self._request("GET /v1/ticker")
+        market = market or MARKET
+        return self._price(market) if market in self.data else 0
+
+    def get_market_prices(self, markets):
+        if not markets:
+            return {}
+        self._request("GET /v1/ticker")
+        if any(market not in self.data for market in markets):
+            print(f"⚠️ 시세 일괄 조회 실패 ({len(markets)}개 마켓): 알 수 없는 마켓")
+            return {}
+        return {market: self._price(market) for market in markets}
+
+    def get_markets(self):
+        self._request("GET /v1/market/all")
+        return list(self.data)
+
+    def get_ohlcv(self, market, count=200, to=None, unit=1):
+        """to 이전(없으면 현재 진행 중인 캔들까지) count개, 최신순 (진행 중인 캔들은 그 분의 최종 값)"""
+        self._request(f"GET /v1/candles/minutes/{unit}")
+        if market not in self.data:
+            return None
+        data = self.data[market]
+        if to is not None:
+            end_time = datetime.datetime.strptime(to.rstrip("Z"), "%Y-%m-%dT%H:%M:%S").replace(
+                tzinfo=datetime.timezone.utc).timestamp()
+            end = min(int(np.searchsorted(data["timestamp"], end_time, side="left")), self._index(market) + 1)
+        else:
+            end = self._index(market) + 1
+
+        # ✅ unit분봉은 1분봉을 unit개씩 묶어 만듦
+        start = max(0, end - count * unit)
+        ts = data["timestamp"][start:end]
+        groups = np.flatnonzero(np.diff(ts // (unit * 60), prepend=-1))
+        candles = []
+        for g, first in enumerate(groups):
+            last = (groups[g + 1] if g + 1 < len(groups) else len(ts)) - 1
+            a, b = start + first, start + last + 1
+            bucket = int(ts[first] // (unit * 60) * unit * 60)
+            volume = float(data["volume"][a:b].sum())
+            candles.append({
+                "market": market,
+                "candle_date_time_utc": _iso(bucket),
+                "candle_date_time_kst": _iso(bucket, kst=True),
+                "opening_price": float(data["open"][a]),
+                "high_price": float(data["high"][a:b].max()),
+                "low_price": float(data["low"][a:b].min()),
+                "trade_price": float(data["close"][b - 1]),
+                "timestamp": int(ts[last]) * 1000,
+                "candle_acc_trade_price": float((data["close"][a:b] * data["volume"][a:b]).sum()),
+                "candle_acc_trade_volume": volume,
+                "unit": unit,
+            })
+        return candles[::-1][:count]
+
+    def get_trade_history(self, market="KRW-BTC", count=200, cursor=None):
+        """캔들 1개 = 체결 1건으로 만든 공개 체결 목록 (sequential_id = 캔들 시각 ms), 최신순"""
+        self._request("GET /v1/trades/ticks")
+        if market not in self.data:
+            return None
+        data = self.data[market]
+        end = self._index(market) + 1
+        if cursor is not None:
+            end = min(end, int(np.searchsorted(data["timestamp"] * 1000, int(cursor), side="left")))
+        start = max(0, end - count)
+        return [
+            {
+                "market": market,
+                "trade_date_utc": _iso(int(data["timestamp"][i]))[:10],
+                "trade_time_utc": _iso(int(data["timestamp"][i]))[11:],
+                "timestamp": int(data["timestamp"][i]) * 1000,
+                "trade_price": float(data["close"][i]),
+                "trade_volume": float(data["volume"][i]),
+                "ask_bid": "BID" if data["close"][i] >= data["open"][i] else "ASK",
+                "sequential_id": int(data["timestamp"][i]) * 1000,
+            }
+            for i in range(end - 1, start - 1, -1)
+        ]
+
+    def get_orderbook(self, markets):
+        """가상 호가창 (업비트 `/v1/orderbook` 응답 형태, 매수 / 매도 호가 levels단계)"""
+        self._request("GET /v1/orderbook")
+        if isinstance(markets, str):
+            markets = [markets]
+        result = []
+        with self._lock:
+            for market in markets:
+                if market not in self.data:
+                    continue
+                ask_prices, ask_sizes = self._book(market, "bid")  # 매수 주문이 먹는 쪽 = 매도 호가
+                bid_prices, bid_sizes = self._book(market, "ask")
+                result.append({
+                    "market": market,
+                    "timestamp": int(self.now() * 1000),
+                    "total_ask_size": float(ask_sizes.sum()),
+                    "total_bid_size": float(bid_sizes.sum()),
+                    "orderbook_units": [
+                        {"ask_price": a, "bid_price": b, "ask_size": a_size, "bid_size": b_size}
+                        for a, b, a_size, b_size in zip(
+                            ask_prices.tolist(), bid_prices.tolist(), ask_sizes.tolist(), bid_sizes.tolist()
+                        )
+                    ],
+                })
+        return result
+
+    ### ✅ 3. 주문
+    def place_order(self, side="bid", price=None, volume=None, market=MARKET, time_in_force=None):
+        """UpbitClient.place_order와 같은 규칙 (시장가 매수는 price=금액, 시장가 매도는 volume, 둘 다 있으면 지정가)
+        - time_in_force="ioc": 지정가까지의 호가만 즉시 체결하고 남은 수량은 취소
+        """
+        self._request("POST /v1/orders")
+        if market not in self.data:
+            return self._reject(404, "market_does_not_exist", "마켓이 존재하지 않습니다.")
+        price = float(price) if price else None
+        volume = float(volume) if volume else None
+        if side == "bid" and price and volume is None:
+            ord_type = "price"
+        elif side == "ask" and volume and price is None:
+            ord_type = "market"
+        elif price and volume:
+            ord_type = "limit"
+        else:
+            print(f"⚠️ 잘못된 {'매수' if side == 'bid' else '매도'} 주문 (price 또는 volume 확인 필요)")
+            return None
+
+        with self._lock:
+            coin = market.split("-")[1]
+            total = price * volume if ord_type == "limit" else (price if ord_type == "price" else None)
+            if total is None:
+                total = volume * self._price(market)
+            if total < MIN_ORDER_KRW:
+                return self._reject(400, f"under_min_total_{side}", f"최소주문금액 이상으로 주문해주세요. ({MIN_ORDER_KRW} KRW)")
+
+            # ✅ 주문 가능 잔고 확인 후 잠금 (매수는 수수료까지)
+            if side == "bid":
+                need = total * (1 + self.fee_rate)
+                if self.balances.get("KRW", 0) + 1e-9 < need:
+                    return self._reject(400, "insufficient_funds_bid", "주문가능한 금액(KRW)이 부족합니다.")
+                self._move("KRW", need)
+            else:
+                if self.balances.get(coin, 0) + 1e-12 < volume:
+                    return self._reject(400, "insufficient_funds_ask", f"주문가능한 금액({coin})이 부족합니다.")
+                self._move(coin, volume)
+
+            order_uuid = str(uuid_lib.uuid4())
+            created = self.now()
+            order = {
+                "uuid": order_uuid, "side": side, "ord_type": ord_type,
+                "price": None if ord_type == "market" else str(price),
+                "state": "wait", "market": market, "created_at": _iso(created) + "+00:00",
+                "volume": None if ord_type == "price" else str(volume),
+                "remaining_volume": None if ord_type == "price" else str(volume),
+                "reserved_fee": str(total * self.fee_rate if side == "bid" else 0.0),
+                "remaining_fee": str(total * self.fee_rate if side == "bid" else 0.0),
+                "paid_fee": "0", "locked": str(need if side == "bid" else volume),
+                "executed_volume": "0", "trades_count": 0, "trades": [],
+                "_visible_at": created + self.latency,  # 이 시각 이후 조회하면 체결 결과가 보임
+            }
+            self.orders[order_uuid] = order
+            if ord_type == "limit" and time_in_force in ("ioc", "fok"):
+                self._fill_ioc(order, time_in_force == "fok")
+            elif ord_type == "limit":
+                self._open_limits.append(order_uuid)
+                self._match_limits()
+            else:
+                self._fill_market(order)
+            print(f"✅ [모의] 주문 완료: {market} {side} {ord_type}")
+            return self._public(order)
+
+    def get_order(self, uuid):
+        self._request("GET /v1/order")
+        with self._lock:
+            self._match_limits()
+            order = self.orders.get(uuid)
+            if order is None:
+                print(f"⚠️ 주문 조회 실패 ({uuid}): order_not_found")
+                return None
+            return self._view(order)
+
+    def get_orders(self, uuids):
+        """여러 주문 상태를 한 번에 조회 (`/v1/orders/uuids`와 같이 체결 목록 trades 없음, 없는 UUID는 빠짐)"""
+        self._request("GET /v1/orders/uuids")
+        with self._lock:
+            self._match_limits()
+            result = []
+            for uuid in uuids:
+                order = self.orders.get(uuid)
+                if order is not None:
+                    view = self._view(order)
+                    view.pop("trades", None)
+                    result.append(view)
+            return result
+
+    def _view(self, order):
+        if self.now() < order["_visible_at"]:
+            # ✅ 아직 체결 결과가 도착하지 않은 것처럼 대기 상태로 보여 줌
+            return self._public(dict(order, state="wait", trades=[], trades_count=0, executed_volume="0"))
+        return self._public(order)
+
+    def cancel_order(self, uuid):
+        """미체결 지정가 주문 취소 (잠긴 잔고 반환)"""
+        self._request("DELETE /v1/order")
+        with self._lock:
+            order = self.orders.get(uuid)
+            if order is None or order["state"] != "wait":
+                print(f"⚠️ 주문 취소 실패 ({uuid}): order_not_found")
+                return None
+            self._open_limits.remove(uuid)
+            coin = order["market"].split("-")[1]
+            if order["side"] == "bid":
+                self._move("KRW", -float(order["locked"]))
+            else:
+                self._move(coin, -float(order["remaining_volume"]))
+            order["state"] = "cancel"
+            return self._public(order)
+
+    ### ✅ 4. 체결 처리
+    def _reject(self, status_code, name, message):
+        """UpbitClient.place_order와 같은 실패 출력 (업비트 오류 본문 형태) 후 None"""
+        print(f'⚠️ 주문 실패: {status_code}, {{"error":{{"name":"{name}","message":"{message}"}}}}')
+        return None
+
+    def _move(self, currency, amount):
+        """잔고 → 잠금 (amount가 음수면 잠금 → 잔고)"""
+        self.balances[currency] = self.balances.get(currency, 0.0) - amount
+        self.locked[currency] = self.locked.get(currency, 0.0) + amount
+
+    def _fill_market(self, order):
+        """가상 호가를 가까운 단계부터 먹으며 체결 (매수는 금액, 매도는 수량 기준)"""
+        market, side = order["market"], order["side"]
+        prices, volumes = self._book(market, side)
+        remaining = float(order["price"]) if side == "bid" else float(order["volume"])
+        fills = []
+        for level_price, level_volume in zip(prices.tolist(), volumes.tolist()):
+            if remaining <= 1e-12:
+                break
+            if side == "bid":
+                funds = min(remaining, level_price * level_volume)
+                filled = math.floor(funds / level_price * 1e8) / 1e8  # 업비트 수량 단위 (소수점 8자리)
+                if filled <= 0:
+                    break
+                fills.append((level_price, filled))
+                remaining -= level_price * filled
+            else:
+                filled = min(remaining, level_volume)
+                fills.append((level_price, filled))
+                remaining -= filled
+        self._settle(order, fills)
+
+    def _fill_ioc(self, order, all_or_none=False):
+        """지정가 IOC / FOK: 지정가보다 유리한 호가만 즉시 체결, 남은 수량은 취소 (FOK는 전량이 아니면 전부 취소)"""
+        side, limit = order["side"], float(order["price"])
+        prices, volumes = self._book(order["market"], side)
+        remaining = float(order["volume"])
+        fills = []
+        for level_price, level_volume in zip(prices.tolist(), volumes.tolist()):
+            if remaining <= 1e-12 or (level_price > limit if side == "bid" else level_price < limit):
+                break
+            filled = math.floor(min(remaining, level_volume) * 1e8) / 1e8
+            fills.append((level_price, filled))
+            remaining -= filled
+        if all_or_none and remaining > 1e-12:
+            fills = []
+        self._settle(order, fills)
+        if sum(volume for _, volume in fills) < float(order["volume"]) - 1e-12:
+            order.update(state="cancel", remaining_volume=f"{float(order['volume']) - float(order['executed_volume']):.8f}")
+
+    def _match_limits(self):
+        """현재 캔들의 고가/저가가 지정가에 닿은 주문을 지정가로 전량 체결"""
+        for order_uuid in list(self._open_limits):
+            order = self.orders[order_uuid]
+            data = self.data[order["market"]]
+            i = self._index(order["market"])
+            limit = float(order["price"])
+            if (order["side"] == "bid" and data["low"][i] <= limit) or (order["side"] == "ask" and data["high"][i] >= limit):
+                self._open_limits.remove(order_uuid)
+                self._settle(order, [(limit, float(order["volume"]))])
+
+    def _settle(self, order, fills):
+        """체결 목록을 잔고 / 주문에 반영 (수수료 = 체결 금액 × fee_rate)"""
+        market, side = order["market"], order["side"]
+        coin = market.split("-")[1]
+        funds = sum(price * volume for price, volume in fills)
+        volume = sum(v for _, v in fills)
+        fee = funds * self.fee_rate
+        locked = float(order["locked"])
+
+        if side == "bid":
+            self.locked["KRW"] -= locked
+            self.balances["KRW"] += locked - funds - fee  # 남은 금액(지정가 차액 등) 반환
+            held = self.balances.get(coin, 0.0)
+            cost = self.avg_buy_price.get(coin, 0.0) * held + funds
+            self.balances[coin] = held + volume
+            self.avg_buy_price[coin] = cost / self.balances[coin] if self.balances[coin] > 0 else 0.0
+        else:
+            self.locked[coin] -= locked
+            self.balances[coin] += locked - volume
+            self.balances["KRW"] += funds - fee
+        self.balances[coin] = round(self.balances[coin], 8) or 0.0  # 소수점 8자리 밖의 부동소수점 오차 제거
+        self.locked[coin] = round(self.locked.get(coin, 0.0), 8)
+
+        created = order["created_at"]
+        order.update({
+            "state": "done",
+            "executed_volume": f"{volume:.8f}",
+            "remaining_volume": None if order["ord_type"] == "price" else "0",
+            "paid_fee": str(fee), "remaining_fee": "0", "locked": "0",
+            "trades_count": len(fills),
+            "trades": [
+                {"market": market, "uuid": str(uuid_lib.uuid4()), "price": str(price), "volume": f"{v:.8f}",
+                 "funds": str(price * v), "side": side, "created_at": created}
+                for price, v in fills
+            ],
+        })
+
+    @staticmethod
+    def _public(order):
+        return {key: value for key, value in order.items() if not key.startswith("_")}
+
+
+def benchmark_ticks(ticks=10_000, markets=("KRW-BTC", "KRW-ETH")):
+    """수동 시계로 자동매매 틱(시세 / 계좌 조회 + 지표 + 전략 판단 + 주문)을 돌려 초당 틱 수 측정"""
+    import upbit_api
+    from account import get_balance, invalidate_accounts
+    from indicators import IndicatorEngine
+    from strategy import RsiMaBreakoutStrategy
+    from trade import trade_by_percentage
+
+    exchange = SimulatedExchange(
+        {market: synthetic_candles(ticks + HISTORY_BARS + 10, seed=i) for i, market in enumerate(markets)},
+        manual=True,
+    )
+    previous = upbit_api.use_client(exchange)
+    strategy = RsiMaBreakoutStrategy({"cooldown": 0})
+    engines = {market: IndicatorEngine(market) for market in markets}
+    for engine in engines.values():
+        engine.seed(upbit_api.get_ohlcv(engine.market, 200))
+    state = {market: {"last_buy_time": 0, "last_sell_time": 0, "last_buy_price": 0} for market in markets}
+    orders = 0
+
+    started = time.perf_counter()
+    try:
+        for _ in range(ticks):
+            exchange.advance(60)
+            now = exchange.now()
+            invalidate_accounts()
+            prices = upbit_api.get_market_prices(list(markets))
+            for market, engine in engines.items():
+                for candle in reversed(upbit_api.get_ohlcv(market, 2)):
+                    engine.update(candle)
+                coin_balance = get_balance(market.split("-")[1]) or 0
+                context = {"price": prices[market], "now": now, "coin_balance": coin_balance,
+                           "krw_balance": get_balance("KRW") or 0, **state[market]}
+                frame = engine.frame()
+                if strategy.buy(frame, context):
+                    if trade_by_percentage("bid", 50, prices[market], market) is not None:
+                        state[market].update(last_buy_time=now, last_buy_price=prices[market])
+                        orders += 1
+                elif strategy.sell(frame, context):
+                    if trade_by_percentage("ask", 100, prices[market], market) is not None:
+                        state[market]["last_sell_time"] = now
+                        orders += 1
+    finally:
+        upbit_api.use_client(previous)
+    elapsed = time.perf_counter() - started
+
+    equity = exchange.balances["KRW"] + sum(
+        exchange.balances.get(m.split("-")[1], 0.0) * exchange._price(m) for m in markets
+    )
+    print(f"""
+⏱️ **모의 거래소 부하 테스트** ⏱️
+🔁 {ticks:,}틱 × {len(markets)}개 마켓: {elapsed:.2f}초 ({ticks / elapsed:,.0f}틱/초)
+🧾 주문 {orders}건, 최종 평가 금액: {equity:,.0f} KRW (시작 {PAPER_INITIAL_KRW:,.0f} KRW)
+""")
+    return ticks / elapsed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="로컬 모의 거래소 부하 테스트 (거래소 접속 없음)")
+    parser.add_argument("--ticks", type=int, default=10_000, help="돌릴 틱 수")
+    args = parser.parse_args()
+    benchmark_ticks(args.ticks)
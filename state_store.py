@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from storage import transaction, fetch_all, fetch_one
+
+# ✅ 전략 상태 (마켓 → {항목: 값}) 메모리 캐시, 쓰기는 DB와 캐시에 함께 반영 (루프 안의 읽기는 디스크를 거치지 않음)
+_lock = threading.Lock()
+_cache = None
+SNAPSHOT_KEEP = 100  # 보관할 스냅샷 수
+
+
+def load_state():
+    """전체 전략 상태를 한 번의 조회로 캐시에 올림 (이미 올라와 있으면 캐시 반환)"""
+    global _cache
+    with _lock:
+        if _cache is None:
+            state = {}
+            for market, field, value in fetch_all("SELECT market, field, value FROM strategy_state"):
+                state.setdefault(market, {})[field] = value
+            _cache = state
+        return _cache
+
+
+def get_state(market, field, default=None):
+    """마켓의 상태 값 하나 (저장된 값이 없으면 default)"""
+    value = load_state().get(market, {}).get(field)
+    return default if value is None else value
+
+
+def get_market_state(market):
+    """마켓의 전체 상태 사본"""
+    return dict(load_state().get(market, {}))
+
+
+def set_state(market, **fields):
+    """마켓의 상태 여러 개를 UPSERT 한 트랜잭션으로 저장 (커밋 후 캐시 갱신)"""
+    if not fields:
+        return
+    now = time.time()
+    rows = [(market, field, value, now) for field, value in fields.items()]
+    state = load_state()
+    with _lock:
+        with transaction() as conn:
+            conn.executemany("""
+                INSERT INTO strategy_state (market, field, value, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(market, field) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """, rows)
+        state.setdefault(market, {}).update(fields)
+
+
+def invalidate_state():
+    """캐시 폐기 (다른 프로세스가 상태를 바꿨을 때 다음 조회에서 다시 읽음)"""
+    global _cache
+    with _lock:
+        _cache = None
+
+
+### ✅ 버전별 스냅샷 (전체 상태를 JSON 한 행으로 저장 → 재시작 / 되돌리기 시 한 번에 복원)
+def save_snapshot(reason=None):
+    """현재 전체 상태를 새 버전으로 저장하고 버전 번호 반환 (오래된 스냅샷은 SNAPSHOT_KEEP개만 남김)"""
+    state = load_state()
+    with _lock:
+        payload = json.dumps(state, ensure_ascii=False, sort_keys=True)
+        with transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO state_snapshots (created_at, reason, state) VALUES (?, ?, ?)",
+                (time.time(), reason, payload),
+            )
+            version = cursor.lastrowid
+            conn.execute("DELETE FROM state_snapshots WHERE version <= ?", (version - SNAPSHOT_KEEP,))
+    return version
+
+
+def load_snapshot(version=None):
+    """스냅샷 불러오기 (기본: 최신) → (버전, 생성 시각, 사유, 상태) 또는 None"""
+    if version is None:
+        row = fetch_one("SELECT version, created_at, reason, state FROM state_snapshots ORDER BY version DESC LIMIT 1")
+    else:
+        row = fetch_one("SELECT version, created_at, reason, state FROM state_snapshots WHERE version = ?", (version,))
+    if row is None:
+        return None
+    return row[0], row[1], row[2], json.loads(row[3])
+
+
+def restore_snapshot(version=None):
+    """스냅샷의 상태로 strategy_state 전체를 교체 (한 트랜잭션)"""
+    global _cache
+    snapshot = load_snapshot(version)
+    if snapshot is None:
+        print("⚠️ 복원할 스냅샷이 없습니다.")
+        return False
+    version, _, _, state = snapshot
+    now = time.time()
+    rows = [(market, field, value, now) for market, fields in state.items() for field, value in fields.items()]
+    with _lock:
+        with transaction() as conn:
+            conn.execute("DELETE FROM strategy_state")
+            conn.executemany(
+                "INSERT INTO strategy_state (market, field, value, updated_at) VALUES (?, ?, ?, ?)", rows
+            )
+        _cache = state
+    print(f"✅ 전략 상태를 스냅샷 v{version}으로 복원했습니다.")
+    return True
+
+
+if __name__ == "__main__":
+    for market, fields in sorted(load_state().items()):
+        print(f"📌 {market}: {fields}")
+    latest = load_snapshot()
+    if latest:
+        print(f"🗂️ 최신 스냅샷 v{latest[0]} ({time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(latest[1]))}, {latest[2]})")
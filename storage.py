@@ -0,0 +1,310 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from config import TRADING_DB, LIVE_DB, LEGACY_DBS, MARKET
+import metrics
+
+# ✅ 스레드마다 연결 1개를 계속 재사용 (sqlite3 연결은 스레드 간 공유하지 않음)
+_local = threading.local()
+_init_lock = threading.Lock()
+_db_path = TRADING_DB
+_migrated = set()  # 마이그레이션을 이미 확인한 DB 경로
+
+
+### ✅ 1. 스키마 (PRAGMA user_version = 적용된 마이그레이션 수)
+def _create_tables(conn, legacy):
+    """v1: 네 개 DB에 흩어져 있던 테이블을 하나의 DB에 생성"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            trade_time TEXT,
+            market TEXT,
+            price REAL,
+            volume REAL,
+            trade_type TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS trade_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            trade_time TEXT,
+            market TEXT,
+            trade_type TEXT,
+            price REAL,
+            volume REAL,
+            total_cost REAL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS wallet (
+            currency TEXT PRIMARY KEY,
+            balance REAL,
+            locked REAL,
+            avg_buy_price REAL,
+            avg_buy_price_modified BOOLEAN
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS trade_state (
+            market TEXT PRIMARY KEY,
+            last_buy_price REAL DEFAULT 0,
+            last_sell_time REAL DEFAULT 0
+        )
+    """)
+
+
+def _import_legacy(conn, legacy):
+    """v2: 기존 개별 DB 파일(wallet.db 등)의 데이터를 한 번만 가져오기"""
+    def has_table(alias, table):
+        return conn.execute(
+            f"SELECT 1 FROM {alias}.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone() is not None
+
+    if "transactions" in legacy and has_table("legacy_transactions", "transactions"):
+        conn.execute("""
+            INSERT INTO transactions (trade_time, market, price, volume, trade_type)
+            SELECT trade_time, market, price, volume, trade_type FROM legacy_transactions.transactions ORDER BY id
+        """)
+    if "trade_history" in legacy and has_table("legacy_trade_history", "trade_history"):
+        conn.execute("""
+            INSERT INTO trade_history (trade_time, market, trade_type, price, volume, total_cost)
+            SELECT trade_time, market, trade_type, price, volume, total_cost
+            FROM legacy_trade_history.trade_history ORDER BY id
+        """)
+    if "wallet" in legacy and has_table("legacy_wallet", "wallet"):
+        conn.execute("INSERT OR REPLACE INTO wallet SELECT * FROM legacy_wallet.wallet")
+    if "trade_state" in legacy and has_table("legacy_trade_state", "trade_state"):
+        # ✅ 단일 마켓 시절 테이블에는 market 컬럼이 없음 → 기본 마켓으로, 마켓별로 가장 최근 행만 남김
+        columns = [row[1] for row in conn.execute("PRAGMA legacy_trade_state.table_info(trade_state)")]
+        market = "COALESCE(market, ?)" if "market" in columns else "?"
+        conn.execute(f"""
+            INSERT OR REPLACE INTO trade_state (market, last_buy_price, last_sell_time)
+            SELECT {market}, COALESCE(last_buy_price, 0), COALESCE(last_sell_time, 0)
+            FROM legacy_trade_state.trade_state ORDER BY id
+        """, (MARKET,))
+
+
+def _create_strategy_state(conn, legacy):
+    """v3: trade_state(마켓별 한 행) → strategy_state(마켓, 항목) 키-값 테이블 + 버전별 스냅샷"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS strategy_state (
+            market TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value,
+            updated_at REAL,
+            PRIMARY KEY (market, field)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS state_snapshots (
+            version INTEGER PRIMARY KEY,
+            created_at REAL,
+            reason TEXT,
+            state TEXT
+        )
+    """)
+    for field in ("last_buy_price", "last_sell_time"):
+        conn.execute(f"""
+            INSERT OR REPLACE INTO strategy_state (market, field, value, updated_at)
+            SELECT market, '{field}', {field}, CAST(strftime('%s', 'now') AS REAL) FROM trade_state
+        """)
+    conn.execute("DROP TABLE trade_state")
+
+
+def _replay_positions(rows):
+    """v4 시점의 평균 단가 계산 사본 (마이그레이션은 ledger가 바뀌어도 같은 결과를 내야 하므로 가져다 쓰지 않음)
+    (마켓, 매매구분, 가격, 수량, 수수료) 행 → {마켓: (수량, 원가, 실현 손익, 수수료, 매수 금액, 매도 금액)}
+    """
+    positions = {}
+    for market, side, price, volume, fee in rows:
+        price, volume, fee = price or 0.0, volume or 0.0, fee or 0.0
+        held, cost, realized, fees, bought, sold = positions.get(market, (0.0,) * 6)
+        amount = price * volume
+        fees += fee
+        if side == "bid":
+            held += volume
+            cost += amount + fee
+            bought += amount
+        else:
+            cost_out = cost * min(volume / held, 1.0) if held > 0 else 0.0
+            realized += amount - fee - cost_out
+            cost -= cost_out
+            held -= volume
+            sold += amount
+            if held <= 1e-12:
+                held = cost = 0.0
+        positions[market] = (held, cost, realized, fees, bought, sold)
+    return positions
+
+
+def _create_positions(conn, legacy):
+    """v4: 마켓별 포지션 요약 테이블 + trade_history (market, trade_type) 인덱스 + 수수료 컬럼"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(trade_history)")]
+    if "fee" not in columns:
+        conn.execute("ALTER TABLE trade_history ADD COLUMN fee REAL DEFAULT 0")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_trade_history_market_type ON trade_history (market, trade_type)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS positions (
+            market TEXT PRIMARY KEY,
+            volume REAL DEFAULT 0,
+            cost_basis REAL DEFAULT 0,
+            realized_pnl REAL DEFAULT 0,
+            fees REAL DEFAULT 0,
+            buy_amount REAL DEFAULT 0,
+            sell_amount REAL DEFAULT 0,
+            updated_at REAL
+        )
+    """)
+
+    # ✅ 기존 거래 기록으로 요약 테이블 채우기 (한 번 훑기)
+    rows = conn.execute("SELECT market, trade_type, price, volume, COALESCE(fee, 0) FROM trade_history ORDER BY id")
+    conn.executemany("""
+        INSERT OR REPLACE INTO positions
+        (market, volume, cost_basis, realized_pnl, fees, buy_amount, sell_amount, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS REAL))
+    """, [(market, *position) for market, position in _replay_positions(rows).items()])
+
+
+def _add_fill_ids(conn, legacy):
+    """v5: 체결 단위 중복 저장 방지를 위한 주문 / 체결 UUID 컬럼 + 유니크 인덱스"""
+    for table in ("trade_history", "transactions"):
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        for column in ("order_uuid", "trade_uuid"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_trade_uuid ON {table} (trade_uuid)")
+
+
+def _add_sequential_id(conn, legacy):
+    """v6: 공개 체결(틱) 중복 저장 방지를 위한 업비트 sequential_id 컬럼 + (마켓, sequential_id) 유니크 인덱스"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(transactions)")]
+    if "sequential_id" not in columns:
+        conn.execute("ALTER TABLE transactions ADD COLUMN sequential_id INTEGER")
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_sequential_id ON transactions (market, sequential_id)
+    """)
+
+
+MIGRATIONS = [
+    _create_tables, _import_legacy, _create_strategy_state, _create_positions, _add_fill_ids, _add_sequential_id,
+]
+
+
+def _migrate(conn):
+    """적용되지 않은 마이그레이션만 순서대로 실행 (각 단계는 한 트랜잭션, 여러 프로세스가 동시에 시작해도 한 번만 적용)"""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= len(MIGRATIONS):
+        return
+
+    # ✅ ATTACH는 트랜잭션 밖에서만 가능하므로 먼저 붙여 둠
+    # 기존 실거래 데이터는 실거래 DB에만 (모의 거래 DB가 실제 매수가 / 잔고로 시작하지 않게)
+    legacy = {}
+    live = os.path.abspath(_db_path) == os.path.abspath(LIVE_DB)
+    for name, path in LEGACY_DBS.items() if live else ():
+        if os.path.exists(path):
+            conn.execute(f"ATTACH DATABASE ? AS legacy_{name}", (path,))
+            legacy[name] = path
+
+    try:
+        while True:
+            conn.execute("BEGIN IMMEDIATE")  # 쓰기 잠금을 먼저 잡고 버전을 다시 확인
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= len(MIGRATIONS):
+                conn.rollback()
+                break
+            try:
+                MIGRATIONS[version](conn, legacy)
+                conn.execute(f"PRAGMA user_version = {version + 1}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            print(f"✅ `{_db_path}` 마이그레이션 v{version + 1} 적용 ({MIGRATIONS[version].__name__})")
+    finally:
+        for name in legacy:
+            conn.execute(f"DETACH DATABASE legacy_{name}")
+
+
+### ✅ 2. 연결 관리
+def _connect(path):
+    """WAL 모드 연결 생성 (읽는 쪽과 쓰는 쪽이 서로 막지 않음)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, cached_statements=256)  # ✅ 같은 SQL은 준비된 문장을 재사용
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")  # WAL에서는 체크포인트 때만 fsync
+    conn.execute("PRAGMA busy_timeout = 10000")
+    return conn
+
+
+def init_storage(path=None):
+    """저장소 DB 경로 지정 및 마이그레이션 실행 (프로그램 시작 시 한 번, 이후 호출은 즉시 반환)"""
+    global _db_path
+    with _init_lock:
+        if path is not None and path != _db_path:
+            _db_path = path
+        if _db_path not in _migrated:
+            _migrate(_thread_connection())
+            _migrated.add(_db_path)
+    return _db_path
+
+
+def use_storage(path):
+    """DB 경로를 바꾸고 이전 경로 반환 (마이그레이션은 처음 연결할 때, 임시 DB로 바꿨다가 되돌릴 때 사용)"""
+    global _db_path
+    with _init_lock:
+        previous, _db_path = _db_path, path
+    return previous
+
+
+def _thread_connection():
+    """현재 스레드의 연결 (처음 호출할 때만 생성, DB 경로가 바뀌면 다시 연결)"""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != _db_path:
+        if conn is not None:
+            conn.close()
+        conn = _local.conn = _connect(_db_path)
+        _local.path = _db_path
+    return conn
+
+
+def get_connection():
+    """현재 스레드의 연결 (마이그레이션이 아직이면 먼저 실행)"""
+    if _db_path not in _migrated:
+        init_storage()
+    return _thread_connection()
+
+
+def close_connection():
+    """현재 스레드의 연결 닫기 (스레드 종료 전에 호출)"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+@contextmanager
+def transaction():
+    """쓰기 묶음 (정상 종료 시 한 번에 커밋, 예외 시 롤백), 커밋까지 걸린 시간을 지표로 기록"""
+    conn = get_connection()
+    with metrics.timer("db_write_seconds"), conn:
+        yield conn
+
+
+def fetch_one(sql, params=()):
+    """조회 결과 첫 행 (없으면 None)"""
+    return get_connection().execute(sql, params).fetchone()
+
+
+def fetch_all(sql, params=()):
+    """조회 결과 전체 행"""
+    return get_connection().execute(sql, params).fetchall()
+
+
+if __name__ == "__main__":
+    init_storage()
+    version = fetch_one("PRAGMA user_version")[0]
+    for table in ("wallet", "transactions", "trade_history", "strategy_state", "state_snapshots", "positions"):
+        print(f"📦 {table}: {fetch_one(f'SELECT COUNT(*) FROM {table}')[0]}행")
+    print(f"✅ `{_db_path}` 스키마 버전 v{version}")
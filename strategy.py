@@ -1,27 +1,189 @@
-import requests
-from upbit_api import get_current_price
-from config import MARKET, SERVER_URL
-
-def get_moving_averages(short_window=5, long_window=20):
-    """이동 평균선 계산"""
-    url = f"{SERVER_URL}/v1/candles/days"
-    params = {"market": MARKET, "count": long_window}
-    response = requests.get(url, params=params)
-    
-    if response.status_code == 200:
-        prices = [candle["trade_price"] for candle in response.json()]
-        short_ma = sum(prices[:short_window]) / short_window
-        long_ma = sum(prices) / long_window
-        return short_ma, long_ma
-    return None, None
-
-def decide_trade():
-    """매매 전략 결정"""
-    short_ma, long_ma = get_moving_averages()
-    
-    if short_ma and long_ma:
-        if short_ma > long_ma:
-            return "BUY"
-        elif short_ma < long_ma:
-            return "SELL"
-    return "HOLD"
+import numpy as np
+from indicators import indicator_key
+from signals import DEFAULT_PARAMS, buy_signal, sell_signal
+from config import MIN_ORDER_KRW
+
+### ✅ 매매 전략 인터페이스
+### - indicators(): 필요한 지표 스펙 목록 → 마켓마다 한 번만 계산된 지표 프레임을 모든 전략이 공유
+### - buy(frame, ctx) / sell(frame, ctx): 실시간 판단 (프레임 = {지표 키: 최신 값}), 사유 문자열 또는 None
+### - buy_mask(frame, close) / sell_mask(frame, close, entry_price, start, stop): 백테스트용 후보 캔들 (벡터)
+### ctx = {"price", "now", "last_buy_time", "last_sell_time", "last_buy_price", "coin_balance", "krw_balance"}
+
+
+class Strategy:
+    """매매 전략 기본 클래스 (파라미터는 DEFAULT_PARAMS + 전략 기본값 + 넘긴 값 순서로 덮어씀)"""
+
+    name = "base"
+    defaults = {}
+
+    def __init__(self, params=None):
+        self.params = {**DEFAULT_PARAMS, **self.defaults, **(params or {})}
+
+    def indicators(self):
+        """필요한 지표 스펙 목록"""
+        return []
+
+    def buy(self, frame, ctx):
+        return None
+
+    def sell(self, frame, ctx):
+        return None
+
+    def buy_mask(self, frame, close):
+        """매수 가능성이 있는 캔들 (기본: 전부 → 백테스트가 캔들마다 buy()로 확인)"""
+        return np.ones(len(close), dtype=bool)
+
+    def sell_mask(self, frame, close, entry_price, start, stop):
+        """start:stop 구간에서 매도 가능성이 있는 캔들"""
+        return np.ones(stop - start, dtype=bool)
+
+    ### ✅ 공통 조건 (쿨다운 / 잔고)
+    def can_buy(self, ctx):
+        return (ctx["now"] - ctx["last_buy_time"] > self.params["cooldown"]
+                and ctx["coin_balance"] == 0 and ctx["krw_balance"] > MIN_ORDER_KRW)
+
+    def can_sell(self, ctx):
+        return ctx["now"] - ctx["last_sell_time"] > self.params["cooldown"] and ctx["coin_balance"] > 0
+
+
+class RsiMaBreakoutStrategy(Strategy):
+    """기존 자동매매 규칙 (RSI 과매도 / 골든크로스 매수, RSI 과매수 / 변동성 돌파 / 익절 매도) → signals.py 그대로 사용"""
+
+    name = "rsi_ma_breakout"
+
+    def __init__(self, params=None):
+        super().__init__(params)
+        p = self.params
+        self.rsi_key = indicator_key(("rsi", p["rsi_period"]))
+        self.short_key = indicator_key(("sma", p["short_window"]))
+        self.long_key = indicator_key(("sma", p["long_window"]))
+        self.breakout_key = indicator_key(("breakout", p["breakout_k"]))
+
+    def indicators(self):
+        p = self.params
+        return [("rsi", p["rsi_period"]), ("sma", p["short_window"]), ("sma", p["long_window"]),
+                ("breakout", p["breakout_k"])]
+
+    def buy(self, frame, ctx):
+        return buy_signal(
+            frame[self.rsi_key], frame[self.short_key], frame[self.long_key], ctx["now"], ctx["last_buy_time"],
+            ctx["coin_balance"], ctx["krw_balance"], self.params,
+        )
+
+    def sell(self, frame, ctx):
+        return sell_signal(
+            ctx["price"], frame[self.rsi_key], frame[self.breakout_key], ctx["last_buy_price"], ctx["now"],
+            ctx["last_sell_time"], ctx["coin_balance"], self.params,
+        )
+
+    def buy_mask(self, frame, close):
+        # NaN 비교는 False
+        return (frame[self.rsi_key] < self.params["rsi_buy"]) | (frame[self.short_key] > frame[self.long_key])
+
+    def sell_mask(self, frame, close, entry_price, start, stop):
+        p = self.params
+        c = close[start:stop]
+        take_profit_price = entry_price * (1 + p["take_profit"])
+        min_profit_price = entry_price * (1 + p["min_profit"])
+        indicator = (frame[self.rsi_key][start:stop] > p["rsi_sell"]) | (c > frame[self.breakout_key][start:stop])
+        return (indicator | (c > take_profit_price)) & ((c > min_profit_price) | (c > take_profit_price))
+
+
+class MovingAverageCrossStrategy(Strategy):
+    """단기 이동평균이 장기 이동평균 위면 매수, 아래면 매도 (기존 decide_trade 규칙)"""
+
+    name = "ma_cross"
+
+    def __init__(self, params=None):
+        super().__init__(params)
+        self.short_key = indicator_key(("sma", self.params["short_window"]))
+        self.long_key = indicator_key(("sma", self.params["long_window"]))
+
+    def indicators(self):
+        return [("sma", self.params["short_window"]), ("sma", self.params["long_window"])]
+
+    def buy(self, frame, ctx):
+        if frame[self.short_key] > frame[self.long_key] and self.can_buy(ctx):
+            return "단기 이동평균 > 장기 이동평균"
+        return None
+
+    def sell(self, frame, ctx):
+        if frame[self.short_key] < frame[self.long_key] and self.can_sell(ctx):
+            return "단기 이동평균 < 장기 이동평균"
+        return None
+
+    def buy_mask(self, frame, close):
+        return frame[self.short_key] > frame[self.long_key]
+
+    def sell_mask(self, frame, close, entry_price, start, stop):
+        return frame[self.short_key][start:stop] < frame[self.long_key][start:stop]
+
+
+class BollingerReversionStrategy(Strategy):
+    """볼린저 하단 아래에서 매수, 상단 위 또는 ATR 손절선 아래에서 매도"""
+
+    name = "bollinger"
+    defaults = {"bb_period": 20, "bb_k": 2.0, "atr_period": 14, "stop_atr": 2.0}
+
+    def __init__(self, params=None):
+        super().__init__(params)
+        p = self.params
+        self.upper_key = indicator_key(("bb_upper", p["bb_period"], p["bb_k"]))
+        self.lower_key = indicator_key(("bb_lower", p["bb_period"], p["bb_k"]))
+        self.atr_key = indicator_key(("atr", p["atr_period"]))
+
+    def indicators(self):
+        p = self.params
+        return [("bb_upper", p["bb_period"], p["bb_k"]), ("bb_lower", p["bb_period"], p["bb_k"]),
+                ("atr", p["atr_period"])]
+
+    def buy(self, frame, ctx):
+        if ctx["price"] < frame[self.lower_key] and self.can_buy(ctx):
+            return "볼린저 하단 이탈"
+        return None
+
+    def sell(self, frame, ctx):
+        if not self.can_sell(ctx):
+            return None
+        if ctx["price"] > frame[self.upper_key]:
+            return "볼린저 상단 돌파"
+        if ctx["price"] < ctx["last_buy_price"] - frame[self.atr_key] * self.params["stop_atr"]:
+            return f"ATR {self.params['stop_atr']:g}배 손절"
+        return None
+
+    def buy_mask(self, frame, close):
+        return close < frame[self.lower_key]
+
+    def sell_mask(self, frame, close, entry_price, start, stop):
+        c = close[start:stop]
+        stop_price = entry_price - frame[self.atr_key][start:stop] * self.params["stop_atr"]
+        return (c > frame[self.upper_key][start:stop]) | (c < stop_price)
+
+
+STRATEGIES = {cls.name: cls for cls in (RsiMaBreakoutStrategy, MovingAverageCrossStrategy, BollingerReversionStrategy)}
+
+
+def load_strategies(names, params=None):
+    """전략 이름 목록 → 전략 객체 목록 (params는 모든 전략에 공통 적용)"""
+    unknown = [name for name in names if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"❌ 알 수 없는 전략: {', '.join(unknown)} (사용 가능: {', '.join(STRATEGIES)})")
+    return [STRATEGIES[name](params) for name in names]
+
+
+def required_indicators(strategies):
+    """전략들이 요구하는 지표 스펙 (중복 제거 → 같은 지표는 한 번만 계산)"""
+    specs = {}
+    for strategy in strategies:
+        for spec in strategy.indicators():
+            specs.setdefault(indicator_key(spec), tuple(spec))
+    return list(specs.values())
+
+
+def first_signal(strategies, side, frame, ctx):
+    """전략을 순서대로 확인해 첫 번째 신호 사유 반환 (전략이 여러 개면 사유 뒤에 전략 이름 표시), 없으면 None"""
+    for strategy in strategies:
+        reason = strategy.buy(frame, ctx) if side == "bid" else strategy.sell(frame, ctx)
+        if reason:
+            return reason if len(strategies) == 1 else f"{reason} ({strategy.name})"
+    return None
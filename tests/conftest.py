@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# ✅ 모듈이 저장소 최상위에 있으므로 테스트에서 바로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """data/, log/ 상대 경로가 임시 폴더를 가리키도록 (실제 DB / 로그는 건드리지 않음)"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def db(workdir):
+    """임시 폴더의 새 통합 DB (테스트가 끝나면 원래 경로로 되돌림)"""
+    import storage
+
+    previous = storage.use_storage(os.path.abspath("test.db"))  # 절대 경로 → 테스트마다 새 DB로 마이그레이션
+    storage.init_storage()
+    yield storage
+    storage.use_storage(previous)
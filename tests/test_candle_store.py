@@ -0,0 +1,42 @@
+import numpy as np
+
+import candle_store
+from candles import from_upbit
+from indicators import IndicatorEngine
+
+MARKET = "KRW-BTC"
+
+
+def _candle(timestamp, price):
+    return {"market": MARKET, "candle_date_time_utc": str(np.datetime64(int(timestamp), "s")),
+            "opening_price": price, "high_price": price, "low_price": price, "trade_price": price,
+            "candle_acc_trade_volume": 1.0}
+
+
+def _fake_get_ohlcv(now, calls):
+    """업비트 분봉 흉내: to 이전(없으면 지금까지) count개를 최신순으로"""
+    def get_ohlcv(market, count, to=None, unit=1):
+        calls.append(to)
+        end = now // 60 * 60 if to is None else int(np.datetime64(to.rstrip("Z"), "s").astype(np.int64)) - 60
+        return [_candle(end - i * 60, 100.0 + (end - i * 60) // 60 % 50) for i in range(count)]
+    return get_ohlcv
+
+
+def test_warm_start_caps_pages_to_engine_window(workdir, monkeypatch):
+    now = 1_800_000_000
+    stale = now // 60 * 60 - 30 * 86400  # ✅ 한 달 전에 멈춘 저장소 → 제한이 없으면 200페이지 넘게 요청
+    path = candle_store.candle_path(MARKET, directory=".")
+    with open(path, "wb") as f:
+        f.write(from_upbit([_candle(stale, 100.0)]).tobytes())
+
+    calls = []
+    monkeypatch.setattr(candle_store, "get_ohlcv", _fake_get_ohlcv(now, calls))
+    monkeypatch.setattr(candle_store.time, "time", lambda: now)
+    engine = IndicatorEngine(MARKET, maxlen=250)
+
+    assert candle_store.warm_start(engine, directory=".")
+    assert len(calls) == 3  # ceil(250 / 200) + 1
+    assert len(engine.candles) == 250
+    stored = candle_store.read_candles(MARKET, directory=".")
+    assert stored["timestamp"][0] == stale
+    assert stored["timestamp"][-1] == now // 60 * 60 - 60  # 진행 중인 캔들은 저장하지 않음
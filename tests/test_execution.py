@@ -0,0 +1,95 @@
+import pytest
+
+from config import EXEC_MARKET_MAX_IMPACT
+from execution import estimate_impact, plan_execution, round_to_tick, tick_size
+
+PRICE = 100_000_000
+
+
+def _book(asks, bids=()):
+    depth = max(len(asks), len(bids))
+    asks = list(asks) + [(0.0, 0.0)] * (depth - len(asks))
+    bids = list(bids) + [(0.0, 0.0)] * (depth - len(bids))
+    return {"orderbook_units": [{"ask_price": a[0], "ask_size": a[1], "bid_price": b[0], "bid_size": b[1]}
+                                for a, b in zip(asks, bids)]}
+
+
+BOOK = _book(asks=[(PRICE, 1.0), (100_200_000, 1.0), (100_500_000, 1.0), (101_000_000, 100.0)],
+             bids=[(99_900_000, 1.0), (99_800_000, 1.0)])
+
+
+@pytest.mark.parametrize("price, tick", [
+    (2_000_000, 1000), (1_999_999, 500), (1_000_000, 500), (999_999, 100), (500_000, 100), (100_000, 50),
+    (99_999, 10), (10_000, 10), (9_999, 1), (1_000, 1), (999, 0.1), (100, 0.1), (99.9, 0.01), (1, 0.001),
+    (0.5, 0.0001), (0.01, 0.00001), (0.005, 0.000001),
+])
+def test_tick_size_boundaries(price, tick):
+    assert tick_size(price) == tick
+
+
+def test_round_to_tick():
+    assert round_to_tick(1_999_999, "bid") == 2_000_000  # 매수는 올림
+    assert round_to_tick(1_000_400, "ask") == 1_000_000  # 매도는 내림
+    assert round_to_tick(0.12341, "bid") == 0.1235
+    # ✅ 이미 호가 단위에 맞는 가격은 부동소수점 오차로 한 칸 밀리지 않음
+    assert round_to_tick(1.23, "ask") == 1.23
+    assert round_to_tick(150.0, "bid") == 150.0
+
+
+def test_small_order_goes_to_market():
+    plan = plan_execution(BOOK, "bid", PRICE, amount=PRICE)
+    assert plan["method"] == "market" and plan["slices"] == 1
+    assert plan["estimate"]["impact"] == 0.0
+
+
+def test_passive_uses_best_same_side_quote():
+    plan = plan_execution(BOOK, "bid", PRICE, amount=10_000_000, passive=True)
+    assert plan["method"] == "passive" and plan["limit_price"] == 99_900_000
+
+
+def test_medium_order_uses_ioc_limit_at_needed_level():
+    plan = plan_execution(BOOK, "bid", PRICE, amount=300_000_000)
+    assert EXEC_MARKET_MAX_IMPACT < plan["estimate"]["impact"]
+    assert plan["method"] == "limit" and plan["limit_price"] == 100_500_000
+
+
+def test_large_order_is_sliced_so_each_slice_is_cheap():
+    plan = plan_execution(BOOK, "bid", PRICE, amount=400_000_000)
+    assert plan["method"] == "twap"
+    assert plan["slices"] == 2
+    first = estimate_impact(BOOK, "bid", amount=400_000_000 / plan["slices"])
+    assert first["impact"] <= EXEC_MARKET_MAX_IMPACT
+    assert plan["limit_price"] <= PRICE * 1.005  # 판단가 대비 EXEC_MAX_SLIPPAGE 한도
+
+
+def test_order_too_small_to_split_uses_capped_limit():
+    book = _book(asks=[(10_100, 10.0)], bids=[(10_000, 0.1), (9_000, 10.0)])
+    plan = plan_execution(book, "ask", 10_000, volume=0.9)  # 9,000 KRW → 최소 주문 금액 때문에 나눌 수 없음
+    assert plan["method"] == "limit" and plan["slices"] == 1
+    assert plan["limit_price"] == 9_950  # 호가가 더 나빠도 판단가 대비 0.5%까지만
+
+
+def test_opposite_signal_cancels_remaining_twap_slices(monkeypatch):
+    import time
+
+    import execution
+    from execution import Executor
+
+    orders = []
+
+    def fake_place_order(side, price=None, volume=None, market=None, time_in_force=None):
+        orders.append(side)
+        return {"uuid": f"o{len(orders)}", "side": side, "market": market}
+
+    monkeypatch.setattr(execution, "get_orderbook", lambda market: [BOOK])
+    monkeypatch.setattr(execution, "place_order", fake_place_order)
+    executor = Executor(slice_interval=0.05).start()
+    try:
+        assert executor.execute("bid", "KRW-BTC", PRICE, amount=400_000_000)  # 2조각 중 첫 조각만 바로 주문
+        assert executor.execute("ask", "KRW-BTC", PRICE, volume=0.01)  # 반대 방향 신호
+        time.sleep(0.2)  # 다음 조각 시각이 지나도
+    finally:
+        executor.stop()
+    assert orders == ["bid", "ask"]
+    [buy] = [e for e in executor.executions.values() if e["side"] == "bid"]
+    assert buy["placed"] == buy["slices"] == 1
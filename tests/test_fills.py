@@ -0,0 +1,78 @@
+import pytest
+
+import fills
+from fills import FillTracker
+from ledger import get_position
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _done_order(uuid="o1"):
+    return {"uuid": uuid, "market": "KRW-BTC", "side": "bid", "state": "done", "paid_fee": "0.3",
+            "created_at": "2026-01-01T00:00:00+09:00",
+            "trades": [{"uuid": f"{uuid}-t1", "price": "100", "volume": "2", "funds": "200"},
+                       {"uuid": f"{uuid}-t2", "price": "101", "volume": "1", "funds": "101"}]}
+
+
+@pytest.fixture
+def tracker(db, monkeypatch):
+    clock = Clock()
+    orders = {}
+    monkeypatch.setattr(fills, "get_order", lambda uuid: orders.get(uuid))
+    tracker = FillTracker(poll_interval=1, max_interval=8, clock=clock)
+    tracker.track({"uuid": "o1"})
+    return tracker, clock, orders
+
+
+def test_backoff_doubles_until_max_interval(tracker):
+    tracker, clock, orders = tracker
+    orders["o1"] = {"uuid": "o1", "state": "wait"}
+    waits = []
+    for _ in range(5):
+        clock.now = tracker.pending["o1"]["next_poll"]
+        tracker.poll_once()
+        waits.append(tracker.pending["o1"]["interval"])
+    assert waits == [2, 4, 8, 8, 8]
+
+    # ✅ 조회 시각 전에는 요청하지 않음
+    assert tracker.poll_once() == 8
+    assert tracker.poll_once(now=clock.now + 1) == 8
+
+
+def test_settle_records_fills_once_and_emits_summary(tracker):
+    tracker, clock, orders = tracker
+    orders["o1"] = _done_order()
+    clock.now = 1
+    assert tracker.poll_once() is None  # 추적할 주문이 남지 않음
+
+    [event] = tracker.pop_events()
+    assert event["volume"] == 3.0 and event["funds"] == 301.0
+    assert event["avg_price"] == pytest.approx(301.0 / 3.0)
+    assert event["fee"] == pytest.approx(0.3)
+    assert event["inserted"] == 2
+    assert get_position("KRW-BTC")["volume"] == 3.0
+
+    tracker.track({"uuid": "o1"})  # 같은 주문을 다시 추적해도 체결은 한 번만 기록
+    clock.now = 3
+    tracker.poll_once()
+    assert tracker.pop_events()[0]["inserted"] == 0
+    assert get_position("KRW-BTC")["volume"] == 3.0
+
+
+def test_settle_keeps_order_when_saving_fails(tracker, monkeypatch):
+    tracker, clock, orders = tracker
+    orders["o1"] = _done_order()
+
+    def broken(rows):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(fills, "record_fills", broken)
+    clock.now = 1
+    tracker.poll_once()
+    assert "o1" in tracker.pending and tracker.pop_events() == []
@@ -0,0 +1,84 @@
+import math
+import random
+
+from candles import from_upbit
+from indicators import (
+    NAN, IndicatorEngine, compute_frame, indicator_key, _pandas_rsi, _pandas_moving_average, _pandas_breakout,
+)
+
+
+def _close(expected, actual, rel_tol, abs_tol):
+    """NaN은 NaN끼리 같다고 봄"""
+    if math.isnan(expected) and math.isnan(actual):
+        return True
+    return math.isclose(expected, actual, rel_tol=rel_tol, abs_tol=abs_tol)
+
+
+def test_engine_matches_pandas(steps=2000, seed=42):
+    """랜덤 캔들 스트림으로 증분 지표가 기존 pandas 계산 함수와 결과가 같은지 확인"""
+    rng = random.Random(seed)
+    engine = IndicatorEngine("KRW-TEST", maxlen=200, short_window=5, long_window=20)
+    history = []
+    price = 100_000_000.0
+    minute = 0
+
+    for step in range(steps):
+        # ✅ 1/3 확률로 새 캔들, 나머지는 진행 중인 캔들 갱신
+        if not history or rng.random() < 0.34:
+            minute += rng.choice([1, 1, 1, 2])
+            price = round(price * (1 + rng.gauss(0, 0.002)), -3)
+            candle = {"candle_date_time_utc": f"{minute:08d}", "opening_price": price,
+                      "high_price": price, "low_price": price, "trade_price": price}
+            history.append(candle)
+        else:
+            price = round(price * (1 + rng.gauss(0, 0.001)), -3)
+            last = dict(history[-1])
+            last["trade_price"] = price
+            last["high_price"] = max(last["high_price"], price)
+            last["low_price"] = min(last["low_price"], price)
+            history[-1] = last
+            candle = last
+        # ✅ 가끔 같은 가격 반복 (상승/하락 0 구간 검증)
+        if rng.random() < 0.05:
+            candle["trade_price"] = history[-2]["trade_price"] if len(history) > 1 else price
+        engine.update(candle)
+
+        window = history[-200:]
+        expected = (
+            _pandas_rsi([c["trade_price"] for c in window]),
+            *_pandas_moving_average(window, 5, 20),
+            _pandas_breakout(window) if len(window) > 1 else NAN,
+        )
+        actual = (engine.rsi, engine.short_ma, engine.long_ma, engine.breakout_price)
+        for name, e, a in zip(("rsi", "short_ma", "long_ma", "breakout"), expected, actual):
+            assert _close(e, a, 1e-9, 1e-9), f"{step}번째 갱신에서 {name} 불일치: pandas={e}, engine={a}"
+
+
+def test_live_matches_batch(bars=1000, seed=7):
+    """같은 캔들로 증분 지표(실시간)와 배치 지표(백테스트)가 같은 값인지 확인"""
+    rng = random.Random(seed)
+    specs = [("sma", 5), ("ema", 12), ("rsi", 14), ("bb_upper", 20, 2), ("bb_lower", 20, 2),
+             ("atr", 14), ("breakout", 0.5), ("vwap", 20)]
+    engine = IndicatorEngine("KRW-TEST", maxlen=bars, specs=specs)
+    history = []
+    price = 100_000_000.0
+    for minute in range(bars):
+        price = round(price * (1 + rng.gauss(0, 0.002)), -3)
+        candle = {"candle_date_time_utc": f"2026-01-01T{minute // 60:02d}:{minute % 60:02d}:00",
+                  "opening_price": price, "high_price": price, "low_price": price, "trade_price": price,
+                  "candle_acc_trade_volume": 0.0}
+        engine.update(candle)
+        for _ in range(rng.randint(0, 3)):  # 진행 중인 캔들 갱신
+            price = round(price * (1 + rng.gauss(0, 0.001)), -3)
+            candle = dict(candle, trade_price=price, high_price=max(candle["high_price"], price),
+                          low_price=min(candle["low_price"], price),
+                          candle_acc_trade_volume=candle["candle_acc_trade_volume"] + rng.random())
+            engine.update(candle)
+        history.append(candle)
+
+        if minute % 50 == 49:
+            frame = compute_frame(from_upbit(history), specs)
+            for spec in specs:
+                key = indicator_key(spec)
+                expected, actual = frame[key][-1], engine.value(spec)
+                assert _close(expected, actual, 1e-9, 1e-6), f"{minute}분 {key} 불일치: batch={expected}, live={actual}"
@@ -0,0 +1,53 @@
+import pytest
+
+import ledger
+from storage import fetch_one
+
+
+@pytest.fixture(autouse=True)
+def fresh_db(db):
+    return db
+
+
+def _fill(trade_uuid, side, price, volume, fee=0.0, market="KRW-BTC"):
+    return {"market": market, "side": side, "price": price, "volume": volume, "fee": fee,
+            "trade_time": "2026-01-01 00:00:00", "order_uuid": f"order-{trade_uuid}", "trade_uuid": trade_uuid}
+
+
+def test_average_cost_and_realized_pnl():
+    position = ledger.empty_position()
+    ledger.apply_to_position(position, "bid", 100.0, 1.0, fee=1.0)
+    ledger.apply_to_position(position, "bid", 200.0, 1.0, fee=1.0)
+    assert position["cost_basis"] == 302.0  # ✅ 매수 수수료는 원가에 포함
+
+    ledger.apply_to_position(position, "ask", 300.0, 0.5, fee=0.5)
+    assert position["volume"] == 1.5
+    assert position["cost_basis"] == pytest.approx(226.5)  # 평균 단가 151 × 1.5
+    assert position["realized_pnl"] == pytest.approx(150.0 - 0.5 - 75.5)
+
+    ledger.apply_to_position(position, "ask", 300.0, 1.5)
+    assert position["volume"] == 0.0 and position["cost_basis"] == 0.0
+
+
+def test_record_fills_ignores_duplicate_trades():
+    fills = [_fill("t1", "bid", 100.0, 2.0, fee=0.1)]
+    assert ledger.record_fills(fills) == 1
+    assert ledger.record_fills(fills) == 0  # 같은 체결을 다시 받아도 한 번만 반영
+
+    assert fetch_one("SELECT COUNT(*) FROM trade_history WHERE trade_uuid = 't1'")[0] == 1
+    assert fetch_one("SELECT COUNT(*) FROM transactions WHERE trade_uuid = 't1'")[0] == 1
+    assert ledger.get_position("KRW-BTC")["volume"] == 2.0
+
+
+def test_get_pnl_after_partial_sell():
+    ledger.record_fills([_fill("t1", "bid", 100.0, 2.0), _fill("t2", "ask", 150.0, 0.5, fee=1.0)])
+
+    pnl = ledger.get_pnl("KRW-BTC", 120.0)
+    assert pnl["volume"] == 1.5
+    assert pnl["avg_price"] == pytest.approx(100.0)
+    assert pnl["realized_pnl"] == pytest.approx(75.0 - 1.0 - 50.0)
+    assert pnl["unrealized_pnl"] == pytest.approx(1.5 * 120.0 - 150.0)
+    assert pnl["total_pnl"] == pytest.approx(pnl["realized_pnl"] + pnl["unrealized_pnl"])
+
+    # ✅ 요약 테이블을 거래 기록 전체로 다시 계산해도 같은 값
+    assert ledger.rebuild_positions()["KRW-BTC"] == pytest.approx(ledger.get_position("KRW-BTC"))
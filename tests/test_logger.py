@@ -0,0 +1,68 @@
+import json
+import threading
+
+import numpy as np
+
+import logger
+
+
+def _flush_within(seconds=5):
+    """flush()가 seconds초 안에 끝나는지 (쓰기 스레드가 죽으면 영원히 대기)"""
+    thread = threading.Thread(target=logger.flush, daemon=True)
+    thread.start()
+    thread.join(seconds)
+    return not thread.is_alive()
+
+
+def test_writer_survives_bad_records(tmp_path, monkeypatch):
+    path = str(tmp_path / "log" / "test.jsonl")
+    log = logger.get_log(path)
+    original = log.write
+
+    def write_once_broken(record):
+        if record.get("broken"):
+            raise RuntimeError("boom")
+        original(record)
+
+    monkeypatch.setattr(log, "write", write_once_broken)
+    try:
+        logger.log_record(path, "t", "numpy", n=np.int64(1))
+        logger.log_record(path, "t", "broken", broken=True)
+        logger.log_record(path, "t", "after")
+        assert _flush_within()
+    finally:
+        logger.shutdown()
+
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["message"] for record in records] == ["numpy", "after"]
+    assert records[0]["n"] == "1"
+
+
+def test_counts_are_saved_for_every_log_when_queue_drains(tmp_path):
+    paths = [str(tmp_path / "log" / name) for name in ("a.jsonl", "b.jsonl")]
+    try:
+        for _ in range(3):
+            for path in paths:
+                logger.log_record(path, "t", "x")
+        logger.log_record(paths[1], "t", "x")
+        assert _flush_within()
+        counts = []
+        for path in paths:
+            with open(f"{path}.count", encoding="utf-8") as f:
+                counts.append(int(f.read()))
+        assert counts == [3, 4]
+    finally:
+        logger.shutdown()
+
+
+def test_stale_count_is_rebuilt_from_log_file(tmp_path):
+    path = str(tmp_path / "test.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for iteration in range(1, 6):
+            f.write(json.dumps({"iteration": iteration, "kind": "t", "message": "x"}) + "\n")
+        f.write('{"iteration": 6, "kind"')  # ✅ 쓰다가 중단된 마지막 줄
+    with open(f"{path}.count", "w", encoding="utf-8") as f:
+        f.write("3")  # 보조 파일을 저장하기 전에 종료됨
+
+    assert logger.JsonLineLog(path).iteration == 5
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import market_feed
+from market_feed import MarketFeed, replay_server
+
+MARKET = "KRW-BTC"
+
+
+def _utc(start):
+    return datetime.fromtimestamp(start, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _rest_candle(start, price, volume=0.0):
+    """get_ohlcv 응답과 같은 형태의 1분봉"""
+    return {"market": MARKET, "candle_date_time_utc": _utc(start), "opening_price": price, "high_price": price,
+            "low_price": price, "trade_price": price, "candle_acc_trade_price": price * volume,
+            "candle_acc_trade_volume": volume}
+
+
+def _trade(ms, price, volume):
+    return {"type": "trade", "code": MARKET, "trade_price": price, "trade_volume": volume, "trade_timestamp": ms}
+
+
+async def _until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "시간 초과"
+        await asyncio.sleep(0.01)
+
+
+def test_feed_builds_candles_and_backfills_after_reconnect(monkeypatch):
+    # ✅ 두 분 전(M0)에 시작해 한 분 전(M1)으로 넘어가는 체결 → 재연결 때 백필 개수는 (지금 - M1) // 60 + 2 = 3
+    m0 = int(time.time()) // 60 * 60 - 120
+    m1 = m0 + 60
+    messages = [
+        {"type": "ticker", "code": MARKET, "trade_price": 100.0},
+        _trade(m0 * 1000 + 10_000, 101.0, 1.0),
+        _trade(m0 * 1000 + 20_000, 99.0, 2.0),
+        _trade(m1 * 1000 + 5_000, 102.0, 0.5),
+        {"type": "trade", "code": "KRW-ETH", "trade_price": 1.0, "trade_volume": 1.0, "trade_timestamp": 0},
+    ]
+    backfills = [[_rest_candle(m0, 100.0)], [_rest_candle(m1 + 60, 103.0), _rest_candle(m1, 102.0, 0.5)]]
+    calls = []
+
+    def fake_get_ohlcv(market, count):
+        calls.append((market, count))
+        return backfills[min(len(calls), len(backfills)) - 1]
+
+    monkeypatch.setattr(market_feed, "get_ohlcv", fake_get_ohlcv)
+
+    async def scenario():
+        server = await replay_server(messages, close_after=True)
+        port = server.sockets[0].getsockname()[1]
+        feed = MarketFeed([MARKET], url=f"ws://127.0.0.1:{port}", reconnect_delay=0.05)
+        task = asyncio.create_task(feed.run())
+        try:
+            await _until(lambda: feed.reconnects >= 1)  # 녹화 메시지를 다 보내고 서버가 연결을 닫음
+            first = feed.pop_candles(MARKET)
+            price = feed.get_price(MARKET)
+            await _until(lambda: len(calls) >= 2 and feed.connected)
+            second = feed.pop_candles(MARKET)
+        finally:
+            task.cancel()
+            await task
+            server.close()
+            await server.wait_closed()
+        return feed, first, price, second
+
+    feed, first, price, second = asyncio.run(scenario())
+
+    assert price == 100.0
+    assert calls[0] == (MARKET, 2)  # 첫 연결: 진행 중인 캔들만 이어받기
+
+    # ✅ 백필 캔들 → M0 갱신 2번 → 마감된 M0 + 새 M1
+    assert [c["candle_date_time_utc"] for c in first] == [_utc(m0)] * 4 + [_utc(m1)]
+    closed = first[3]
+    assert (closed["opening_price"], closed["high_price"], closed["low_price"], closed["trade_price"]) == \
+        (100.0, 101.0, 99.0, 99.0)
+    assert closed["candle_acc_trade_volume"] == 3.0
+    assert first[4]["opening_price"] == 102.0 and first[4]["candle_acc_trade_volume"] == 0.5
+
+    # ✅ 재연결 후 끊긴 동안의 캔들을 REST로 채우고 (시간순) 마지막 캔들을 이어받음
+    assert calls[1][0] == MARKET and calls[1][1] in (3, 4)  # 테스트 중에 분이 바뀌었으면 4
+    assert [c["candle_date_time_utc"] for c in second[:2]] == [_utc(m1), _utc(m1 + 60)]
+    assert feed.builders[MARKET].current_start == m1 + 60
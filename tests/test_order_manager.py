@@ -0,0 +1,26 @@
+import order_manager
+
+
+def test_simulate_expires_and_replaces_resting_limits():
+    events = order_manager.simulate(orders=2, ttl=60)
+    by_uuid = {event["uuid"]: event for event in events}
+
+    replaced = [event for event in events if event.get("replaced_by")]
+    assert replaced and all(event["state"] == "cancel" for event in replaced)
+
+    # ✅ 재주문 체인: 처음 주문 → (취소 → 새 주문)* → 체결, 체인마다 이벤트가 모두 기록됨
+    firsts = set(by_uuid) - {event["replaced_by"] for event in replaced}
+    assert len(firsts) == 2
+    for uuid in firsts:
+        event = by_uuid[uuid]
+        while event.get("replaced_by"):
+            event = by_uuid[event["replaced_by"]]
+        assert event["state"] == "done" and event["volume"] > 0
+
+
+def test_simulate_cancels_without_replace_after_max_replaces():
+    events = order_manager.simulate(orders=1, ttl=5)  # 같은 캔들 안에서는 최우선 매수 호가도 체결되지 않음
+
+    assert [event["state"] for event in events] == ["cancel"] * (order_manager.LIMIT_ORDER_MAX_REPLACES + 1)
+    assert not events[-1].get("replaced_by")
+    assert all(event.get("replaced_by") for event in events[:-1])
@@ -0,0 +1,41 @@
+import pytest
+
+import state_store
+from storage import fetch_all
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(db):
+    state_store.invalidate_state()
+    yield
+    state_store.invalidate_state()
+
+
+def test_set_state_upserts_one_row_per_field():
+    state_store.set_state("KRW-BTC", last_buy_price=100.0, last_sell_time=1.0)
+    state_store.set_state("KRW-BTC", last_buy_price=200.0)
+    state_store.set_state("KRW-ETH", last_buy_price=5.0)
+
+    rows = fetch_all("SELECT market, field, value FROM strategy_state ORDER BY market, field")
+    assert rows == [("KRW-BTC", "last_buy_price", 200.0), ("KRW-BTC", "last_sell_time", 1.0),
+                    ("KRW-ETH", "last_buy_price", 5.0)]
+    assert state_store.get_state("KRW-BTC", "last_buy_price") == 200.0
+    assert state_store.get_state("KRW-XRP", "last_buy_price", 0) == 0
+
+
+def test_state_reloads_from_db_after_invalidate():
+    state_store.set_state("KRW-BTC", last_buy_price=100.0)
+    state_store.invalidate_state()
+    assert state_store.get_market_state("KRW-BTC") == {"last_buy_price": 100.0}
+
+
+def test_restore_snapshot_replaces_all_state():
+    state_store.set_state("KRW-BTC", last_buy_price=100.0)
+    version = state_store.save_snapshot("test")
+    state_store.set_state("KRW-BTC", last_buy_price=300.0)
+    state_store.set_state("KRW-ETH", last_buy_price=5.0)
+
+    assert state_store.restore_snapshot(version)
+    assert state_store.load_state() == {"KRW-BTC": {"last_buy_price": 100.0}}
+    state_store.invalidate_state()
+    assert state_store.load_state() == {"KRW-BTC": {"last_buy_price": 100.0}}
@@ -0,0 +1,66 @@
+import os
+import sqlite3
+
+import pytest
+
+import storage
+from config import LIVE_DB, TRADE_STATE_DB, TRADE_HISTORY_DB
+
+
+@pytest.fixture
+def legacy_files(workdir):
+    """data/ 아래 기존 개별 DB (매수가 1건 + 거래 기록 1건)"""
+    os.makedirs("data", exist_ok=True)
+    with sqlite3.connect(TRADE_STATE_DB) as conn:
+        conn.execute("CREATE TABLE trade_state (id INTEGER PRIMARY KEY, last_buy_price REAL, last_sell_time REAL)")
+        conn.execute("INSERT INTO trade_state (last_buy_price, last_sell_time) VALUES (156050000, 0)")
+    with sqlite3.connect(TRADE_HISTORY_DB) as conn:
+        conn.execute("""CREATE TABLE trade_history (id INTEGER PRIMARY KEY, trade_time TEXT, market TEXT,
+                        trade_type TEXT, price REAL, volume REAL, total_cost REAL)""")
+        conn.execute("INSERT INTO trade_history (trade_time, market, trade_type, price, volume, total_cost) "
+                     "VALUES ('2026-01-01 00:00:00', 'KRW-BTC', 'bid', 156050000, 0.01, 1560500)")
+
+
+def _open(path):
+    previous = storage.use_storage(os.path.abspath(path))  # 절대 경로 → 테스트마다 새 DB로 마이그레이션
+    storage.init_storage()
+    return previous
+
+
+def _counts():
+    return (storage.fetch_one("SELECT COUNT(*) FROM strategy_state")[0],
+            storage.fetch_one("SELECT COUNT(*) FROM trade_history")[0],
+            storage.fetch_one("SELECT COUNT(*) FROM positions")[0])
+
+
+def test_paper_db_does_not_import_legacy(legacy_files):
+    previous = _open(os.path.join("data", "paper.db"))
+    try:
+        assert _counts() == (0, 0, 0)
+    finally:
+        storage.close_connection()
+        storage.use_storage(previous)
+
+
+def test_live_db_imports_legacy(legacy_files):
+    previous = _open(LIVE_DB)
+    try:
+        assert _counts() == (2, 1, 1)  # 매수가 / 매도 시각 2항목, 거래 1건, 포지션 1개
+        assert storage.fetch_one(
+            "SELECT value FROM strategy_state WHERE market = 'KRW-BTC' AND field = 'last_buy_price'")[0] == 156050000
+        assert storage.fetch_one("SELECT volume, cost_basis FROM positions WHERE market = 'KRW-BTC'") == \
+            (0.01, 1560500.0)
+    finally:
+        storage.close_connection()
+        storage.use_storage(previous)
+
+
+def test_migration_replay_matches_ledger():
+    """v4 마이그레이션의 포지션 계산 사본이 ledger.replay와 같은 값"""
+    from ledger import POSITION_FIELDS, replay
+
+    rows = [("KRW-BTC", "bid", 100.0, 2.0, 0.1), ("KRW-ETH", "bid", 10.0, 1.0, None),
+            ("KRW-BTC", "ask", 150.0, 0.5, 0.05), ("KRW-BTC", "bid", 120.0, 1.0, 0.0),
+            ("KRW-ETH", "ask", 12.0, 1.0, 0.0), ("KRW-BTC", "ask", 90.0, 5.0, 0.0)]
+    expected = {market: tuple(position[f] for f in POSITION_FIELDS) for market, position in replay(rows).items()}
+    assert storage._replay_positions(rows) == pytest.approx(expected)
@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+import storage
+import trades
+
+MARKET = "KRW-BTC"
+
+
+class FakeTape:
+    """업비트 /v1/trades/ticks 흉내: 최신 체결부터 count개, cursor를 주면 그 sequential_id 이전 체결"""
+
+    def __init__(self):
+        self.ticks = []
+        self.requests = 0
+
+    def add(self, n):
+        for _ in range(n):
+            i = len(self.ticks) + 1
+            self.ticks.append({"trade_date_utc": "2026-01-01", "trade_time_utc": f"{i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+                               "trade_price": 100.0 + i, "trade_volume": 0.001, "ask_bid": "BID",
+                               "sequential_id": 1_000 + i})
+
+    def get_trade_history(self, market, count, cursor=None):
+        self.requests += 1
+        older = [t for t in reversed(self.ticks) if cursor is None or t["sequential_id"] < cursor]
+        return older[:count]
+
+
+@pytest.fixture
+def tape(workdir, monkeypatch):
+    previous = storage.use_storage(os.path.abspath("trades.db"))
+    storage.init_storage()
+    tape = FakeTape()
+    monkeypatch.setattr(trades, "get_trade_history", tape.get_trade_history)
+    monkeypatch.setattr(trades, "TRADES_PAGE_SIZE", 3)
+    monkeypatch.setattr(trades, "_cursors", {})
+    monkeypatch.setattr(trades, "_resume", {})
+    yield tape
+    storage.use_storage(previous)
+
+
+def _stored_ids():
+    rows = storage.get_connection().execute(
+        "SELECT sequential_id FROM transactions WHERE market = ? ORDER BY sequential_id", (MARKET,)).fetchall()
+    return [row[0] for row in rows]
+
+
+def _drain():
+    """페이지 상한에 걸린 수집을 끝까지 이어서 받음"""
+    trades.ingest_trades(MARKET, max_pages=2)
+    for _ in range(10):
+        if MARKET not in trades._resume:
+            return
+        trades.ingest_trades(MARKET, max_pages=2)
+    raise AssertionError("수집이 끝나지 않음")
+
+
+def test_page_cap_resumes_without_gap(tape):
+    tape.add(4)
+    assert trades.ingest_trades(MARKET, max_pages=2) == 4  # 짧은 페이지 → 처음부터 끝까지
+
+    # ✅ 두 페이지(6틱)로는 새 체결 20개를 다 받지 못함 → 커서는 그대로, 다음 호출이 이어서 받음
+    tape.add(20)
+    assert trades.ingest_trades(MARKET, max_pages=2) == 6
+    assert trades.last_sequential_id(MARKET) == 1_004
+    assert MARKET in trades._resume
+
+    tape.add(5)  # 이어 받는 동안 들어온 체결도 빠지지 않아야 함
+    _drain()
+    assert trades.last_sequential_id(MARKET) == 1_024
+
+    _drain()
+    assert _stored_ids() == [t["sequential_id"] for t in tape.ticks]
+    assert trades.last_sequential_id(MARKET) == 1_029
+
+def test_failed_request_keeps_resume_cursor(tape, monkeypatch):
+    tape.add(4)
+    trades.ingest_trades(MARKET, max_pages=1)
+    tape.add(10)
+    trades.ingest_trades(MARKET, max_pages=1)
+    resume = dict(trades._resume[MARKET])
+
+    monkeypatch.setattr(trades, "get_trade_history", lambda *args: None)  # 요청 실패
+    assert trades.ingest_trades(MARKET, max_pages=1) == 0
+    assert trades._resume[MARKET] == resume
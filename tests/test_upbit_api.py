@@ -0,0 +1,83 @@
+import time
+
+import requests
+
+from rate_limiter import RequestScheduler
+from upbit_api import UpbitClient
+
+
+def _response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"[]"
+    return response
+
+
+class FakeSession:
+    """정해진 상태 코드를 차례로 돌려주는 세션 (보낸 시각 기록)"""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.sent = []
+
+    def request(self, method, url, **kwargs):
+        self.sent.append(time.monotonic())
+        return _response(self.statuses.pop(0))
+
+
+def test_http_adapter_does_not_retry_429():
+    client = UpbitClient(access_key="a", secret_key="b")
+    retry = client.session.get_adapter("https://api.upbit.com").max_retries
+    assert 429 not in retry.status_forcelist
+
+
+def test_get_429_is_retried_through_the_rate_limiter():
+    client = UpbitClient(access_key="a", secret_key="b", retries=2,
+                         scheduler=RequestScheduler(throttle_pause=0.2))
+    client.session = FakeSession([429, 200])
+
+    assert client.get_markets() == []
+    first, second = client.session.sent
+    assert second - first >= 0.15  # 그룹이 throttle_pause 동안 쉰 뒤 다시 보냄
+    assert client.stats["GET /v1/market/all"]["throttled"] == 1
+
+
+def test_order_429_is_not_resent():
+    client = UpbitClient(access_key="a", secret_key="b", scheduler=RequestScheduler(throttle_pause=0.01))
+    client.session = FakeSession([429, 201])
+
+    assert client.place_order("bid", price=10000, market="KRW-BTC") is None
+    assert len(client.session.sent) == 1
+
+
+def test_get_client_creates_one_client_across_threads(monkeypatch):
+    import threading
+    import upbit_api
+
+    created = []
+    start = threading.Barrier(8)
+
+    def slow_default_client():
+        time.sleep(0.05)  # 생성 중에 다른 스레드가 들어오도록
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setattr(upbit_api, "_default_client", slow_default_client)
+    previous = upbit_api.use_client(None)
+    results = []
+
+    def call():
+        start.wait()
+        results.append(upbit_api.get_client())
+
+    try:
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        upbit_api.use_client(previous)
+
+    assert len(created) == 1
+    assert len(results) == 8 and all(result is created[0] for result in results)
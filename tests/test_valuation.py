@@ -0,0 +1,54 @@
+import pytest
+
+import valuation
+
+
+@pytest.fixture
+def exchange(monkeypatch):
+    """시세 / 마켓 목록 요청을 기록하는 가짜 거래소 (캐시는 테스트마다 비움)"""
+    state = {"now": 1_000.0, "ticker": [], "markets": 0,
+             "prices": {"KRW-BTC": 100.0, "KRW-ETH": 10.0}}
+
+    def get_market_prices(markets):
+        state["ticker"].append(list(markets))
+        return {m: state["prices"][m] for m in markets if m in state["prices"]}
+
+    def get_markets():
+        state["markets"] += 1
+        return list(state["prices"])
+
+    monkeypatch.setattr(valuation, "get_market_prices", get_market_prices)
+    monkeypatch.setattr(valuation, "get_markets", get_markets)
+    monkeypatch.setattr(valuation.time, "time", lambda: state["now"])
+    monkeypatch.setattr(valuation, "_prices", {})
+    monkeypatch.setattr(valuation, "_markets", None)
+    return state
+
+
+def test_prices_are_cached_for_ttl(exchange):
+    assert valuation.get_prices(["KRW-BTC", "KRW-ETH"], ttl=5) == {"KRW-BTC": 100.0, "KRW-ETH": 10.0}
+    exchange["prices"]["KRW-BTC"] = 200.0
+
+    exchange["now"] += 5  # ttl 이내 → 요청 없이 캐시 값
+    assert valuation.get_price("KRW-BTC", ttl=5) == 100.0
+    assert exchange["ticker"] == [["KRW-BTC", "KRW-ETH"]]
+
+    exchange["now"] += 1  # ttl 지남 → 지난 마켓만 다시 요청
+    assert valuation.get_price("KRW-BTC", ttl=5) == 200.0
+    assert exchange["ticker"][-1] == ["KRW-BTC"]
+
+
+def test_delisted_markets_are_filtered_before_ticker(exchange):
+    prices = valuation.get_prices(["KRW-BTC", "KRW-DELISTED", "KRW-BTC"])
+    assert prices == {"KRW-BTC": 100.0}
+    assert exchange["ticker"] == [["KRW-BTC"]]  # ✅ 상장 폐지 마켓 / 중복 없이 한 번만
+
+    valuation.get_prices(["KRW-ETH"])
+    assert exchange["markets"] == 1  # 마켓 목록은 MARKET_LIST_TTL 동안 재사용
+
+
+def test_value_balances(exchange):
+    prices, values, total = valuation.value_balances(["KRW", "BTC", "DELISTED"], [1_000.0, 2.0, 5.0])
+    assert prices.tolist() == [1.0, 100.0, 0.0]
+    assert values.tolist() == [1_000.0, 200.0, 0.0]
+    assert total == 1_200.0
@@ -1,30 +1,49 @@
-import sqlite3
-from upbit_api import get_market_price, get_balance, place_order
-from config import TRADE_HISTORY_DB, MARKET
+import time
+from upbit_api import get_market_price, place_order
+from account import get_balance, invalidate_accounts
+from config import MARKET, MIN_ORDER_KRW
+import metrics
 
-def trade_by_percentage(side, percent):
-    """지정된 비율(percent)로 시장가 매수/매도"""
+def trade_by_percentage(side, percent, current_price=None, market=MARKET, krw_budget=None, executor=None):
+    """지정된 비율(percent)로 매수/매도 (잔고는 이번 틱의 계좌 스냅샷 사용)
+    - market: 거래할 마켓 (예: "KRW-ETH" → ETH 잔고 기준으로 매도)
+    - krw_budget: 이 마켓에 배분된 원화 한도 (None이면 보유 원화 전체 기준)
+    - executor: execution.Executor가 있으면 호가를 보고 시장가 / 지정가 IOC / 분할 주문 중 선택, 없으면 시장가 1번
+    """
+    started = time.perf_counter()
+    coin = market.split("-")[1]
     krw_balance = get_balance("KRW") or 0
-    btc_balance = get_balance("BTC") or 0
-    current_price = get_market_price() or 0
+    coin_balance = get_balance(coin) or 0
+    if current_price is None:
+        current_price = get_market_price(market) or 0  # ✅ 호출한 쪽에서 가격을 넘기면 재조회하지 않음
 
     if side == "bid":
-        order_amount = krw_balance * (percent / 100.0)
-        if order_amount < 5000:
-            print("⚠️ 최소 주문 금액보다 작음. 주문 취소.")
+        available_krw = krw_balance if krw_budget is None else min(krw_balance, krw_budget)
+        order_amount = available_krw * (percent / 100.0)
+        if order_amount < MIN_ORDER_KRW:
+            print(f"⚠️ {market} 최소 주문 금액보다 작음. 주문 취소.")
             return None
         
-        # 시장가 매수 => price=주문금액, volume=None
-        order_result = place_order(side="bid", price=order_amount, volume=None)
-        return order_result  # 성공 시 JSON, 실패면 None
+        if executor is not None:
+            order_result = executor.execute("bid", market, current_price, amount=order_amount)
+        else:
+            # 시장가 매수 => price=주문금액, volume=None
+            order_result = place_order(side="bid", price=order_amount, volume=None, market=market)
 
     else:
         # side == "ask"
-        sell_volume = round(btc_balance * (percent / 100.0), 8)
-        if sell_volume * current_price < 5000:
-            print("⚠️ 최소 주문 금액보다 작음. 주문 취소.")
+        sell_volume = round(coin_balance * (percent / 100.0), 8)
+        if sell_volume * current_price < MIN_ORDER_KRW:
+            print(f"⚠️ {market} 최소 주문 금액보다 작음. 주문 취소.")
             return None
         
-        # 시장가 매도 => price=None, volume=sell_volume
-        order_result = place_order(side="ask", price=None, volume=sell_volume)
-        return order_result  # 성공 시 JSON, 실패면 None
\ No newline at end of file
+        if executor is not None:
+            order_result = executor.execute("ask", market, current_price, volume=sell_volume)
+        else:
+            # 시장가 매도 => price=None, volume=sell_volume
+            order_result = place_order(side="ask", price=None, volume=sell_volume, market=market)
+
+    if order_result is not None:
+        metrics.observe("order_roundtrip_seconds", time.perf_counter() - started, side=side)
+        invalidate_accounts()  # ✅ 주문이 접수되면 잔고가 바뀌므로 스냅샷 폐기
+    return order_result  # 성공 시 JSON, 실패면 None
@@ -1,76 +1,125 @@
 import os
-import sqlite3
-import pandas as pd
 from upbit_api import get_trade_history
-from config import TRANSACTIONS_DB, LOG_DIR, MARKET, TRADES_LOG_FILE
+from storage import init_storage, transaction, get_connection
+from config import TRADING_DB, LOG_DIR, MARKET, RECENT_TRADES_FILE, TRADES_PAGE_SIZE, TRADES_MAX_PAGES, INGEST_BATCH_SIZE
+
+_cursors = {}  # 마켓 → 빈틈 없이 저장된 구간의 (마지막 sequential_id, 마지막 체결 시각) (체결 수집 커서)
+_resume = {}  # 마켓 → 페이지 상한에 걸려 멈춘 수집 {"cursor": 다음 페이지 cursor, "top": 그때 받은 가장 최신 (id, 시각)}
 
 def setup_transactions_database():
-    """transactions 테이블이 없으면 생성"""
-    conn = sqlite3.connect(TRANSACTIONS_DB)  # ✅ DB 변경
-    cursor = conn.cursor()
-
-    # ✅ 거래 내역을 저장할 transactions 테이블 생성
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            trade_time TEXT,
-            market TEXT,
-            price REAL,
-            volume REAL,
-            trade_type TEXT
-        )
-    """)
-
-    conn.commit()
-    conn.close()
-    print(f"✅ 데이터베이스 초기화 완료 ({TRANSACTIONS_DB})")
-
-def save_to_database(trades, market):
-    """거래 내역을 transactions.db에 저장"""
-    conn = sqlite3.connect(TRANSACTIONS_DB)  # ✅ DB 변경
-    cursor = conn.cursor()
-
-    for trade in trades:
-        cursor.execute("""
-            INSERT INTO transactions (trade_time, market, price, volume, trade_type)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            trade["trade_date_utc"] + " " + trade["trade_time_utc"],
-            market,
-            float(trade["trade_price"]),
-            float(trade["trade_volume"]),
-            trade["ask_bid"]
-        ))
-
-    conn.commit()
-    conn.close()
-    print(f"✅ 거래 내역이 {TRANSACTIONS_DB}에 저장되었습니다.")
+    """transactions 테이블 확인 (통합 DB 마이그레이션에서 생성됨)"""
+    init_storage()
+    print(f"✅ 데이터베이스 초기화 완료 ({TRADING_DB})")
+
+def _tick_time(trade):
+    return trade["trade_date_utc"] + " " + trade["trade_time_utc"]
+
+def _tick_row(trade, market):
+    """업비트 체결(틱) → transactions 행"""
+    return (
+        _tick_time(trade),
+        market,
+        float(trade["trade_price"]),
+        float(trade["trade_volume"]),
+        trade["ask_bid"],
+        int(trade["sequential_id"]),
+    )
+
+def save_to_database(trades, market, batch_size=INGEST_BATCH_SIZE):
+    """거래 내역을 transactions 테이블에 일괄 저장하고 새로 저장된 건수 반환
+    - (마켓, sequential_id) 유니크 인덱스 + INSERT OR IGNORE → 같은 틱을 다시 넣어도 중복되지 않음
+    - batch_size행마다 커밋 (WAL 모드라 읽는 쪽은 막히지 않고, 다른 쓰기도 오래 기다리지 않음)
+    """
+    rows = [_tick_row(trade, market) for trade in trades]
+    conn = get_connection()
+    before = conn.total_changes
+    for start in range(0, len(rows), batch_size):
+        with transaction() as conn:
+            conn.executemany("""
+                INSERT OR IGNORE INTO transactions (trade_time, market, price, volume, trade_type, sequential_id)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows[start:start + batch_size])
+    inserted = conn.total_changes - before
+    print(f"✅ 거래 내역 {inserted}건이 {TRADING_DB}에 저장되었습니다. (중복 {len(rows) - inserted}건 제외)")
+    return inserted
+
+### ✅ 공개 체결 수집 (저장된 마지막 체결까지만 과거로 요청, 페이지 상한에 걸리면 다음 호출에서 이어서)
+def last_cursor(market):
+    """빈틈 없이 저장된 구간의 (마지막 sequential_id, 마지막 체결 시각), 처음에만 DB에서 조회"""
+    if market not in _cursors:
+        row = get_connection().execute(
+            "SELECT MAX(sequential_id), MAX(trade_time) FROM transactions WHERE market = ? AND sequential_id IS NOT NULL",
+            (market,),
+        ).fetchone()
+        _cursors[market] = (row[0] or 0, row[1] or "")
+    return _cursors[market]
+
+def last_sequential_id(market):
+    """저장된 마지막 sequential_id"""
+    return last_cursor(market)[0]
+
+def ingest_trades(market=MARKET, max_pages=TRADES_MAX_PAGES):
+    """최신 체결부터 과거로 페이지를 넘기며 저장된 마지막 체결까지 받아 저장하고 새로 저장된 건수 반환
+    - 받은 틱은 모두 저장 (INSERT OR IGNORE라 겹치는 구간은 중복되지 않음)
+    - max_pages에 걸려 저장된 구간까지 닿지 못하면 커서는 그대로 두고, 다음 호출이 멈춘 곳부터 이어서 받음
+    """
+    last_id, last_time = last_cursor(market)
+    resume = _resume.pop(market, None)
+    cursor = resume["cursor"] if resume else None
+    top = resume["top"] if resume else None
+    ticks = []
+    reached = False
+    for _ in range(max_pages):
+        page = get_trade_history(market, TRADES_PAGE_SIZE, cursor)
+        if not page:
+            reached = page is not None  # 빈 목록 = 더 과거 체결 없음, None = 요청 실패 (다음에 다시)
+            break
+        ticks.extend(page)
+        times = [_tick_time(trade) for trade in page]
+        if top is None:
+            top = (max(trade["sequential_id"] for trade in page), max(times))
+        oldest = min(trade["sequential_id"] for trade in page)
+        # ✅ sequential_id는 순서가 보장되지 않으므로 체결 시각도 저장된 구간보다 과거여야 도달로 봄
+        if len(page) < TRADES_PAGE_SIZE or (oldest <= last_id and min(times) < last_time):
+            reached = True
+            break
+        cursor = oldest
+
+    inserted = save_to_database(ticks, market) if ticks else 0
+    if reached or last_id == 0:  # 처음 수집이면 메울 빈틈이 없음
+        if top is not None:
+            _cursors[market] = (max(last_id, top[0]), max(last_time, top[1]))
+    elif top is not None:
+        _resume[market] = {"cursor": cursor, "top": top}
+        print(f"⚠️ {market} 체결 수집이 페이지 상한({max_pages})에 걸렸습니다. 다음 수집에서 이어서 받습니다.")
+    return inserted
 
 def save_to_trades_log(data):
-    """거래 내역을 `log/trades_log.txt`에 덮어쓰기"""
-    with open(TRADES_LOG_FILE, "w", encoding="utf-8") as f:
+    """최근 거래 내역을 `log/recent_trades.txt`에 덮어쓰기 (회차별 거래 로그와는 별도 파일)"""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    with open(RECENT_TRADES_FILE, "w", encoding="utf-8") as f:
         f.write("📊 **최근 거래 내역** 📊\n\n")
         f.write(data)
 
-    print(f"✅ 거래 내역이 {TRADES_LOG_FILE} 파일에 저장되었습니다.")
+    print(f"✅ 거래 내역이 {RECENT_TRADES_FILE} 파일에 저장되었습니다.")
 
 def display_buy_sell_data():
     """매수(BID) 및 매도(ASK) 내역을 나눠서 출력 및 저장"""
-    setup_transactions_database()  # ✅ 테이블이 없으면 생성
+    import pandas as pd  # 출력할 때만 불러옴 (매매 루프 시작을 늦추지 않음)
 
-    conn = sqlite3.connect(TRANSACTIONS_DB)  # ✅ DB 변경
-    df = pd.read_sql("SELECT * FROM transactions", conn)
-    conn.close()
+    # ✅ 테이블 전체 대신 매수/매도 최근 10건씩만 조회 (체결 수집으로 테이블이 커져도 일정한 비용)
+    conn = get_connection()
+    recent = """
+        SELECT * FROM (SELECT * FROM transactions WHERE lower(trade_type) = ? ORDER BY id DESC LIMIT 10) ORDER BY id
+    """
+    buy_df = pd.read_sql(recent, conn, params=("bid",))
+    sell_df = pd.read_sql(recent, conn, params=("ask",))
 
-    if df.empty:
+    if buy_df.empty and sell_df.empty:
         print("📌 거래 내역이 없습니다.")
         save_to_trades_log("📌 거래 내역이 없습니다.")
         return
 
-    # 매수(BID) 및 매도(ASK) 데이터 분리
-    buy_df = df[df["trade_type"].str.lower() == "bid"]
-    sell_df = df[df["trade_type"].str.lower() == "ask"]
-
     output = "\n📊 **매수 거래 내역** 📊\n"
     output += buy_df.tail(10).to_string(index=False) + "\n"
 
@@ -81,6 +130,65 @@ def display_buy_sell_data():
 
     print("✅ 거래 내역이 저장되었습니다.")
 
+def benchmark_ingest(total=200000, batch_size=INGEST_BATCH_SIZE, readers=2):
+    """임시 DB에 가상 틱 total건을 저장하며 초당 저장 건수와 동시 읽기 지연을 측정"""
+    import tempfile
+    import threading
+    import time
+    from storage import close_connection, fetch_one
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    init_storage(path)
+    base = int(time.time() * 1000) * 1000
+    ticks = [
+        {"trade_date_utc": "2026-01-01", "trade_time_utc": "00:00:00", "trade_price": 100000000 + i % 1000,
+         "trade_volume": 0.001, "ask_bid": "BID" if i % 2 else "ASK", "sequential_id": base + i}
+        for i in range(total)
+    ]
+
+    stop = threading.Event()
+    latencies = []
+
+    def reader():
+        while not stop.is_set():
+            started = time.perf_counter()
+            fetch_one("SELECT COUNT(*) FROM transactions WHERE market = 'BENCH'")
+            latencies.append(time.perf_counter() - started)
+            time.sleep(0.01)
+        close_connection()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    inserted = save_to_database(ticks, "BENCH", batch_size)
+    elapsed = time.perf_counter() - started
+    duplicate_started = time.perf_counter()
+    save_to_database(ticks[-batch_size:], "BENCH", batch_size)  # 같은 틱 재수집 → 0건
+    duplicate_elapsed = time.perf_counter() - duplicate_started
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    print(f"""
+⏱️ **체결 저장 벤치마크** ⏱️
+📥 {inserted:,}건 저장: {elapsed:.2f}초 ({inserted / elapsed:,.0f}건/초, 분당 {inserted / elapsed * 60:,.0f}건)
+🔁 중복 {batch_size:,}건 재저장: {duplicate_elapsed:.3f}초
+📖 동시 읽기 {len(latencies)}회: 중앙값 {latencies[len(latencies) // 2] * 1000:.1f}ms, 최대 {latencies[-1] * 1000:.1f}ms
+""")
+
 if __name__ == "__main__":
-    setup_transactions_database()
-    display_buy_sell_data()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="공개 체결 수집 및 최근 매수/매도 내역 저장")
+    parser.add_argument("--market", default=MARKET, help="수집할 마켓")
+    parser.add_argument("--benchmark", type=int, default=None, metavar="N", help="가상 틱 N건으로 저장 속도 측정")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark_ingest(args.benchmark)
+    else:
+        setup_transactions_database()
+        ingest_trades(args.market)
+        display_buy_sell_data()
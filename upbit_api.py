@@ -1,181 +1,450 @@
-import requests
-import jwt
-import uuid
+import base64
 import hashlib
+import hmac
+import json
+import uuid
+import threading
+import time
 import requests
-import pandas as pd
-from urllib.parse import urlencode
-from config import ACCESS_KEY, SECRET_KEY, SERVER_URL, MARKET
-from logger import save_to_trades_log
+from urllib.parse import urlencode, unquote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import (
+    ACCESS_KEY, SECRET_KEY, SERVER_URL, MARKET, TRADING_MODE,
+    REQUEST_TIMEOUT, REQUEST_RETRIES, REQUEST_BACKOFF, HTTP_POOL_SIZE,
+)
+from rate_limiter import RequestScheduler
+import metrics
+
+
+def _b64url(data):
+    """JWT용 base64url 인코딩 (패딩 제거)"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _error_body(response):
+    """오류 응답 본문 (JSON이 아니면 텍스트 그대로)"""
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+class UpbitClient:
+    """keep-alive 세션(연결 풀) + 타임아웃 + 재시도를 가진 업비트 REST 클라이언트"""
+
+    def __init__(self, access_key=ACCESS_KEY, secret_key=SECRET_KEY, server_url=SERVER_URL,
+                 timeout=REQUEST_TIMEOUT, retries=REQUEST_RETRIES, backoff=REQUEST_BACKOFF,
+                 pool_size=HTTP_POOL_SIZE, scheduler=None):
+        self.access_key = access_key
+        self.server_url = server_url
+        self.timeout = timeout  # (연결, 응답) 타임아웃 초 → 소켓이 멈춰도 무한 대기하지 않음
+
+        # ✅ 재시도는 조회(GET)에만 적용 (주문 POST를 자동 재전송하면 중복 주문 위험)
+        # 429는 여기서 재시도하지 않음 → request()가 속도 제한기를 거쳐(그룹 대기 후) 다시 보냄
+        self.retries = retries
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # ✅ 그룹별 요청 속도 제한 (`Remaining-Req` 헤더 반영, 주문 우선)
+        self.scheduler = scheduler or RequestScheduler()
+
+        # ✅ JWT 서명 준비물 캐시 (고정 헤더 부분 + 비밀키가 적용된 HMAC 상태)
+        self._jwt_header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+        self._hmac = hmac.new(secret_key.encode(), digestmod=hashlib.sha256) if secret_key else None
+
+    ### ✅ 1. 인증 / 요청
+    def auth_headers(self, query=None):
+        """JWT 토큰 생성 (HS256, nonce는 요청마다 새로 발급)"""
+        if self._hmac is None:
+            raise ValueError("❌ UPBIT_SECRET_KEY가 설정되지 않았습니다.")
+
+        payload = {
+            'access_key': self.access_key,
+            'nonce': str(uuid.uuid4()),
+        }
+        if query:
+            # ✅ 목록 파라미터(uuids[]=a&uuids[]=b)도 서버가 받는 그대로 해시 (업비트 권장 방식)
+            query_string = unquote(urlencode(query, doseq=True)).encode()
+            m = hashlib.sha512()
+            m.update(query_string)
+            payload['query_hash'] = m.hexdigest()
+            payload['query_hash_alg'] = 'SHA512'
+
+        signing_input = self._jwt_header + b"." + _b64url(json.dumps(payload, separators=(",", ":")).encode())
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        token = (signing_input + b"." + _b64url(mac.digest())).decode()
+        return {"Authorization": f"Bearer {token}"}
+
+    def request(self, method, path, params=None, private=False):
+        """공용 요청 처리 (인증은 private 엔드포인트에만), 네트워크 오류 시 None
+        - 조회(GET)가 429를 받으면 속도 제한기가 그룹을 쉬게 한 뒤 최대 retries번 다시 보냄
+        """
+        endpoint = f"{method} {path}"
+        for attempt in range(self.retries + 1):
+            self.scheduler.acquire(method, path)  # ✅ 429 후에는 여기서 그룹 대기 시간만큼 기다림
+            headers = self.auth_headers(params) if private else None  # ✅ 대기 후 서명 (nonce/토큰 신선도 유지)
+            started = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method, f"{self.server_url}{path}", params=params, headers=headers, timeout=self.timeout
+                )
+            except requests.RequestException as e:
+                print(f"⚠️ 요청 실패 ({method} {path}): {e}")
+                response = None
+            # ✅ 지연(속도 제한 대기 제외) / 상태 코드 / 오류 기록
+            metrics.observe("upbit_request_seconds", time.perf_counter() - started, endpoint=endpoint)
+            status = str(response.status_code) if response is not None else "error"
+            metrics.inc("upbit_requests_total", endpoint=endpoint, status=status)
+            if response is None or not response.ok:
+                metrics.inc("upbit_request_errors_total", endpoint=endpoint)
+            self.scheduler.record(method, path, response)
+            if response is None or response.status_code != 429 or method != "GET":
+                break
+        return response
+
+    ### ✅ 2. 조회
+    def get_balance(self, currency=None):
+        """현재 보유 자산 조회"""
+        response = self.request("GET", "/v1/accounts", private=True)
+        if response is None:
+            return None
+
+        if response.status_code == 200:
+            balances = response.json()
+            if currency:  # 특정 코인 잔고 조회 (예: BTC, KRW)
+                for asset in balances:
+                    if asset["currency"] == currency:
+                        return float(asset["balance"])
+                return 0  # 해당 코인 잔고 없음
+            return balances  # 전체 잔고 반환
+        else:
+            print("⚠️ 보유 자산 조회 실패:", _error_body(response))
+            return None
+
+    def get_market_price(self, market=None):
+        """현재 시세 조회 (공개 API라 인증 헤더 없음)"""
+        if market is None:
+            market = MARKET  # 기본값으로 `MARKET` 사용
+
+        response = self.request("GET", "/v1/ticker", params={"markets": market})
+        if response is None:
+            return 0
+
+        if response.status_code == 200:
+            return response.json()[0]["trade_price"]  # 현재 거래 가격 반환
+        else:
+            print(f"⚠️ {market} 시세 조회 실패:", _error_body(response))
+            return 0  # 오류 발생 시 0 반환
+
+    def get_market_prices(self, markets):
+        """여러 마켓 현재 시세를 `/v1/ticker?markets=A,B,C` 한 번으로 조회 → {마켓: 가격}"""
+        if not markets:
+            return {}
+
+        response = self.request("GET", "/v1/ticker", params={"markets": ",".join(markets)})
+        if response is None:
+            return {}
+
+        if response.status_code == 200:
+            return {ticker["market"]: ticker["trade_price"] for ticker in response.json()}
+        else:
+            print(f"⚠️ 시세 일괄 조회 실패 ({len(markets)}개 마켓):", _error_body(response))
+            return {}
+
+    def get_markets(self):
+        """거래 가능한 마켓 코드 목록 (`/v1/market/all`), 실패하면 None"""
+        response = self.request("GET", "/v1/market/all")
+        if response is None:
+            return None
+
+        if response.status_code == 200:
+            return [item["market"] for item in response.json()]
+        else:
+            print("⚠️ 마켓 목록 조회 실패:", _error_body(response))
+            return None
+
+    def get_ohlcv(self, market, count=200, to=None, unit=1):
+        """OHLCV 데이터 가져오기 (기본 200개, to를 주면 그 시각 이전 캔들 → 과거로 페이지 넘김)"""
+        params = {
+            "market": market,
+            "count": count
+        }
+        if to is not None:
+            params["to"] = to  # 마지막 캔들 시각 (exclusive, UTC ISO8601)
+        response = self.request("GET", f"/v1/candles/minutes/{unit}", params=params)
+        if response is None:
+            return None
+
+        if response.status_code == 200:
+            return response.json()  # JSON 형태로 반환
+        else:
+            print(f"⚠️ OHLCV 데이터 요청 실패: {_error_body(response)}")
+            return None
+
+    def get_orderbook(self, markets):
+        """호가 조회 (`/v1/orderbook?markets=A,B`) → 마켓별 호가 목록 (orderbook_units: 가까운 호가부터), 실패하면 None"""
+        if isinstance(markets, str):
+            markets = [markets]
+        response = self.request("GET", "/v1/orderbook", params={"markets": ",".join(markets)})
+        if response is None:
+            return None
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"⚠️ 호가 조회 실패 ({', '.join(markets)}):", _error_body(response))
+            return None
+
+    def get_trade_history(self, market="KRW-BTC", count=200, cursor=None):
+        """최근 체결된 거래 내역 가져오기 (공개 API, cursor를 주면 그 sequential_id 이전 체결 → 과거로 페이지 넘김)"""
+        params = {"market": market, "count": count}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = self.request("GET", "/v1/trades/ticks", params=params)
+        if response is None:
+            return None
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"⚠️ {market} 거래 내역 조회 실패:", _error_body(response))
+            return None
+
+    ### ✅ 3. 주문
+    def place_order(self, side="bid", price=None, volume=None, market=MARKET, time_in_force=None):
+        """
+        Upbit에 실제 주문을 보내는 함수.
+        - side: "bid" (매수), "ask" (매도)
+        - 시장가 매수 시:   side="bid",  price=매수금액, volume=None => ord_type="price"
+        - 시장가 매도 시:   side="ask",  price=None,    volume=매도수량 => ord_type="market"
+        - 지정가 매수 시:   side="bid",  price=단가,    volume=수량 => ord_type="limit"
+        - 지정가 매도 시:   side="ask",  price=단가,    volume=수량 => ord_type="limit"
+        - time_in_force: 지정가 주문만 "ioc" (즉시 체결되지 않은 수량은 취소) / "fok" (전량 즉시 체결이 아니면 취소)
+        """
 
+        query = {
+            "market": market,
+            "side": side,
+        }
+
+        # 매수 로직
+        if side == "bid":
+            # 1) 시장가 매수 => price만 있고 volume=None이면 "ord_type"="price"
+            if price and volume is None:
+                query["ord_type"] = "price"
+                query["price"] = str(price)
+
+            # 2) 지정가 매수 => price와 volume 모두 있으면 "ord_type"="limit"
+            elif price and volume:
+                query["ord_type"] = "limit"
+                query["price"] = str(price)
+                query["volume"] = str(volume)
+            else:
+                print("⚠️ 잘못된 매수 주문 (price 또는 volume 확인 필요)")
+                return None
+
+        # 매도 로직
+        else:  # side == "ask"
+            # 3) 시장가 매도 => volume만 있고 price=None이면 "ord_type"="market"
+            if volume and price is None:
+                query["ord_type"] = "market"
+                query["volume"] = str(volume)
+
+            # 4) 지정가 매도 => price와 volume 모두 있으면 "ord_type"="limit"
+            elif price and volume:
+                query["ord_type"] = "limit"
+                query["price"] = str(price)
+                query["volume"] = str(volume)
+            else:
+                print("⚠️ 잘못된 매도 주문 (price 또는 volume 확인 필요)")
+                return None
+
+        if time_in_force and query["ord_type"] == "limit":
+            query["time_in_force"] = time_in_force
+
+        # 실제 요청
+        response = self.request("POST", "/v1/orders", params=query, private=True)
+        if response is None:
+            return None
+
+        if response.status_code == 201:
+            data = response.json()
+            print(f"✅ 주문 완료: {data}")
+            return data
+        else:
+            print(f"⚠️ 주문 실패: {response.status_code}, {response.text}")
+            return None
+
+    def get_order(self, uuid):
+        """개별 주문 조회 (상태 + 체결 목록 trades 포함), 실패하면 None"""
+        response = self.request("GET", "/v1/order", params={"uuid": uuid}, private=True)
+        if response is None:
+            return None
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"⚠️ 주문 조회 실패 ({uuid}): {_error_body(response)}")
+            return None
+
+    def get_orders(self, uuids):
+        """여러 주문 상태를 한 번에 조회 (`/v1/orders/uuids?uuids[]=...`, 최대 100개, 체결 목록 trades는 없음), 실패하면 None"""
+        uuids = list(uuids)
+        response = self.request("GET", "/v1/orders/uuids", params={"uuids[]": uuids}, private=True)
+        if response is None:
+            return None
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"⚠️ 주문 목록 조회 실패 ({len(uuids)}건): {_error_body(response)}")
+            return None
+
+    def cancel_order(self, uuid):
+        """미체결 주문 취소 요청 (응답은 취소 직전 주문 상태), 실패하면 None"""
+        response = self.request("DELETE", "/v1/order", params={"uuid": uuid}, private=True)
+        if response is None:
+            return None
+
+        if response.status_code == 200:
+            data = response.json()
+            print(f"🚫 주문 취소 요청: {uuid}")
+            return data
+        else:
+            print(f"⚠️ 주문 취소 실패 ({uuid}): {_error_body(response)}")
+            return None
+
+    @property
+    def stats(self):
+        """엔드포인트별 요청 수 / 오류 / 429 / 지연 횟수"""
+        return self.scheduler.stats
+
+
+def _default_client():
+    """거래 모드에 맞는 클라이언트 (paper면 로컬 모의 거래소 → 실제 주문이 나가지 않음)"""
+    if TRADING_MODE == "paper":
+        from simulator import SimulatedExchange
+        print("🧪 모의 거래 모드: 주문은 로컬 거래소 시뮬레이터로 보내집니다.")
+        return SimulatedExchange.from_config()
+    return UpbitClient()
+
+
+# ✅ 모듈 전체가 함께 쓰는 기본 클라이언트 (연결 풀 공유, import 시가 아니라 첫 요청 때 생성)
+_client = None
+_client_lock = threading.Lock()  # 첫 틱에 여러 스레드가 동시에 호출해도 클라이언트는 1개만 생성
+
+
+def get_client():
+    """기본 클라이언트 (처음 호출할 때 거래 모드에 맞게 생성)"""
+    global _client
+    client = _client
+    if client is None:
+        with _client_lock:
+            if _client is None:  # ✅ 잠금 안에서 다시 확인
+                _client = _default_client()
+            client = _client
+    return client
+
+
+def use_client(client):
+    """기본 클라이언트 교체 (모의 거래소로 통합 테스트 등), 이전 클라이언트 반환"""
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    return previous
+
+
+### ✅ 기존 모듈 함수는 기본 클라이언트를 감싸는 얇은 래퍼로 유지
 def get_headers(query=None):
     """JWT 토큰 생성"""
-    payload = {
-        'access_key': ACCESS_KEY,
-        'nonce': str(uuid.uuid4()),
-    }
-    if query:
-        query_string = urlencode(query).encode()
-        m = hashlib.sha512()
-        m.update(query_string)
-        payload['query_hash'] = m.hexdigest()
-        payload['query_hash_alg'] = 'SHA512'
-
-    token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
-    return {"Authorization": f"Bearer {token}"}
+    return get_client().auth_headers(query)
 
 def get_balance(currency=None):
     """현재 보유 자산 조회"""
-    url = f"{SERVER_URL}/v1/accounts"
-    response = requests.get(url, headers=get_headers())
-
-    if response.status_code == 200:
-        balances = response.json()
-        if currency:  # 특정 코인 잔고 조회 (예: BTC, KRW)
-            for asset in balances:
-                if asset["currency"] == currency:
-                    return float(asset["balance"])
-            return 0  # 해당 코인 잔고 없음
-        return balances  # 전체 잔고 반환
-    else:
-        print("⚠️ 보유 자산 조회 실패:", response.json())
-        return None
+    return get_client().get_balance(currency)
 
 def get_market_price(market=None):
     """현재 시세 조회 (업비트 API)"""
-    if market is None:
-        market = MARKET  # 기본값으로 `MARKET` 사용
-    
-    url = f"{SERVER_URL}/v1/ticker"
-    params = {"markets": market}
-    response = requests.get(url, params=params, headers=get_headers())
-
-    if response.status_code == 200:
-        return response.json()[0]["trade_price"]  # 현재 거래 가격 반환
-    else:
-        print(f"⚠️ {market} 시세 조회 실패:", response.json())
-        return 0  # 오류 발생 시 0 반환
-    
-def get_ohlcv(market, count=200):
+    return get_client().get_market_price(market)
+
+def get_market_prices(markets):
+    """여러 마켓 현재 시세 일괄 조회 → {마켓: 가격}"""
+    return get_client().get_market_prices(markets)
+
+def get_markets():
+    """거래 가능한 마켓 코드 목록"""
+    return get_client().get_markets()
+
+def get_ohlcv(market, count=200, to=None, unit=1):
     """OHLCV 데이터 가져오기 (기본 200개)"""
-    url = f"{SERVER_URL}/v1/candles/minutes/1"
-    params = {
-        "market": market,
-        "count": count
-    }
-    response = requests.get(url, params=params)
-
-    if response.status_code == 200:
-        return response.json()  # JSON 형태로 반환
-    else:
-        print(f"⚠️ OHLCV 데이터 요청 실패: {response.json()}")
-        return None
+    return get_client().get_ohlcv(market, count, to, unit)
 
-def calculate_rsi(data, period=14):
-    """RSI (Relative Strength Index) 계산"""
-    if not isinstance(data, pd.Series):
-        data = pd.Series(data)  # ✅ 리스트를 Pandas Series로 변환
-
-    delta = data.diff()  # 변화량 계산
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()  # 상승분
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()  # 하락분
-
-    rs = gain / loss  # 상대 강도 (Relative Strength)
-    rsi = 100 - (100 / (1 + rs))  # RSI 계산
-
-    return rsi.iloc[-1]  # ✅ 최신 RSI 값 반환
-
-def place_order(side="bid", price=None, volume=None, market="KRW-BTC"):
-    """
-    Upbit에 실제 주문을 보내는 함수.
-    - side: "bid" (매수), "ask" (매도)
-    - 시장가 매수 시:   side="bid",  price=매수금액, volume=None => ord_type="price"
-    - 시장가 매도 시:   side="ask",  price=None,    volume=매도수량 => ord_type="market"
-    - 지정가 매수 시:   side="bid",  price=단가,    volume=수량 => ord_type="limit"
-    - 지정가 매도 시:   side="ask",  price=단가,    volume=수량 => ord_type="limit"
-    """
-
-    url = f"{SERVER_URL}/v1/orders"
-    query = {
-        "market": market,
-        "side": side,
-    }
-
-    # 매수 로직
-    if side == "bid":
-        # 1) 시장가 매수 => price만 있고 volume=None이면 "ord_type"="price"
-        if price and volume is None:
-            query["ord_type"] = "price"
-            query["price"] = str(price)
-
-        # 2) 지정가 매수 => price와 volume 모두 있으면 "ord_type"="limit"
-        elif price and volume:
-            query["ord_type"] = "limit"
-            query["price"] = str(price)
-            query["volume"] = str(volume)
-        else:
-            print("⚠️ 잘못된 매수 주문 (price 또는 volume 확인 필요)")
-            return None
+def get_orderbook(markets):
+    """호가 조회 (마켓 하나 또는 목록) → 마켓별 호가 목록"""
+    return get_client().get_orderbook(markets)
 
-    # 매도 로직
-    else:  # side == "ask"
-        # 3) 시장가 매도 => volume만 있고 price=None이면 "ord_type"="market"
-        if volume and price is None:
-            query["ord_type"] = "market"
-            query["volume"] = str(volume)
+def place_order(side="bid", price=None, volume=None, market=MARKET, time_in_force=None):
+    """Upbit에 실제 주문을 보내는 함수 (자세한 사용법은 `UpbitClient.place_order` 참고)"""
+    return get_client().place_order(side=side, price=price, volume=volume, market=market, time_in_force=time_in_force)
 
-        # 4) 지정가 매도 => price와 volume 모두 있으면 "ord_type"="limit"
-        elif price and volume:
-            query["ord_type"] = "limit"
-            query["price"] = str(price)
-            query["volume"] = str(volume)
-        else:
-            print("⚠️ 잘못된 매도 주문 (price 또는 volume 확인 필요)")
-            return None
+def get_order(uuid):
+    """개별 주문 조회 (상태 + 체결 목록)"""
+    return get_client().get_order(uuid)
 
-    # 실제 요청
-    headers = get_headers(query)
-    response = requests.post(url, headers=headers, params=query)
+def get_orders(uuids):
+    """여러 주문 상태를 한 번에 조회 (최대 100개, 체결 목록 없음)"""
+    return get_client().get_orders(uuids)
 
-    if response.status_code == 201:
-        data = response.json()
-        print(f"✅ 주문 완료: {data}")
-        return data
-    else:
-        print(f"⚠️ 주문 실패: {response.status_code}, {response.text}")
-        return None
+def cancel_order(uuid):
+    """미체결 주문 취소"""
+    return get_client().cancel_order(uuid)
 
-    
-def get_trade_history(market="KRW-BTC", count=200):
+def get_trade_history(market="KRW-BTC", count=200, cursor=None):
     """최근 체결된 거래 내역 가져오기"""
-    url = f"{SERVER_URL}/v1/trades/ticks"
-    params = {"market": market, "count": count}
-    response = requests.get(url, params=params, headers=get_headers())
+    return get_client().get_trade_history(market, count, cursor)
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"⚠️ {market} 거래 내역 조회 실패:", response.json())
-        return None
+def get_request_stats():
+    """엔드포인트별 요청 수 / 오류 / 429 / 지연 횟수"""
+    return get_client().stats
+
+### ✅ 지표 계산 (pandas 없이 캔들 배열 열 뷰 + 최신 값 커널, 입력은 그대로 두고 기존 pandas 버전과 같은 값 반환)
+### data: 업비트 캔들 JSON 목록 / 캔들 배열(candles.CANDLE_DTYPE) / DataFrame, RSI는 종가 목록 / Series도 가능
+def calculate_rsi(data, period=14):
+    """RSI (Relative Strength Index) 계산"""
+    from candles import close_prices
+    from indicators import last_rsi  # indicators가 이 모듈을 불러오므로 호출 시점에 import
+
+    return last_rsi(close_prices(data, period + 1), period)  # ✅ 최신 RSI 값 반환
 
 def calculate_moving_average(data, short_window=7, long_window=25):
-    """이동평균선(MA) 계산"""
-    if isinstance(data, list):  
-        data = pd.DataFrame(data)  # ✅ 리스트를 DataFrame으로 변환
+    """이동평균선(MA) 계산 (입력 데이터에 열을 추가하지 않음)"""
+    from candles import candle_column
+    from indicators import last_mean
 
     # ✅ 데이터 확인 후 'trade_price' 컬럼이 있는지 체크
-    if "trade_price" not in data.columns:
-        raise KeyError("❌ 'trade_price' 컬럼이 없습니다. 데이터 형식을 확인하세요!")
+    try:
+        closes = candle_column(data, "close", max(short_window, long_window))
+    except (KeyError, ValueError):
+        raise KeyError("❌ 'trade_price' 컬럼이 없습니다. 데이터 형식을 확인하세요!") from None
+
+    return last_mean(closes, short_window), last_mean(closes, long_window)  # 최신 MA 값 반환
 
-    data["short_MA"] = data["trade_price"].rolling(window=short_window).mean()
-    data["long_MA"] = data["trade_price"].rolling(window=long_window).mean()
-    
-    return data.iloc[-1]["short_MA"], data.iloc[-1]["long_MA"]  # 최신 MA 값 반환
 def calculate_volatility_breakout(data, k=0.5):
-    """변동성 돌파 전략 계산"""
-    if isinstance(data, list):  
-        data = pd.DataFrame(data)  # ✅ 리스트를 DataFrame으로 변환
-    
-    yesterday = data.iloc[-2]  # ✅ 어제의 데이터 가져오기
-    target_price = yesterday["trade_price"] + (yesterday["high_price"] - yesterday["low_price"]) * k
-    return target_price  # 목표 매수 가격 반환
\ No newline at end of file
+    """변동성 돌파 전략 계산 (직전 캔들 종가 + 직전 캔들 변동폭 * k)"""
+    from candles import candle_column
+    from indicators import last_breakout
+
+    high, low, close = (candle_column(data, name, 2) for name in ("high", "low", "close"))
+    return last_breakout(high, low, close, k)  # 목표 매수 가격 반환
@@ -0,0 +1,67 @@
+import threading
+import time
+import numpy as np
+from upbit_api import get_market_prices, get_markets
+from config import PRICE_TTL, MARKET_LIST_TTL
+
+# ✅ 매매 루프 / 지갑 평가가 함께 쓰는 시세 캐시 (마켓 → (가격, 받은 시각))
+_lock = threading.Lock()
+_prices = {}
+_markets = None  # 거래 가능한 마켓 집합
+_markets_time = 0
+
+
+def update_prices(prices, now=None):
+    """이미 받은 시세를 캐시에 반영 (웹소켓 / 티커 일괄 조회 결과 재사용)"""
+    now = time.time() if now is None else now
+    with _lock:
+        for market, price in prices.items():
+            if price:
+                _prices[market] = (price, now)
+
+
+def valid_markets():
+    """거래 가능한 마켓 집합 (상장 폐지 코인이 섞이면 티커 일괄 조회 전체가 실패하므로 미리 거름), 실패하면 None"""
+    global _markets, _markets_time
+    if _markets is None or time.time() - _markets_time > MARKET_LIST_TTL:
+        markets = get_markets()
+        if markets is not None:
+            _markets, _markets_time = set(markets), time.time()
+    return _markets
+
+
+def get_prices(markets, ttl=PRICE_TTL):
+    """여러 마켓 시세 (캐시가 ttl초 이내면 재사용, 나머지는 티커 한 번으로 일괄 조회) → {마켓: 가격}"""
+    now = time.time()
+    with _lock:
+        cached = {m: _prices[m][0] for m in markets if m in _prices and now - _prices[m][1] <= ttl}
+    stale = [m for m in dict.fromkeys(markets) if m not in cached]
+    if stale:
+        listed = valid_markets()
+        if listed is not None:
+            stale = [m for m in stale if m in listed]
+        fetched = get_market_prices(stale) if stale else {}
+        update_prices(fetched, now)
+        cached.update(fetched)
+    return cached
+
+
+def get_price(market, ttl=PRICE_TTL):
+    """마켓 1개 시세 (캐시 사용, 실패하면 0)"""
+    return get_prices([market], ttl).get(market, 0)
+
+
+def value_balances(currencies, balances, quote="KRW", ttl=PRICE_TTL):
+    """통화별 보유 수량을 원화로 평가 (가격은 한 번에 조회, 계산은 벡터로)
+    - 반환: (가격 배열, 평가 금액 배열, 총 평가 금액), 원화는 가격 1, 시세가 없는 코인은 0
+    """
+    currencies = list(currencies)
+    balances = np.asarray(balances, dtype=np.float64)
+    markets = [f"{quote}-{c}" for c in currencies if c != quote]
+    prices_by_market = get_prices(markets, ttl) if markets else {}
+    prices = np.array(
+        [1.0 if c == quote else float(prices_by_market.get(f"{quote}-{c}", 0)) for c in currencies],
+        dtype=np.float64,
+    )
+    values = balances * prices
+    return prices, values, float(values.sum())